@@ -8,6 +8,8 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import time
+
 import sgtk
 from sgtk.util import get_current_user
 
@@ -22,18 +24,88 @@ class FrameworkDemos(sgtk.platform.Application):
         Initialize the app.
         """
 
+        init_start = time.perf_counter()
+
         self.__demo_entities = {}
 
+        # the background task manager shared by all demos. created on demand
+        self.__task_manager = None
+
         payload = self.import_module("tk_multi_demo")
+        self.__payload = payload
+
+        # record where the startup time goes
+        self.__startup_timing = payload.timing.StartupTiming(origin=init_start)
+        self.__startup_timing.add_span(
+            "payload_import", init_start, time.perf_counter()
+        )
 
         # define a callback method to show the dialog
         def callback():
-            payload.dialog.show_dialog(self)
+            with self.__startup_timing.span("show_dialog"):
+                payload.dialog.show_dialog(self)
 
         self.engine.register_command(
             "Flow Production Tracking Demos", callback, {"short_name": "demos"}
         )
 
+        self.__startup_timing.add_span("init_app", init_start, time.perf_counter())
+
+    def destroy_app(self):
+        """
+        Tear down the app.
+        """
+
+        if self.__task_manager is not None:
+            self.__task_manager.shut_down()
+            self.__task_manager = None
+
+    def create_demo_task_manager(self):
+        """
+        Return a background task manager for a demo to use.
+
+        All demos share a single pool of background threads owned by the app.
+        The returned object can be used like a ``BackgroundTaskManager``, and
+        calling its ``shut_down()`` method only stops the tasks of the demo.
+        """
+
+        return self.__payload.task_pool.DemoTaskManager(self.get_task_manager())
+
+    def get_task_manager(self):
+        """
+        Return the background task manager shared by all demos.
+        """
+
+        if self.__task_manager is None:
+            task_manager = self.frameworks["tk-framework-shotgunutils"].import_module(
+                "task_manager"
+            )
+            self.__task_manager = task_manager.BackgroundTaskManager(
+                None, start_processing=True
+            )
+
+        return self.__task_manager
+
+    def get_task_manager_stats(self):
+        """
+        Return the current load of the background task manager shared by all
+        demos.
+
+        :returns: A dict with the ``max_threads``, ``threads`` (started),
+            ``busy_threads``, ``running_tasks`` and ``queued_tasks`` counts.
+        """
+
+        return self.__payload.task_pool.get_task_manager_stats(self.get_task_manager())
+
+    @property
+    def startup_timing(self):
+        """
+        The :class:`StartupTiming` recording the duration of the app and dialog
+        startup phases. Use its ``as_dict()`` or ``as_json()`` methods to
+        retrieve the timings.
+        """
+        return self.__startup_timing
+
     def get_demo_entity(self, entity_type=None):
         """
         Return an entity of supplied type that is a good candidate for demo'ing.
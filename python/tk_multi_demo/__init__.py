@@ -9,3 +9,5 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 from . import dialog
+from . import task_pool
+from . import timing
@@ -0,0 +1,305 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import os
+
+import sgtk
+from sgtk.platform.qt import QtCore, QtGui
+
+from .syntax_highlighter import (
+    PythonSyntaxHighlighter,
+    SpanSyntaxHighlighter,
+    get_highlighter,
+)
+from .syntax_tokenizer import tokenize_source
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+# the highlighting modes of the documents:
+# each block is highlighted on the UI thread as it is laid out
+HIGHLIGHT_BLOCKS = "blocks"
+# the whole file is tokenized in the background, and its spans applied to the
+# document in chunks
+HIGHLIGHT_BACKGROUND = "background"
+
+
+def _read_source(path, tokenize=False, span_cache=None):
+    """
+    Read a source file. Runs in a background thread.
+
+    :param str path: The full path to the file.
+    :param bool tokenize: Whether to tokenize the file as well.
+    :param span_cache: The :class:`.span_cache.SpanCache` to look the spans
+        of the file up in and store them to, if any.
+
+    :returns: A tuple of the contents of the file, and its
+        :class:`.syntax_tokenizer.SpanTable` if it was tokenized or ``None``.
+    """
+
+    with open(path, "r") as fh:
+        text = fh.read()
+
+    if not tokenize:
+        return (text, None)
+
+    spans = span_cache.get_spans(text) if span_cache else None
+    if spans is None:
+        spans = tokenize_source(text)
+        if span_cache:
+            span_cache.set_spans(text, spans)
+
+    return (text, spans)
+
+
+class CodeDocumentCache(QtCore.QObject):
+    """
+    A cache of highlighted documents for the source files displayed in the
+    Code tab.
+
+    Files are read by a background task and turned into a ``QTextDocument``
+    with a syntax highlighter. In :data:`HIGHLIGHT_BACKGROUND` mode, the task
+    also tokenizes the whole file so that highlighting the document costs
+    little on the UI thread. The spans of the files can be kept in a
+    :class:`.span_cache.SpanCache` so that they are only computed once across
+    sessions. The document is cached with the modification
+    time of the file, so displaying the file again just swaps the document in
+    the editor instead of reading and highlighting the file again.
+    """
+
+    # emitted when the document of a file requested with get_document is ready.
+    # args are the full path of the file and its QTextDocument
+    document_ready = QtCore.Signal(str, object)
+
+    # the maximum number of documents to keep in the cache
+    MAX_DOCUMENTS = 32
+
+    # files larger than this, in bytes, are always tokenized in the background
+    # and highlighted progressively. generated resource modules that large
+    # aren't highlighted at all
+    PROGRESSIVE_THRESHOLD = 64 * 1024
+
+    def __init__(
+        self,
+        bg_task_manager,
+        palette,
+        highlighting=HIGHLIGHT_BACKGROUND,
+        span_cache=None,
+        parent=None,
+    ):
+        """
+        Initialize the cache.
+
+        :param bg_task_manager: The background task manager to read files with.
+        :param palette: The ``QtGui.QPalette`` to highlight the code with.
+        :param str highlighting: The highlighting mode, :data:`HIGHLIGHT_BLOCKS`
+            or :data:`HIGHLIGHT_BACKGROUND`.
+        :param span_cache: An optional :class:`.span_cache.SpanCache` to keep
+            the spans of the files tokenized in.
+        :param parent: The parent ``QtCore.QObject``.
+        """
+
+        super(CodeDocumentCache, self).__init__(parent)
+
+        self._palette = palette
+
+        if highlighting not in (HIGHLIGHT_BLOCKS, HIGHLIGHT_BACKGROUND):
+            logger.warning(
+                "Unknown code highlighting mode '%s', using '%s'."
+                % (highlighting, HIGHLIGHT_BACKGROUND)
+            )
+            highlighting = HIGHLIGHT_BACKGROUND
+        self._highlighting = highlighting
+        self._span_cache = span_cache
+
+        # the cached (mtime, document) via file path, from the least to the
+        # most recently used
+        self._documents = collections.OrderedDict()
+
+        # the (path, mtime, highlight) of the files being read via task id
+        self._pending_tasks = {}
+
+        self._bg_task_manager = bg_task_manager
+        self._bg_task_manager.task_completed.connect(self._on_task_completed)
+        self._bg_task_manager.task_failed.connect(self._on_task_failed)
+
+    def get_document(self, path):
+        """
+        Returns the highlighted document for a file.
+
+        If the document for the current version of the file is not cached, the
+        file is read in the background and :attr:`document_ready` is emitted
+        once its document is available.
+
+        :param str path: The full path to the file.
+
+        :returns: The ``QtGui.QTextDocument`` for the file, or ``None`` if it is
+            being loaded.
+        """
+
+        try:
+            stat = os.stat(path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            mtime, size = None, 0
+
+        cached = self._documents.get(path)
+        if cached and cached[0] == mtime:
+            self._documents.move_to_end(path)
+            document = cached[1]
+
+            # the palette may have changed since the document was highlighted
+            highlighter = get_highlighter(document)
+            if highlighter is not None:
+                highlighter.set_palette(self._palette)
+
+            return document
+
+        for pending_path, pending_mtime, _ in self._pending_tasks.values():
+            if pending_path == path and pending_mtime == mtime:
+                # already being read
+                return None
+
+        highlighting = self._highlighting
+        if size > self.PROGRESSIVE_THRESHOLD:
+            if self._is_generated(path):
+                highlighting = None
+            else:
+                highlighting = HIGHLIGHT_BACKGROUND
+
+        task_id = self._bg_task_manager.add_task(
+            _read_source,
+            task_kwargs={
+                "path": path,
+                "tokenize": highlighting == HIGHLIGHT_BACKGROUND,
+                "span_cache": self._span_cache,
+            },
+        )
+        self._pending_tasks[task_id] = (path, mtime, highlighting is not None)
+
+        return None
+
+    def get_cached_document(self, path):
+        """
+        Returns the document of a file if it is cached, whatever the version of
+        the file it was created for.
+
+        Unlike :meth:`get_document`, the file is never read and the order the
+        documents are evicted in is left unchanged.
+
+        :param str path: The full path to the file.
+
+        :returns: The ``QtGui.QTextDocument`` for the file, or ``None``.
+        """
+
+        cached = self._documents.get(path)
+        if cached is None:
+            return None
+        return cached[1]
+
+    def set_palette(self, palette):
+        """
+        Highlight the documents with the colors of another palette.
+
+        The cached documents are highlighted again the next time they are
+        returned by :meth:`get_document`.
+
+        :param palette: The ``QtGui.QPalette`` to highlight the code with.
+        """
+        self._palette = palette
+
+    def _is_generated(self, path):
+        """
+        Returns whether a file is a generated qt resource module.
+
+        :param str path: The full path to the file.
+        """
+
+        return os.path.basename(path) == "resources_rc.py"
+
+    def _create_document(self, text, spans=None, highlight=True):
+        """
+        Create a highlighted document for the supplied text.
+
+        :param str text: The contents of the document.
+        :param spans: The :class:`.syntax_tokenizer.SpanTable` of the text, if
+            it has been tokenized.
+        :param bool highlight: Whether to highlight the document at all.
+
+        :returns: A ``QtGui.QTextDocument``.
+        """
+
+        document = QtGui.QTextDocument(self)
+        document.setDocumentLayout(QtGui.QPlainTextDocumentLayout(document))
+        document.setPlainText(text)
+
+        if not highlight:
+            return document
+
+        # the highlighter is owned by the document
+        if spans is None:
+            PythonSyntaxHighlighter(document, self._palette)
+        else:
+            highlighter = SpanSyntaxHighlighter(document, self._palette)
+            highlighter.set_spans(spans)
+
+        return document
+
+    def _on_task_completed(self, uid, group, result):
+        """
+        Cache the document of a file that has been read.
+
+        :param uid: The id of the task that completed.
+        :param group: The group of the task.
+        :param result: The contents of the file and its spans, see
+            :func:`_read_source`.
+        """
+
+        if uid not in self._pending_tasks:
+            return
+
+        path, mtime, highlight = self._pending_tasks.pop(uid)
+
+        text, spans = result
+        document = self._create_document(text, spans, highlight)
+
+        old = self._documents.pop(path, None)
+        if old:
+            old[1].deleteLater()
+        self._documents[path] = (mtime, document)
+
+        # forget about the least recently used documents
+        while len(self._documents) > self.MAX_DOCUMENTS:
+            _, (_, evicted) = self._documents.popitem(last=False)
+            evicted.deleteLater()
+
+        self.document_ready.emit(path, document)
+
+    def _on_task_failed(self, uid, group, msg, stack_trace):
+        """
+        Report a file that could not be read.
+
+        :param uid: The id of the task that failed.
+        :param group: The group of the task.
+        :param msg: The error message.
+        :param stack_trace: The stack trace of the error.
+        """
+
+        if uid not in self._pending_tasks:
+            return
+
+        path, _, _ = self._pending_tasks.pop(uid)
+        logger.warning("Could not read source file '%s': %s" % (path, msg))
+
+        # display the error instead of the file. it isn't cached so the file is
+        # read again the next time it is requested
+        document = self._create_document("# Could not read '%s':\n# %s" % (path, msg))
+        self.document_ready.emit(path, document)
@@ -0,0 +1,383 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import os
+import re
+
+import sgtk
+from sgtk.platform.qt import QtCore
+
+from .file_utils import write_file_atomically
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+# matches the identifiers in a line of code
+_IDENTIFIER_REGEX = re.compile(r"[A-Za-z_]\w*")
+
+
+class CodeSearchIndex(object):
+    """
+    A full-text index of source files.
+
+    Two inverted indexes are kept, both case insensitive: one of the
+    identifiers found in the files, with the lines they are on, and one of the
+    trigrams (3 character sequences) found in the files. A query that is a
+    known identifier is answered from the first one directly. Any other query
+    is looked for on the lines of the files holding all of its trigrams.
+
+    An index is not modified once built: :meth:`updated` returns a new index,
+    so an index can be built in a background thread and searched in another.
+    """
+
+    # bump this whenever the format of the stored index changes
+    VERSION = 1
+
+    def __init__(self, files=None, identifiers=None, trigrams=None):
+        """
+        Initialize the index.
+
+        :param list files: The indexed files, as dicts holding their ``path``,
+            ``mtime`` and ``lines``.
+        :param dict identifiers: The ``[file_id, line_number]`` pairs of the
+            lines each lowercase identifier is on, as built by this class. Built
+            from the files if omitted.
+        :param dict trigrams: The ids of the files each lowercase trigram is
+            in, as built by this class. Built from the files if omitted.
+        """
+
+        self._files = files or []
+
+        # the lowercase lines of each file, to check the trigram candidates
+        self._lower_lines = [
+            [line.lower() for line in record["lines"]] for record in self._files
+        ]
+
+        if identifiers is None or trigrams is None:
+            identifiers, trigrams = self._build_postings()
+
+        self._identifiers = identifiers
+        self._trigrams = trigrams
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an index stored with :meth:`save`.
+
+        :param str path: The path to the json file the index is stored in.
+
+        :returns: A :class:`CodeSearchIndex`, or ``None`` if there is no valid
+            index stored at that path.
+        """
+
+        try:
+            with open(path, "r") as fh:
+                data = json.load(fh)
+        except (IOError, OSError):
+            # no index yet
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable code search index '%s': %s" % (path, e))
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return None
+
+        return cls(data["files"], data["identifiers"], data["trigrams"])
+
+    def save(self, path):
+        """
+        Write the index to disk.
+
+        :param str path: The path to the json file to store the index in.
+        """
+
+        data = {
+            "version": self.VERSION,
+            "files": self._files,
+            "identifiers": self._identifiers,
+            "trigrams": self._trigrams,
+        }
+
+        try:
+            write_file_atomically(path, json.dumps(data))
+        except Exception as e:
+            logger.warning("Could not write code search index '%s': %s" % (path, e))
+
+    def updated(self, paths):
+        """
+        Returns an index of the supplied files.
+
+        Files that haven't been modified since they were indexed are not read
+        again.
+
+        :param list paths: The full paths to the files to index.
+
+        :returns: A new :class:`CodeSearchIndex`, or this index if it is up to
+            date.
+        """
+
+        records = dict((record["path"], record) for record in self._files)
+
+        files = []
+        changed = len(paths) != len(self._files)
+        for path in sorted(paths):
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                # removed since it was listed
+                changed = True
+                continue
+
+            record = records.get(path)
+            if record is None or record["mtime"] != mtime:
+                try:
+                    with open(path, "r") as fh:
+                        lines = fh.read().splitlines()
+                except Exception as e:
+                    logger.debug("Unable to index '%s': %s" % (path, e))
+                    lines = []
+                record = {"path": path, "mtime": mtime, "lines": lines}
+                changed = True
+
+            files.append(record)
+
+        if not changed:
+            return self
+
+        return self.__class__(files)
+
+    def search(self, query, max_results=100):
+        """
+        Search the indexed files.
+
+        :param str query: The text to search for, case insensitive.
+        :param int max_results: The maximum number of results to return.
+
+        :returns: A list of ``(path, line_number, line)`` tuples, where
+            ``line_number`` is 1-based. The lines where the query is a whole
+            identifier come first, the other matches follow in file order.
+        """
+
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        results = []
+        found = set()
+
+        def _add(file_id, line_number):
+            if (file_id, line_number) in found:
+                return
+            found.add((file_id, line_number))
+            record = self._files[file_id]
+            results.append(
+                (record["path"], line_number + 1, record["lines"][line_number])
+            )
+
+        # whole identifiers
+        for file_id, line_number in self._identifiers.get(query, []):
+            _add(file_id, line_number)
+            if len(results) >= max_results:
+                return results
+
+        # any other occurrence, in the files holding all the trigrams
+        if len(query) >= 3:
+            candidates = None
+            for i in range(len(query) - 2):
+                file_ids = self._trigrams.get(query[i : i + 3])
+                if not file_ids:
+                    return results
+                if candidates is None:
+                    candidates = set(file_ids)
+                else:
+                    candidates.intersection_update(file_ids)
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(self._files))
+
+        for file_id in candidates:
+            for line_number, line in enumerate(self._lower_lines[file_id]):
+                if query in line:
+                    _add(file_id, line_number)
+                    if len(results) >= max_results:
+                        return results
+
+        return results
+
+    def _build_postings(self):
+        """
+        Returns the identifier and trigram postings of the indexed files.
+        """
+
+        identifiers = {}
+        trigrams = {}
+
+        for file_id, lines in enumerate(self._lower_lines):
+            file_trigrams = set()
+            for line_number, line in enumerate(lines):
+                for identifier in set(_IDENTIFIER_REGEX.findall(line)):
+                    identifiers.setdefault(identifier, []).append(
+                        [file_id, line_number]
+                    )
+                file_trigrams.update(line[i : i + 3] for i in range(len(line) - 2))
+
+            for trigram in file_trigrams:
+                trigrams.setdefault(trigram, []).append(file_id)
+
+        return (identifiers, trigrams)
+
+
+def _update_index(index, index_path, paths):
+    """
+    Bring an index up to date with a list of files, and store it if it
+    changed. Runs in a background thread.
+
+    :param index: The current :class:`CodeSearchIndex`, or ``None`` to start
+        from the index stored on disk.
+    :param str index_path: The path to the json file the index is stored in.
+    :param list paths: The full paths to the files to index.
+
+    :returns: The up to date :class:`CodeSearchIndex`.
+    """
+
+    if index is None:
+        index = CodeSearchIndex.load(index_path) or CodeSearchIndex()
+
+    updated = index.updated(paths)
+    if updated is not index:
+        updated.save(index_path)
+
+    return updated
+
+
+class CodeSearchIndexer(QtCore.QObject):
+    """
+    Keeps a :class:`CodeSearchIndex` of the demo sources up to date.
+
+    The index stored by the previous session is loaded, and brought up to
+    date, in the background as soon as the demo source files are indexed. It
+    is updated again, also in the background, whenever the source files
+    change.
+    """
+
+    # emitted when the index has been updated
+    index_updated = QtCore.Signal()
+
+    def __init__(self, source_index, index_path, bg_task_manager, parent=None):
+        """
+        Initialize the indexer.
+
+        :param source_index: The :class:`.source_index.DemoSourceIndex` listing
+            the files to index.
+        :param str index_path: The path to the json file to store the index in.
+        :param bg_task_manager: The background task manager to index with.
+        :param parent: The parent ``QtCore.QObject``.
+        """
+
+        super(CodeSearchIndexer, self).__init__(parent)
+
+        self._index_path = index_path
+        self._index = None
+
+        # the id of the update task in progress, and whether the files changed
+        # while it was running
+        self._pending_task = None
+        self._update_again = False
+
+        # updates are coalesced, e.g. when all the demos are listed at startup
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._update)
+
+        self._source_index = source_index
+        self._source_index.demo_files_changed.connect(
+            lambda demo_dir: self._update_timer.start(0)
+        )
+
+        self._bg_task_manager = bg_task_manager
+        self._bg_task_manager.task_completed.connect(self._on_task_completed)
+        self._bg_task_manager.task_failed.connect(self._on_task_failed)
+
+    def search(self, query, max_results=100):
+        """
+        Search the demo sources.
+
+        See :meth:`CodeSearchIndex.search` for details.
+
+        :returns: A list of ``(path, line_number, line)`` tuples. The list is
+            empty until the index has been loaded.
+        """
+
+        if self._index is None:
+            return []
+        return self._index.search(query, max_results)
+
+    def _update(self):
+        """
+        Update the index in the background.
+        """
+
+        if self._pending_task is not None:
+            self._update_again = True
+            return
+
+        # generated qt resource modules are mostly binary data
+        paths = [
+            path
+            for path in self._source_index.get_all_files()
+            if os.path.basename(path) != "resources_rc.py"
+        ]
+
+        self._pending_task = self._bg_task_manager.add_task(
+            _update_index,
+            task_kwargs={
+                "index": self._index,
+                "index_path": self._index_path,
+                "paths": paths,
+            },
+        )
+
+    def _on_task_completed(self, uid, group, result):
+        """
+        Use the index built in the background.
+
+        :param uid: The id of the task that completed.
+        :param group: The group of the task.
+        :param result: The updated :class:`CodeSearchIndex`.
+        """
+
+        if uid != self._pending_task:
+            return
+        self._pending_task = None
+
+        self._index = result
+        self.index_updated.emit()
+
+        if self._update_again:
+            self._update_again = False
+            self._update()
+
+    def _on_task_failed(self, uid, group, msg, stack_trace):
+        """
+        Report an update of the index that failed.
+
+        :param uid: The id of the task that failed.
+        :param group: The group of the task.
+        :param msg: The error message.
+        :param stack_trace: The stack trace of the error.
+        """
+
+        if uid != self._pending_task:
+            return
+        self._pending_task = None
+
+        logger.warning("Could not index the demo sources: %s" % (msg,))
@@ -0,0 +1,136 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import sgtk
+from sgtk.platform.qt import QtCore, QtGui
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class DemoStateSnapshot(object):
+    """
+    A lightweight snapshot of the state of a demo widget.
+
+    The snapshot is taken before a demo widget is destroyed so that a new
+    instance of the demo can be brought back to where the user left it. It
+    records the selection and scroll position of every view in the demo, and
+    any extra state returned by the demo's optional ``get_state()`` method. A
+    demo implementing ``get_state()`` should also implement ``set_state(state)``
+    to restore it (e.g. to reload the query it was displaying).
+    """
+
+    def __init__(self, widget):
+        """
+        Take a snapshot of the supplied demo widget.
+
+        :param widget: The demo ``QtGui.QWidget`` instance.
+        """
+
+        # state specific to the demo (e.g. the query it loaded)
+        self._demo_state = None
+        if hasattr(widget, "get_state"):
+            try:
+                self._demo_state = widget.get_state()
+            except Exception:
+                logger.exception("Unable to get the state of demo %s." % (widget,))
+
+        # the selection and scroll position of each view, in the order the
+        # views are found in the widget hierarchy
+        self._view_states = [
+            self._get_view_state(view) for view in self._get_views(widget)
+        ]
+
+    def restore(self, widget):
+        """
+        Restore the snapshot onto a new instance of the demo widget.
+
+        :param widget: The demo ``QtGui.QWidget`` instance.
+        """
+
+        if self._demo_state is not None and hasattr(widget, "set_state"):
+            try:
+                widget.set_state(self._demo_state)
+            except Exception:
+                logger.exception("Unable to set the state of demo %s." % (widget,))
+
+        for view, view_state in zip(self._get_views(widget), self._view_states):
+            model = view.model()
+            if model is not None and model.rowCount():
+                self._set_view_state(view, view_state)
+            elif model is not None:
+                # the view's data is still loading, restore the state once the
+                # first rows are available
+                self._set_view_state_when_populated(view, view_state)
+
+    def _get_views(self, widget):
+        """
+        Returns all item views in the supplied widget hierarchy.
+        """
+        return widget.findChildren(QtGui.QAbstractItemView)
+
+    def _get_view_state(self, view):
+        """
+        Returns the selection and scroll position of a view.
+
+        The selection is stored as a list of row paths from the root of the
+        model so that it can be looked up again in a new model.
+        """
+
+        selected_paths = []
+        selection_model = view.selectionModel()
+        if selection_model is not None:
+            for index in selection_model.selectedIndexes():
+                path = []
+                while index.isValid():
+                    path.insert(0, (index.row(), index.column()))
+                    index = index.parent()
+                selected_paths.append(path)
+
+        return {
+            "selection": selected_paths,
+            "h_scroll": view.horizontalScrollBar().value(),
+            "v_scroll": view.verticalScrollBar().value(),
+        }
+
+    def _set_view_state(self, view, view_state):
+        """
+        Apply a state returned by :meth:`_get_view_state` to a view.
+        """
+
+        model = view.model()
+        selection_model = view.selectionModel()
+        if model is not None and selection_model is not None:
+            for path in view_state["selection"]:
+                index = QtCore.QModelIndex()
+                for row, column in path:
+                    index = model.index(row, column, index)
+                if index.isValid():
+                    selection_model.select(index, QtGui.QItemSelectionModel.Select)
+
+        view.horizontalScrollBar().setValue(view_state["h_scroll"])
+        view.verticalScrollBar().setValue(view_state["v_scroll"])
+
+    def _set_view_state_when_populated(self, view, view_state):
+        """
+        Apply a view state the first time rows are inserted into its model.
+        """
+
+        model = view.model()
+
+        def _on_rows_inserted(*args):
+            try:
+                model.rowsInserted.disconnect(_on_rows_inserted)
+            except (RuntimeError, TypeError):
+                # already disconnected
+                return
+            self._set_view_state(view, view_state)
+
+        model.rowsInserted.connect(_on_rows_inserted)
@@ -8,42 +8,55 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-# import the demos to display here. They won't be added to the menu until
-# they're included in the DEMO_LIST below.
-from .activity_stream_widget import ActivityStreamWidgetDemo
-from .custom_field_widget import CustomFieldWidgetDemo
-from .context_widget import ContextWidgetDemo
-from .elided_label import ElidedLabelDemo
-from .engine_show_busy import EngineShowBusyDemo
-from .entity_field_menu import EntityFieldMenuDemo
-from .field_widget_delegate import FieldWidgetDelegateDemo
-from .field_widgets_form import FieldWidgetsFormDemo
-from .global_search_widget import GlobalSearchWidgetDemo
-from .help import HelpDemo
-from .help_screen_popup import HelpScreenPopupDemo
-from .navigation import NavigationDemo
-from .note_input_widget import NoteInputWidgetDemo
-from .overlay import OverlayDemo
-from .search_widget import SearchWidgetDemo
-from .screen_capture_widget import ScreenCaptureWidgetDemo
-from .playback_label import PlaybackLabelDemo
-from .shotgun_menu import ShotgunMenuDemo
-from .shotgun_entity_model import ShotgunEntityModelDemo
-from .shotgun_hierarchy import ShotgunHierarchyDemo
-from .shotgun_globals import ShotgunGlobalsDemo
-from .spinner_widget import SpinnerWidgetDemo
-from .filter_menu import FilterMenuDemo
-from .shotgun_widget import ShotgunWidgetDemo
-from .view_item_delegate import ViewItemDelegateDemo
-from .sg_qicons import SGQIconDemo
-from .sg_qwidgets import SGQWidgetsDemo
-from .message_box import MessageBoxDemo
+from .registry import DemoDescriptor
+
+# describe the demos to display here. Describing a demo does not import it; the
+# demo's package is only imported the first time the demo is displayed. They
+# won't be added to the menu until they're included in the DEMO_LIST below.
+ActivityStreamWidgetDemo = DemoDescriptor(
+    "activity_stream_widget", "ActivityStreamWidgetDemo"
+)
+CustomFieldWidgetDemo = DemoDescriptor("custom_field_widget", "CustomFieldWidgetDemo")
+ContextWidgetDemo = DemoDescriptor("context_widget", "ContextWidgetDemo")
+ElidedLabelDemo = DemoDescriptor("elided_label", "ElidedLabelDemo")
+EngineShowBusyDemo = DemoDescriptor("engine_show_busy", "EngineShowBusyDemo")
+EntityFieldMenuDemo = DemoDescriptor("entity_field_menu", "EntityFieldMenuDemo")
+FieldWidgetDelegateDemo = DemoDescriptor(
+    "field_widget_delegate", "FieldWidgetDelegateDemo"
+)
+FieldWidgetsFormDemo = DemoDescriptor("field_widgets_form", "FieldWidgetsFormDemo")
+GlobalSearchWidgetDemo = DemoDescriptor(
+    "global_search_widget", "GlobalSearchWidgetDemo"
+)
+HelpDemo = DemoDescriptor("help", "HelpDemo")
+HelpScreenPopupDemo = DemoDescriptor("help_screen_popup", "HelpScreenPopupDemo")
+NavigationDemo = DemoDescriptor("navigation", "NavigationDemo")
+NoteInputWidgetDemo = DemoDescriptor("note_input_widget", "NoteInputWidgetDemo")
+OverlayDemo = DemoDescriptor("overlay", "OverlayDemo")
+SearchWidgetDemo = DemoDescriptor("search_widget", "SearchWidgetDemo")
+ScreenCaptureWidgetDemo = DemoDescriptor(
+    "screen_capture_widget", "ScreenCaptureWidgetDemo"
+)
+PlaybackLabelDemo = DemoDescriptor("playback_label", "PlaybackLabelDemo")
+ShotgunMenuDemo = DemoDescriptor("shotgun_menu", "ShotgunMenuDemo")
+ShotgunEntityModelDemo = DemoDescriptor(
+    "shotgun_entity_model", "ShotgunEntityModelDemo"
+)
+ShotgunHierarchyDemo = DemoDescriptor("shotgun_hierarchy", "ShotgunHierarchyDemo")
+ShotgunGlobalsDemo = DemoDescriptor("shotgun_globals", "ShotgunGlobalsDemo")
+SpinnerWidgetDemo = DemoDescriptor("spinner_widget", "SpinnerWidgetDemo")
+FilterMenuDemo = DemoDescriptor("filter_menu", "FilterMenuDemo")
+ShotgunWidgetDemo = DemoDescriptor("shotgun_widget", "ShotgunWidgetDemo")
+ViewItemDelegateDemo = DemoDescriptor("view_item_delegate", "ViewItemDelegateDemo")
+SGQIconDemo = DemoDescriptor("sg_qicons", "SGQIconDemo")
+SGQWidgetsDemo = DemoDescriptor("sg_qwidgets", "SGQWidgetsDemo")
+MessageBoxDemo = DemoDescriptor("message_box", "MessageBoxDemo")
 
 # the default demo to display when the app starts up.
 DEMO_DEFAULT = HelpDemo
 
 # this list defines the hierarchy of items that show up in the list of demos to
-# display. each string starts a new grouping of demos. demo classes can show up
+# display. each string starts a new grouping of demos. demos can show up
 # in multiple groups. only one instance of a demo will be created however.
 DEMOS_LIST = [
     "Qt Widgets Framework",
@@ -16,11 +16,6 @@ context_selector = sgtk.platform.import_framework(
     "tk-framework-qtwidgets", "context_selector"
 )
 
-# import the task_manager module from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 # import the shotgun_globals module from shotgunutils framework
 shotgun_globals = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_globals"
@@ -43,8 +38,9 @@ class ContextWidgetDemo(QtGui.QWidget):
         # call the base class init
         super(ContextWidgetDemo, self).__init__(parent)
 
-        # create a background task manager for each of our components to use
-        self._task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for each of our components to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._task_manager = sgtk.platform.current_bundle().create_demo_task_manager()
         shotgun_globals.register_bg_task_manager(self._task_manager)
 
         self._context_widget = context_selector.ContextWidget(self)
@@ -26,11 +26,6 @@ shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
 
-# import the task_manager module from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 # import the shotgun_fields module from the qtwidgets framework
 views = sgtk.platform.import_framework("tk-framework-qtwidgets", "views")
 
@@ -54,8 +49,11 @@ class CustomFieldWidgetDemo(QtGui.QWidget):
         # call the base class init
         super(CustomFieldWidgetDemo, self).__init__(parent)
 
-        # create a background task manager for each of our components to use
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for each of our components to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
 
         # the fields manager is used to query which fields are supported
         # for display. it can also be used to find out which fields are
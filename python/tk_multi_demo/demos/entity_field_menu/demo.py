@@ -21,11 +21,6 @@ shotgun_fields = sgtk.platform.import_framework(
     "tk-framework-qtwidgets", "shotgun_fields"
 )
 
-# import the task manager from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 
 class EntityFieldMenuDemo(QtGui.QWidget):
     """
@@ -41,8 +36,11 @@ class EntityFieldMenuDemo(QtGui.QWidget):
         # call the base class init
         super(EntityFieldMenuDemo, self).__init__(parent)
 
-        # create a background task manager for each of our components to use
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for each of our components to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
 
         # --- build an entity field menu
 
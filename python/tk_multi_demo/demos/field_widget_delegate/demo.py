@@ -33,10 +33,6 @@ shotgun_model = sgtk.platform.import_framework(
 # import the views module from qtwidgets framework
 views = sgtk.platform.import_framework("tk-framework-qtwidgets", "views")
 
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 
 class FieldWidgetDelegateDemo(QtGui.QWidget):
     """
@@ -56,7 +52,11 @@ class FieldWidgetDelegateDemo(QtGui.QWidget):
         # visible to the user and editable by the user. the fields manager
         # needs time to initialize itself. once that's done, the widgets can
         # begin to be populated.
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self, True)
+        # the task manager runs its tasks on the threads the app shares between
+        # all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
         shotgun_globals.register_bg_task_manager(self._bg_task_manager)
         self._fields_manager = shotgun_fields.ShotgunFieldManager(
             self, self._bg_task_manager
@@ -68,6 +68,7 @@ class FieldWidgetDelegateDemo(QtGui.QWidget):
         """
         Destructor. Ensures that all threads are properly joined before exit.
         """
+        shotgun_globals.unregister_bg_task_manager(self._bg_task_manager)
         self._bg_task_manager.shut_down()
 
     def _populate_ui(self):
@@ -17,11 +17,6 @@ shotgun_fields = sgtk.platform.import_framework(
     "tk-framework-qtwidgets", "shotgun_fields"
 )
 
-# import the task_manager module from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 # import the shotgun_globals module from shotgunutils framework
 shotgun_globals = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_globals"
@@ -43,8 +38,9 @@ class FieldWidgetsFormDemo(QtGui.QWidget):
 
         self._bundle = sgtk.platform.current_bundle()
 
-        # create a background task manager for each of our components to use
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for each of our components to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = self._bundle.create_demo_task_manager()
 
         # the fields manager is used to query which fields are supported
         # for display. it can also be used to find out which fields are
@@ -13,10 +13,6 @@ from sgtk.platform.qt import QtCore, QtGui
 
 from .ui import resources_rc
 
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
@@ -51,7 +47,11 @@ class FilterMenuDemo(QtGui.QWidget):
         super(FilterMenuDemo, self).__init__(parent)
 
         # Set up the PTR source/proxy models and menu.
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self, True)
+        # the task manager runs its tasks on the threads the app shares between
+        # all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
         self._sg_source_model = shotgun_model.SimpleShotgunModel(
             self, self._bg_task_manager
         )
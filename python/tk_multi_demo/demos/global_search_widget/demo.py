@@ -16,11 +16,6 @@ global_search_widget = sgtk.platform.import_framework(
     "tk-framework-qtwidgets", "global_search_widget"
 )
 
-# import the task manager from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 
 class GlobalSearchWidgetDemo(QtGui.QWidget):
     """
@@ -36,8 +31,11 @@ class GlobalSearchWidgetDemo(QtGui.QWidget):
         # call the base class init
         super(GlobalSearchWidgetDemo, self).__init__(parent)
 
-        # create a bg task manager for pulling data from PTR
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a bg task manager for pulling data from PTR. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
 
         # create the widget
         search_widget = global_search_widget.GlobalSearchWidget(self)
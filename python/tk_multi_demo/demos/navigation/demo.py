@@ -21,11 +21,6 @@ shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
 
-# import the task manager from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 
 class NavigationDemo(QtGui.QWidget):
     """
@@ -44,8 +39,9 @@ class NavigationDemo(QtGui.QWidget):
         # get a handle on the current toolkit bundle (the demo app).
         self._app = sgtk.platform.current_bundle()
 
-        # create a background task manager for the widget to use
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for the widget to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = self._app.create_demo_task_manager()
 
         # keep track of when we're navigating
         self._navigating = False
@@ -17,11 +17,6 @@ note_input_widget = sgtk.platform.import_framework(
     "tk-framework-qtwidgets", "note_input_widget"
 )
 
-# import the task manager from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 
 class NoteInputWidgetDemo(QtGui.QWidget):
     """
@@ -39,8 +34,9 @@ class NoteInputWidgetDemo(QtGui.QWidget):
         # get a handle on the current toolkit bundle (the demo app).
         self._app = sgtk.platform.current_bundle()
 
-        # create a background task manager for the widget to use
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for the widget to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = self._app.create_demo_task_manager()
 
         # create an instance of the NoteInputWidget and then give it the task
         # manager.
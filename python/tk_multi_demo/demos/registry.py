@@ -0,0 +1,96 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib
+import os
+import time
+
+import sgtk
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class DemoDescriptor(object):
+    """
+    A lightweight description of a demo that can be listed in the UI without
+    importing the demo's package.
+
+    Importing a demo package pulls in its frameworks and its generated
+    ``resources_rc`` module, so the widget class is only imported the first
+    time :meth:`load` is called.
+    """
+
+    def __init__(self, package_name, class_name):
+        """
+        Initialize the descriptor.
+
+        :param str package_name: The name of the demo package, relative to
+            the ``demos`` package (e.g. ``"help"``).
+        :param str class_name: The name of the demo widget class exposed by
+            the demo package.
+        """
+
+        self._package_name = package_name
+        self._class_name = class_name
+        self._widget_class = None
+
+    def __repr__(self):
+        return "<DemoDescriptor %s.%s>" % (self._package_name, self._class_name)
+
+    @property
+    def package_name(self):
+        """The name of the demo package relative to the ``demos`` package."""
+        return self._package_name
+
+    @property
+    def class_name(self):
+        """The name of the demo widget class."""
+        return self._class_name
+
+    @property
+    def module_path(self):
+        """The fully qualified name of the demo package."""
+        return "%s.%s" % (__package__, self._package_name)
+
+    @property
+    def directory(self):
+        """The directory containing the demo's files."""
+        return os.path.join(os.path.dirname(__file__), self._package_name)
+
+    @property
+    def manifest(self):
+        """The full path to the demo's ``demo.yml`` manifest file."""
+        return os.path.join(self.directory, "demo.yml")
+
+    @property
+    def is_loaded(self):
+        """``True`` if the demo widget class has already been imported."""
+        return self._widget_class is not None
+
+    def load(self):
+        """
+        Import the demo package and return the demo widget class.
+
+        The class is cached so the import only happens once.
+
+        :returns: The demo ``QtGui.QWidget`` subclass.
+        """
+
+        if self._widget_class is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.module_path)
+            self._widget_class = getattr(module, self._class_name)
+            logger.debug(
+                "Imported demo %s in %.1fms"
+                % (self.module_path, (time.perf_counter() - start) * 1000)
+            )
+
+        return self._widget_class
@@ -21,11 +21,6 @@ shotgun_fields = sgtk.platform.import_framework(
     "tk-framework-qtwidgets", "shotgun_fields"
 )
 
-# import the task manager from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 # The default entity and field name to display
 DEFAULT_ENTITY_TYPE = "HumanUser"
 DEFAULT_FIELD_NAME = "name"
@@ -47,8 +42,9 @@ class ShotgunGlobalsDemo(QtGui.QWidget):
         # the app (current bundle) from the parent widget
         self._app = sgtk.platform.current_bundle()
 
-        # create a background task manager for each of our components to use
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for each of our components to use. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = self._app.create_demo_task_manager()
 
         # the fields manager is used to query which fields are supported
         # for display. it can also be used to find out which fields are
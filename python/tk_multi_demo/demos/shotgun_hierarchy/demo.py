@@ -27,11 +27,6 @@ shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
 
-# import the task manager from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 
 class ShotgunHierarchyDemo(QtGui.QWidget):
     """
@@ -46,9 +41,12 @@ class ShotgunHierarchyDemo(QtGui.QWidget):
 
         super(ShotgunHierarchyDemo, self).__init__(parent)
 
-        # create a background task manager for each of our components to use
-        # for threading
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self)
+        # get a background task manager for each of our components to use
+        # for threading. it runs its tasks on the threads the app shares
+        # between all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
 
         doc_lbl = QtGui.QLabel(
             "Browse the hierarchy on the left to find <tt>Version</tt> " "entities."
@@ -29,10 +29,6 @@ shotgun_globals = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_globals"
 )
 
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
-
 utils = sgtk.platform.import_framework("tk-framework-qtwidgets", "utils")
 
 
@@ -50,9 +46,11 @@ class ShotgunWidgetDemo(QtGui.QWidget):
         # call the base class init
         super(ShotgunWidgetDemo, self).__init__(parent)
 
-        # create a single instance of the task manager that manages all
-        # asynchronous work/tasks
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self, True)
+        # get the task manager that manages all asynchronous work/tasks. it
+        # runs its tasks on the threads the app shares between all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
         shotgun_globals.register_bg_task_manager(self._bg_task_manager)
 
         # setup the ui
@@ -75,8 +73,26 @@ class ShotgunWidgetDemo(QtGui.QWidget):
         """
         Destructor. Ensures that all threads are properly joined before exit.
         """
+        shotgun_globals.unregister_bg_task_manager(self._bg_task_manager)
         self._bg_task_manager.shut_down()
 
+    def get_state(self):
+        """
+        Return the state of the demo so that it can be restored if the demo is recreated.
+        """
+
+        return {"icon_mode": self.ui.view.viewMode() == QtGui.QListView.IconMode}
+
+    def set_state(self, state):
+        """
+        Restore a state returned by :meth:`get_state`.
+
+        :param dict state: The demo state.
+        """
+
+        if state["icon_mode"]:
+            self._switch_view_mode()
+
     def populate_ui(self, icon_mode=False):
         """
         Populate the UI with some data.
@@ -162,6 +178,53 @@ class ShotgunWidgetDelegate(shotgun_view.EditSelectedWidgetDelegate):
         """
         shotgun_view.EditSelectedWidgetDelegate.__init__(self, view)
 
+        # The "View in Shotgun" actions via entity id, reused between the paints of the items
+        self._actions = {}
+        self._base_url = None
+
+        # the actions are created for the entities loaded in the model, forget them when the
+        # model data is refreshed
+        model = view.model()
+        if model is not None:
+            model.modelReset.connect(self.clear_action_cache)
+            if hasattr(model, "data_refreshed"):
+                model.data_refreshed.connect(self.clear_action_cache)
+
+    def clear_action_cache(self, *args):
+        """
+        Clear the cached actions and urls of the entities.
+
+        The args of the model signals this is connected to are ignored.
+        """
+
+        for action in self._actions.values():
+            action.deleteLater()
+        self._actions = {}
+
+    def _get_action(self, entity_id):
+        """
+        Return the action opening the Flow Production Tracking Web page of an entity,
+        creating it the first time it is requested.
+
+        :param entity_id: The id of the entity
+        :returns: The QAction for the entity
+        """
+
+        action = self._actions.get(entity_id)
+        if action is not None:
+            return action
+
+        if self._base_url is None:
+            self._base_url = sgtk.platform.current_bundle().shotgun.base_url
+        url = QtCore.QUrl(
+            "%s/page/project_overview?project_id=%d" % (self._base_url, entity_id)
+        )
+
+        action = QtGui.QAction("View in Shotgun", self)
+        action.triggered[()].connect(lambda: QtGui.QDesktopServices.openUrl(url))
+        self._actions[entity_id] = action
+        return action
+
     def _on_before_selection(self, widget, model_index, style_options):
         """
         Called when the associated widget is selected. This method
@@ -200,13 +263,7 @@ class ShotgunWidgetDelegate(shotgun_view.EditSelectedWidgetDelegate):
 
         # add an action to the widget toolbox to be able to open the Flow Production Tracking
         # Web page of the current item
-        sg_url = sgtk.platform.current_bundle().shotgun.base_url
-        url = "%s/page/project_overview?project_id=%d" % (sg_url, sg_item["id"])
-        fn = lambda: QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
-        a = QtGui.QAction("View in Shotgun", None)
-        a.triggered[()].connect(fn)
-
-        widget.set_actions([a])
+        widget.set_actions([self._get_action(sg_item["id"])])
 
 
 class ListItemDelegate(ShotgunWidgetDelegate):
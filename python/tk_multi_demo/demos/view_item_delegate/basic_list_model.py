@@ -8,13 +8,21 @@
 # agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import time
+
 from sgtk.platform.qt import QtCore, QtGui
 
+from .pixmap_cache import PixmapCache
+
 
 class BasicListItemModel(QtCore.QAbstractListModel):
     """
     A subclass of the Qt QAbstractListModel (does not use QStandardItem objects). A very basic model
     with some hard coded data to highlight the capabilties of the ViewItemDelegate.
+
+    The data is stored by column: one list of values per role, where the value at index i is the
+    value of the item at row i. Looking up the data for a role is a single dictionary lookup, and
+    items can be inserted and removed in bulk, so that the model scales to 100k+ items.
     """
 
     # The model roles for the delegate to use. The ViewItemRolesMixin class may be used for convenience
@@ -34,6 +42,39 @@ class BasicListItemModel(QtCore.QAbstractListModel):
         BUTTON_STATE_ROLE,
     ) = range(QtCore.Qt.UserRole, QtCore.Qt.UserRole + 12)
 
+    # The roles stored by the model, with the value of the items inserted without one.
+    ROLE_DEFAULTS = {
+        VIEW_ITEM_THUMBNAIL_ROLE: None,
+        VIEW_ITEM_HEADER_ROLE: None,
+        VIEW_ITEM_SUBTITLE_ROLE: None,
+        VIEW_ITEM_TEXT_ROLE: None,
+        VIEW_ITEM_SHORT_TEXT_ROLE: None,
+        VIEW_ITEM_ICON_ROLE: None,
+        VIEW_ITEM_EXPAND_ROLE: None,
+        VIEW_ITEM_WIDTH_ROLE: None,
+        VIEW_ITEM_HEIGHT_ROLE: None,
+        VIEW_ITEM_LOADING_ROLE: False,
+        VIEW_ITEM_SEPARATOR_ROLE: False,
+        QtCore.Qt.CheckStateRole: QtCore.Qt.Unchecked,
+        BUTTON_STATE_ROLE: True,  # True is enabled and False is disabled
+    }
+
+    # The text roles that are not displayed in draft mode
+    DRAFT_HIDDEN_ROLES = (
+        VIEW_ITEM_SUBTITLE_ROLE,
+        VIEW_ITEM_TEXT_ROLE,
+        VIEW_ITEM_SHORT_TEXT_ROLE,
+    )
+
+    # The roles giving an item a size of its own, when their value is not the default
+    SIZE_ROLES = (VIEW_ITEM_EXPAND_ROLE, VIEW_ITEM_WIDTH_ROLE, VIEW_ITEM_HEIGHT_ROLE)
+
+    # The boolean flag roles that can be toggled for all the items at once
+    FLAG_ROLES = (VIEW_ITEM_LOADING_ROLE, VIEW_ITEM_SEPARATOR_ROLE)
+
+    # The thumbnail pixmaps, shared by all the models
+    _thumbnail_cache = PixmapCache()
+
     def __init__(self, *args, **kwargs):
         """
         BasicListItemModel constructor.
@@ -41,84 +82,78 @@ class BasicListItemModel(QtCore.QAbstractListModel):
 
         super(BasicListItemModel, self).__init__(*args, **kwargs)
 
-        # The underlying data structure. Just hard code some data to display.
-        # The data structure is stored as a list, where each item in the list represents
-        # an item (index) in the model. Each item is itself a list of values, where the
-        # value at index i in the list may be referred to as the "column" i value.
-        self._data = [
-            # Item/Index 0
-            [
-                ":/tk_multi_demo_view_item_delegate/project_1.png",  # Column 0, thumbnail data
-                "Title",  # Column 1, header text
-                "Subtitle",  # Column 2, subttile text
-                "This is some longer text.<br/>With multiple lines.<br/>The end.",  # Column 3, long text
-                "Short txt<br/>for condensed views",  # Column 4, short text
-                None,  # Column 5, icon data
-                None,  # Column 6, expand state
-                None,  # Column 7, width hint
-                None,  # Column 8, height hint
-                False,  # Column 9, loading state
-                False,  # Column 10, has separator
-                QtCore.Qt.Unchecked,  # Column 11, checkstate
-                True,  # Column 11, button state where True is enabled and False is disabled
-            ],
-            # Item/Index 1
+        # The underlying data structure. The data is stored as a dictionary mapping each role to the
+        # list of values of the items for that role (e.g. the value for the item/index i is the value
+        # at index i in the list).
+        self._columns = dict((role, []) for role in self.ROLE_DEFAULTS)
+        self._row_count = 0
+
+        # The flag roles toggled for all the items since their values were stored. Toggling a flag
+        # for all the items only updates this model level state, the value of an item for these
+        # roles is the opposite of the stored value.
+        self._toggled_roles = set()
+
+        # The size to scale the thumbnails down to, None for their original size
+        self._thumbnail_size = None
+
+        # Whether to return data that is cheap to render, see `set_draft_mode`
+        self._draft_mode = False
+
+        # Just hard code some data to display. Each item is a dictionary of its values via role,
+        # the roles omitted take their default value.
+        self.append_items(
             [
-                ":/tk_multi_demo_view_item_delegate/project_2.png",
-                "<b><span style='font-size:14px'>HTML Formatting</span></b>",
-                "<i>Italic Subtitle</i>",
-                "<br/>".join(
-                    [
-                        "<span style='color:#18A7E3'>NOTICE</span> the icon in top-left thumbnail corner",
-                        "Different icons can be shown over the thumbnail in any corner",
-                        "Oh, and did you notice the HTML formatted <span style='color:#18A7E3'>text</span>?",
-                        "The end.",
-                    ]
-                ),
-                "<b>Short txt</b><br/><i>Item 2</i>",
+                # Item/Index 0
                 {
-                    "top-left": QtGui.QPixmap(
-                        ":/tk_multi_demo_view_item_delegate/project_1.png"
-                    )
+                    self.VIEW_ITEM_THUMBNAIL_ROLE: ":/tk_multi_demo_view_item_delegate/project_1.png",
+                    self.VIEW_ITEM_HEADER_ROLE: "Title",
+                    self.VIEW_ITEM_SUBTITLE_ROLE: "Subtitle",
+                    self.VIEW_ITEM_TEXT_ROLE: "This is some longer text.<br/>With multiple lines.<br/>The end.",
+                    self.VIEW_ITEM_SHORT_TEXT_ROLE: "Short txt<br/>for condensed views",
                 },
-                None,
-                None,
-                None,
-                False,
-                False,
-                QtCore.Qt.Unchecked,
-                True,
-            ],
-            # Item/Index 2
-            [
-                ":/tk_multi_demo_view_item_delegate/project_1.png",
-                "<u><span style='font-size:14px'>Eliding and Clipping Text</span></u>",
-                "<span style='color:rgba(240,240,240,60)'>Faded Subtitle</span>",
-                "<br/>".join(
-                    [
-                        "This is a really really really really really really really really really really really realy realy long line that should be elided",
-                        "(Did you notice my copy paste typo from above?)"
-                        "A tooltip will display with the full text when any text is elided",
-                        "<i>Note that eliding and clipping text are different</i>",
-                        "<b>Eliding</b> text happens when a single line is too long (horizontally)",
-                        "<b>Clipping</b> text happens when the number of text lines is too long (vertically)",
-                        "An expand/collapse button is show when text is clipped",
-                        "Check <span style='color:#18A7E3'>Auto Expand</span> option to ensure the row height fits all text",
-                        "Uncheck Auto Expand option and move the slider to change the row height",
-                        "The end.",
-                    ]
-                ),
-                "<span style='color:#18A7E3'>Short txt</span><br/><span style='color:rgba(240,240,240,60)'>Item 3</span>",
-                None,
-                None,
-                None,
-                None,
-                False,
-                False,
-                QtCore.Qt.Unchecked,
-                True,
-            ],
-        ]
+                # Item/Index 1
+                {
+                    self.VIEW_ITEM_THUMBNAIL_ROLE: ":/tk_multi_demo_view_item_delegate/project_2.png",
+                    self.VIEW_ITEM_HEADER_ROLE: "<b><span style='font-size:14px'>HTML Formatting</span></b>",
+                    self.VIEW_ITEM_SUBTITLE_ROLE: "<i>Italic Subtitle</i>",
+                    self.VIEW_ITEM_TEXT_ROLE: "<br/>".join(
+                        [
+                            "<span style='color:#18A7E3'>NOTICE</span> the icon in top-left thumbnail corner",
+                            "Different icons can be shown over the thumbnail in any corner",
+                            "Oh, and did you notice the HTML formatted <span style='color:#18A7E3'>text</span>?",
+                            "The end.",
+                        ]
+                    ),
+                    self.VIEW_ITEM_SHORT_TEXT_ROLE: "<b>Short txt</b><br/><i>Item 2</i>",
+                    self.VIEW_ITEM_ICON_ROLE: {
+                        "top-left": QtGui.QPixmap(
+                            ":/tk_multi_demo_view_item_delegate/project_1.png"
+                        )
+                    },
+                },
+                # Item/Index 2
+                {
+                    self.VIEW_ITEM_THUMBNAIL_ROLE: ":/tk_multi_demo_view_item_delegate/project_1.png",
+                    self.VIEW_ITEM_HEADER_ROLE: "<u><span style='font-size:14px'>Eliding and Clipping Text</span></u>",
+                    self.VIEW_ITEM_SUBTITLE_ROLE: "<span style='color:rgba(240,240,240,60)'>Faded Subtitle</span>",
+                    self.VIEW_ITEM_TEXT_ROLE: "<br/>".join(
+                        [
+                            "This is a really really really really really really really really really really really realy realy long line that should be elided",
+                            "(Did you notice my copy paste typo from above?)"
+                            "A tooltip will display with the full text when any text is elided",
+                            "<i>Note that eliding and clipping text are different</i>",
+                            "<b>Eliding</b> text happens when a single line is too long (horizontally)",
+                            "<b>Clipping</b> text happens when the number of text lines is too long (vertically)",
+                            "An expand/collapse button is show when text is clipped",
+                            "Check <span style='color:#18A7E3'>Auto Expand</span> option to ensure the row height fits all text",
+                            "Uncheck Auto Expand option and move the slider to change the row height",
+                            "The end.",
+                        ]
+                    ),
+                    self.VIEW_ITEM_SHORT_TEXT_ROLE: "<span style='color:#18A7E3'>Short txt</span><br/><span style='color:rgba(240,240,240,60)'>Item 3</span>",
+                },
+            ]
+        )
 
     def rowCount(self, parent=QtCore.QModelIndex()):
         """
@@ -127,43 +162,11 @@ class BasicListItemModel(QtCore.QAbstractListModel):
         Returns the number of rows in the model.
         """
 
-        return len(self._data)
-
-    def setData(self, index, value, role=QtCore.Qt.DisplayRole):
-        """
-        Override the base method.
-
-        Set the data for the index and role.
-        """
-
-        if not index.isValid():
-            return
-
-        data_changed = False
-
-        # Check if the role is "editable"
-        if role in (
-            self.VIEW_ITEM_EXPAND_ROLE,
-            self.VIEW_ITEM_LOADING_ROLE,
-            self.VIEW_ITEM_SEPARATOR_ROLE,
-        ):
-            if index.row() < 0 or index.row() >= len(self._data):
-                return None
-
-            row_value = self._data[index.row()]
-            column = self.get_role_column(role)
-
-            if 0 <= column < len(row_value):
-                row_value[column] = value
-                data_changed = True
+        if parent.isValid():
+            # This is a list, items don't have children
+            return 0
 
-        if data_changed:
-            # Something changed, emit the sigal
-            try:
-                self.dataChanged.emit(index, index, [role])
-            except TypeError:
-                # Pyside version compaitbility
-                self.dataChanged.emit(index, index)
+        return self._row_count
 
     def data(self, index, role=QtCore.Qt.DisplayRole):
         """
@@ -180,29 +183,33 @@ class BasicListItemModel(QtCore.QAbstractListModel):
             return QtGui.QApplication.palette().midlight()
 
         # Ensure the index is valid with the internal model data
-        if index.row() < 0 or index.row() >= len(self._data):
+        row = index.row()
+        if row < 0 or row >= self._row_count:
             return None
 
-        # Get the model data for this index
-        row_value = self._data[index.row()]
-
-        # Get the column associated with this role to index into the data for this row.
-        column = self.get_role_column(role)
+        if self._draft_mode and role in self.DRAFT_HIDDEN_ROLES:
+            return None
 
-        if column < 0:
-            # Role is not set to a specific column, just return the data is is.
-            return row_value
+        # Get the values stored for this role
+        column = self._columns.get(role)
 
-        if column >= len(row_value):
-            # Invalid column
+        if column is None:
+            # Unsupported role
             return None
 
-        # Get the speciifc data value for this role
-        value = row_value[column]
+        # Get the specific data value for this item
+        value = column[row]
 
         # Perform any extra logic based on the role
         if role == self.VIEW_ITEM_THUMBNAIL_ROLE:
-            return QtGui.QPixmap(value)
+            if value is None:
+                return None
+            return self._thumbnail_cache.get_pixmap(
+                value, self._thumbnail_size, fast=self._draft_mode
+            )
+
+        if role in self._toggled_roles:
+            return not value
 
         return value
 
@@ -210,110 +217,334 @@ class BasicListItemModel(QtCore.QAbstractListModel):
         """
         Override the base method.
 
-        Return the data for the index and role.
+        Set the data for the index and role.
+
+        :return: True if the data was set, else False.
         """
 
         if not index.isValid():
-            return None
+            return False
 
         # Ensure the index is valid with the internal model data
-        if index.row() < 0 or index.row() >= len(self._data):
-            return None
+        row = index.row()
+        if row < 0 or row >= self._row_count:
+            return False
+
+        # Get the values stored for this role
+        column = self._columns.get(role)
+
+        if column is None:
+            # Role is not stored
+            return False
+
+        if role in self._toggled_roles:
+            value = not value
+
+        column[row] = value
+
+        # Something changed, emit the signal
+        self._emit_data_changed(index, index, [role])
+        return True
 
-        # Get the model data for this index
-        row_value = self._data[index.row()]
+    def set_thumbnail_size(self, size):
+        """
+        Set the size the thumbnails are displayed at. The thumbnails are scaled down to this size
+        once, and the scaled pixmaps are returned for the thumbnail role from then on, instead of
+        having the delegate scale them on every paint.
+
+        :param size: The size of the thumbnails, or None to return the thumbnails at their
+            original size.
+        :type size: :class:`sgtk.platform.qt.QtCore.QSize`
+        """
+
+        if size is not None and not size.isValid():
+            size = None
 
-        # Get the column associated with this role to index into the data for this row.
-        column = self.get_role_column(role)
+        self._thumbnail_size = size
 
-        if column < 0:
+    def set_draft_mode(self, enabled):
+        """
+        Set the model to return data that is cheap to render, e.g. while the item size is changed
+        interactively: the thumbnails not scaled yet are scaled with a fast transformation, and
+        only the header text is returned (no multi-line HTML text to lay out).
+
+        :param enabled: True to return draft data, False to return the full data.
+        :type enabled: bool
+        """
+
+        if enabled == self._draft_mode:
             return
 
-        if column >= len(row_value):
-            return None
+        self._draft_mode = enabled
 
-        # Get the speciifc data value for this role
-        row_value[column] = value
+        if not enabled:
+            # The thumbnails scaled with a fast transformation at the intermediate sizes are not
+            # displayed anymore, the thumbnails at the final size are scaled smoothly
+            self._thumbnail_cache.remove_fast_pixmaps()
 
-        self.dataChanged.emit(index, index, [role])
+        if self._row_count:
+            self._emit_data_changed(
+                self.index(0),
+                self.index(self._row_count - 1),
+                [self.VIEW_ITEM_THUMBNAIL_ROLE] + list(self.DRAFT_HIDDEN_ROLES),
+            )
 
-    def get_role_column(self, role):
+    def has_uniform_rows(self):
         """
-        Return the index into the data structure for this role (e.g. the data for an item
-        is represented as an array, this index returned will be used to index into the
-        data array to get the value for this role).
+        Return True if all the items have the same height in a list view with a fixed item height:
+        no item is expanded to show all its text or has a size of its own, and either all or none
+        of the items show a separator.
+
+        :rtype: bool
         """
 
-        # Might have been nicer to use a dictionary to map the role to the column index,
-        # but this is more verbose for demonstration purposes.
-        if role == self.VIEW_ITEM_THUMBNAIL_ROLE:
-            return 0
+        for role in self.SIZE_ROLES:
+            column = self._columns[role]
+            if column.count(self.ROLE_DEFAULTS[role]) != len(column):
+                return False
+
+        # The toggled values are inverted for all the items, which doesn't change whether they
+        # all have the same value
+        separators = self._columns[self.VIEW_ITEM_SEPARATOR_ROLE]
+        return all(separators) or not any(separators)
+
+    def get_item(self, row):
+        """
+        Return the data for an item.
+
+        :param row: The row of the item.
+        :type row: int
+
+        :return: The values of the item via role.
+        :rtype: dict
+        """
+
+        item = dict((role, column[row]) for role, column in self._columns.items())
+        for role in self._toggled_roles:
+            item[role] = not item[role]
+        return item
+
+    def insert_items(self, row, items):
+        """
+        Insert items into the model, in bulk.
+
+        :param row: The row to insert the items at.
+        :type row: int
+        :param items: The items to insert, each item is a dictionary of its values via role. The
+            roles omitted take the value from ``ROLE_DEFAULTS``.
+        :type items: list
+
+        :return: True if the items were inserted, else False.
+        """
+
+        if row < 0 or row > self._row_count:
+            return False
+
+        if not items:
+            return True
+
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(items) - 1)
+
+        for role, column in self._columns.items():
+            default = self.ROLE_DEFAULTS[role]
+            if role in self._toggled_roles:
+                column[row:row] = [not item.get(role, default) for item in items]
+            else:
+                column[row:row] = [item.get(role, default) for item in items]
+        self._row_count += len(items)
+
+        self.endInsertRows()
+        return True
+
+    def append_items(self, items):
+        """
+        Add items to the end of the model, in bulk.
+
+        :param items: The items to add, see :meth:`insert_items`.
+        :type items: list
+
+        :return: True if the items were added, else False.
+        """
+
+        return self.insert_items(self._row_count, items)
 
-        if role == self.VIEW_ITEM_HEADER_ROLE:
-            return 1
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()):
+        """
+        Override the base method.
+
+        Remove the items in a range of rows, in bulk.
+
+        :return: True if the items were removed, else False.
+        """
+
+        if parent.isValid() or count <= 0:
+            return False
+
+        if row < 0 or row + count > self._row_count:
+            return False
 
-        if role == self.VIEW_ITEM_SUBTITLE_ROLE:
-            return 2
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row + count - 1)
+
+        for column in self._columns.values():
+            del column[row : row + count]
+        self._row_count -= count
+
+        self.endRemoveRows()
+        return True
+
+    def set_columns(self, columns):
+        """
+        Replace all the items of the model in one step, e.g. to load a large data set without
+        building a dictionary per item.
+
+        :param columns: The values of the items via role, each a list holding the value of every
+            item. The lists are stored as is. The roles omitted take the value from
+            ``ROLE_DEFAULTS``.
+        :type columns: dict
+
+        :raises ValueError: If the lists don't all have the same length.
+        """
 
-        if role == self.VIEW_ITEM_TEXT_ROLE:
-            return 3
+        lengths = set(len(values) for values in columns.values())
+        if len(lengths) > 1:
+            raise ValueError("The columns must all have the same length")
+        row_count = lengths.pop() if lengths else 0
 
-        if role == self.VIEW_ITEM_SHORT_TEXT_ROLE:
-            return 4
+        self.beginResetModel()
 
-        if role == self.VIEW_ITEM_ICON_ROLE:
-            return 5
+        self._columns = dict(
+            (role, columns[role] if role in columns else [default] * row_count)
+            for role, default in self.ROLE_DEFAULTS.items()
+        )
+        self._row_count = row_count
+        self._toggled_roles.clear()
 
-        if role == self.VIEW_ITEM_EXPAND_ROLE:
-            return 6
+        self.endResetModel()
 
-        if role == self.VIEW_ITEM_WIDTH_ROLE:
-            return 7
+    def set_data_for_rows(self, role, value, first_row=0, last_row=None):
+        """
+        Set the data of a role for a range of items in one step, and notify the view with a single
+        dataChanged signal for the whole range.
+
+        :param role: The role to set the data for.
+        :type role: int
+        :param value: The value to set for all the items in the range.
+        :param first_row: The first row of the range.
+        :type first_row: int
+        :param last_row: The last row of the range, or None for the last row of the model.
+        :type last_row: int
+
+        :return: True if the data was set, else False.
+        """
 
-        if role == self.VIEW_ITEM_HEIGHT_ROLE:
-            return 8
+        column = self._columns.get(role)
+        if column is None:
+            # Role is not stored
+            return False
 
-        if role == self.VIEW_ITEM_LOADING_ROLE:
-            return 9
+        if last_row is None:
+            last_row = self._row_count - 1
 
-        if role == self.VIEW_ITEM_SEPARATOR_ROLE:
-            return 10
+        if first_row < 0 or last_row >= self._row_count or first_row > last_row:
+            return False
 
-        if role == QtCore.Qt.CheckStateRole:
-            return 11
+        if role in self._toggled_roles:
+            if first_row == 0 and last_row == self._row_count - 1:
+                # All the values are replaced, they don't need to be inverted anymore
+                self._toggled_roles.discard(role)
+            else:
+                value = not value
 
-        if role == self.BUTTON_STATE_ROLE:
-            return 12
+        column[first_row : last_row + 1] = [value] * (last_row - first_row + 1)
 
-        # Unsupported role
-        return -1
+        self._emit_data_changed(self.index(first_row), self.index(last_row), [role])
+        return True
 
     def toggle_data(self, index, role):
         """
         Toggle the data for the index and role (e.g. for loading and separator roles,
         this will toggle the boolean value).
+
+        If no index is specified, the data is toggled for all the items. For the loading and
+        separator roles, only the model level state is updated. The values of the other roles are
+        toggled item by item. Either way, the view is notified with a single dataChanged signal.
+
+        :return: True if the data was toggled, else False (e.g. the role is not stored).
         """
 
-        indexes = []
-        if index is None:
-            # No index specified, toggle all indices in the model
-            for row in range(self.rowCount()):
-                indexes.append(self.createIndex(row, 0, None))
+        column = self._columns.get(role)
+        if column is None:
+            # Role is not stored
+            return False
+
+        if index is not None:
+            if not index.isValid():
+                return False
+            return self.setData(index, not self.data(index, role), role)
+
+        # No index specified, toggle all indices in the model
+        if role in self.FLAG_ROLES:
+            self._toggled_roles.symmetric_difference_update([role])
         else:
-            indexes.append(index)
+            column[:] = [not value for value in column]
+
+        if self._row_count:
+            self._emit_data_changed(
+                self.index(0), self.index(self._row_count - 1), [role]
+            )
+        return True
 
-        for i in indexes:
-            if not i.isValid():
-                return
+    def _emit_data_changed(self, top_left, bottom_right, roles):
+        """
+        Emit the dataChanged signal for a range of indexes and the roles that changed.
+        """
 
-            if role in (self.VIEW_ITEM_LOADING_ROLE, self.VIEW_ITEM_SEPARATOR_ROLE):
-                if i.row() < 0 or i.row() >= len(self._data):
-                    return None
+        try:
+            self.dataChanged.emit(top_left, bottom_right, roles)
+        except TypeError:
+            # Pyside version compaitbility
+            self.dataChanged.emit(top_left, bottom_right)
 
-                row_value = self._data[i.row()]
-                column = self.get_role_column(role)
 
-                if 0 <= column < len(row_value):
-                    cur_value = row_value[column]
+def benchmark(row_count=100000, repeat=5):
+    """
+    Time the data() calls of a BasicListItemModel holding many items.
+
+    A QApplication must exist (e.g. run from a Toolkit python console).
+
+    :param row_count: The number of items to fill the model with.
+    :type row_count: int
+    :param repeat: The number of times to query the data of every item. The best time is kept.
+    :type repeat: int
+
+    :return: The number of data() calls per second.
+    :rtype: float
+    """
 
-                self.setData(i, not cur_value, role)
+    model = BasicListItemModel()
+
+    # Fill the model with copies of the hard coded items
+    items = [model.get_item(row) for row in range(model.rowCount())]
+    model.append_items(
+        [items[row % len(items)] for row in range(row_count - model.rowCount())]
+    )
+
+    # The thumbnail pixmap creation would dominate the timings
+    roles = [
+        role
+        for role in BasicListItemModel.ROLE_DEFAULTS
+        if role != BasicListItemModel.VIEW_ITEM_THUMBNAIL_ROLE
+    ]
+    indexes = [model.index(row) for row in range(model.rowCount())]
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index in indexes:
+            for role in roles:
+                model.data(index, role)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+
+    return len(indexes) * len(roles) / best
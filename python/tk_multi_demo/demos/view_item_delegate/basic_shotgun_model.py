@@ -19,13 +19,24 @@ shotgun_model = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_model"
 )
 ShotgunModel = shotgun_model.ShotgunModel
+ShotgunStandardItem = shotgun_model.ShotgunStandardItem
+shotgun_data = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_data"
+)
 
 
 class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
     """
     A subclass of the ShotgunModel to handle basic Flow Production Tracking data.
+
+    The data is loaded one page at a time: the first page is loaded by the base ShotgunModel, and
+    the next pages are requested (e.g. by the view through `fetchMore`) once the first page has been
+    loaded. Each page is appended to the model, without resetting it.
     """
 
+    # The number of items to load per page
+    PAGE_SIZE = 50
+
     # Custom user roles are key to using the ViewItemDelegate with the data model. The delegates.ViewItemRolesMixin
     # class will take care of defining a role for each role that the ViewItemDelegate exposes to allow for data
     # and/or style customization.
@@ -45,7 +56,15 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
     ) = range(_BASE_ROLE, _BASE_ROLE + 2)
 
     def __init__(
-        self, entity_type, filters, fields, sort_field, bg_task_manager, parent
+        self,
+        entity_type,
+        filters,
+        fields,
+        sort_field,
+        bg_task_manager,
+        parent,
+        page_size=PAGE_SIZE,
+        precompute_roles=False,
     ):
         """
         BasicShotgunModel constructor.
@@ -53,6 +72,9 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
         :param entity_type: The entity type that should be loaded into this model.
         :param parent: QT parent object
         :param bg_task_manager: The background task manager to handle loading data.
+        :param page_size: The number of items to load per page.
+        :param precompute_roles: True to compute the view item role values once when the items are
+            populated, see `set_precompute_roles`.
         """
 
         # Initialize the base class
@@ -69,9 +91,20 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
         self._fields = fields
         self._filters = filters
         self._sort_field = sort_field
+        # Paging fields
+        self._page_size = page_size
+        self._first_page_loaded = False
+        self._last_page = 1
+        self._has_more_pages = True
+        self._page_request_id = None
+        # The items of the pages following the first page, via entity id. These items are not
+        # tracked by the base ShotgunModel.
+        self._page_items = {}
         # UI fields
         self._is_loading = False
         self._show_separator = False
+        self._draft_mode = False
+        self._precompute_roles = precompute_roles
 
         # Initialize the model data roles that the ViewITemDelegate will use to determine how to render
         # items in the model
@@ -87,13 +120,34 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
         self.role_methods = {
             self.VIEW_ITEM_THUMBNAIL_ROLE: MockViewConfigHook._get_item_thumbnail,
             self.VIEW_ITEM_HEADER_ROLE: MockViewConfigHook._get_item_header,
-            self.VIEW_ITEM_SUBTITLE_ROLE: MockViewConfigHook._get_item_subtitle,
-            self.VIEW_ITEM_TEXT_ROLE: MockViewConfigHook._get_item_text,
-            self.VIEW_ITEM_SHORT_TEXT_ROLE: MockViewConfigHook._get_item_short_text,
+            self.VIEW_ITEM_SUBTITLE_ROLE: self._draft_hidden(
+                MockViewConfigHook._get_item_subtitle
+            ),
+            self.VIEW_ITEM_TEXT_ROLE: self._draft_hidden(
+                MockViewConfigHook._get_item_text
+            ),
+            self.VIEW_ITEM_SHORT_TEXT_ROLE: self._draft_hidden(
+                MockViewConfigHook._get_item_short_text
+            ),
             self.VIEW_ITEM_LOADING_ROLE: lambda item: self._is_loading,
             self.VIEW_ITEM_SEPARATOR_ROLE: lambda item: self._show_separator,
         }
 
+        # The data retriever to query the pages following the first page, which is queried by the
+        # base ShotgunModel.
+        self._page_retriever = shotgun_data.ShotgunDataRetriever(
+            self, bg_task_manager=bg_task_manager
+        )
+        self._page_retriever.work_completed.connect(self._on_page_retrieved)
+        self._page_retriever.work_failure.connect(self._on_page_failed)
+        self._page_retriever.start()
+
+        # The resolved templates of the items are memoized, forget them when the item data changes
+        self.dataChanged.connect(self._on_item_data_changed)
+        self.modelReset.connect(MockViewConfigHook.clear_cache)
+
+        self.data_refreshed.connect(self._on_data_refreshed)
+
     @classmethod
     def create_task_model(cls, task_manager, parent):
         """
@@ -128,11 +182,34 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
             entity_type, filters, fields, sort_field, task_manager, parent
         )
 
+    def destroy(self):
+        """
+        Override the base method.
+
+        Stop the page data retriever, and clear the strings resolved for the items.
+        """
+
+        self._page_retriever.stop()
+        MockViewConfigHook.clear_cache()
+        ShotgunModel.destroy(self)
+
     def load_data(self):
         """
         The standard method to call the base ShotgunModel '_load_data' method to retrieve the model data.
+
+        Only the first page is loaded, the next pages are loaded by `fetchMore`.
         """
 
+        # Start over from the first page
+        self._first_page_loaded = False
+        self._last_page = 1
+        self._has_more_pages = True
+        self._page_request_id = None
+        self._page_items = {}
+
+        # The items are created again, forget the strings resolved with the previous data
+        MockViewConfigHook.clear_cache()
+
         hierarchy = [self._sort_field]
 
         ShotgunModel._load_data(
@@ -142,11 +219,167 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
             hierarchy,
             self._fields,
             [{"field_name": self._sort_field, "direction": "desc"}],
-            limit=50,
+            limit=self._page_size,
         )
 
         self._refresh_data()
 
+    def canFetchMore(self, parent):
+        """
+        Override the base method.
+
+        Return True if there are more pages to load, once the first page has been loaded (the pages
+        would otherwise be appended out of order).
+        """
+
+        if parent.isValid():
+            return False
+
+        return (
+            self._first_page_loaded
+            and self._has_more_pages
+            and self._page_request_id is None
+        )
+
+    def fetchMore(self, parent):
+        """
+        Override the base method.
+
+        Request the next page of data. The items are appended to the model once the data is
+        retrieved.
+        """
+
+        if not self.canFetchMore(parent):
+            return
+
+        self._page_request_id = self._page_retriever.execute_find(
+            self._entity_type,
+            self._filters,
+            self._fields + ["image"],
+            [{"field_name": self._sort_field, "direction": "desc"}],
+            limit=self._page_size,
+            page=self._last_page + 1,
+        )
+
+    def _on_data_refreshed(self, changed):
+        """
+        Callback triggered when the base ShotgunModel has loaded or refreshed the first page.
+        """
+
+        if self._first_page_loaded:
+            self._remove_stale_page_items()
+            return
+
+        self._first_page_loaded = True
+        # A partial first page is the last page
+        self._has_more_pages = self.rowCount() >= self._page_size
+
+    def _remove_stale_page_items(self):
+        """
+        Remove the items appended from the next pages for the entities that the refresh of the
+        first page brought into the first page, so that each entity has a single row.
+        """
+
+        first_page_ids = set()
+        page_rows = []
+        for row in range(self.rowCount()):
+            item = self.item(row)
+            sg_data = item.get_sg_data()
+            if not sg_data:
+                continue
+
+            entity_id = sg_data.get("id")
+            if self._page_items.get(entity_id) is item:
+                page_rows.append((row, entity_id))
+            else:
+                first_page_ids.add(entity_id)
+
+        # Forget the items that are not in the model anymore
+        self._page_items = dict(
+            (entity_id, self._page_items[entity_id]) for _, entity_id in page_rows
+        )
+
+        # Remove the rows from the end, for the rows before them to keep their row
+        for row, entity_id in reversed(page_rows):
+            if entity_id in first_page_ids:
+                del self._page_items[entity_id]
+                self.removeRow(row)
+
+    def _on_item_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        Callback triggered when the data of items changed. Clear the templates resolved with their
+        previous Flow Production Tracking data.
+        """
+
+        if roles and self.SG_DATA_ROLE not in roles:
+            # The item data the templates are resolved with didn't change
+            return
+
+        parent = self.itemFromIndex(top_left.parent()) or self.invisibleRootItem()
+        MockViewConfigHook.clear_cache(
+            [parent.child(row) for row in range(top_left.row(), bottom_right.row() + 1)]
+        )
+
+    def _on_page_retrieved(self, uid, request_type, data):
+        """
+        Callback triggered when the data of a page has been retrieved. Append the page items.
+        """
+
+        if uid != self._page_request_id:
+            return
+        self._page_request_id = None
+
+        sg_data_list = data["sg"]
+        self._last_page += 1
+        self._has_more_pages = len(sg_data_list) >= self._page_size
+
+        # The first page is refreshed by the base ShotgunModel, an entity may have moved to it
+        loaded_ids = set()
+        for row in range(self.rowCount()):
+            sg_data = self.item(row).get_sg_data()
+            if sg_data:
+                loaded_ids.add(sg_data.get("id"))
+
+        items = []
+        for sg_data in sg_data_list:
+            if sg_data["id"] in loaded_ids:
+                continue
+
+            sg_data = shotgun_model.sanitize_for_qt_model(sg_data)
+            # Format the text like the base ShotgunModel does for its hierarchy items
+            item = ShotgunStandardItem(
+                self._generate_display_name(self._sort_field, sg_data)
+            )
+            item.setEditable(False)
+            item.setData(sg_data, self.SG_DATA_ROLE)
+            self._populate_default_thumbnail(item)
+            self._populate_item(item, sg_data)
+
+            if sg_data.get("image"):
+                self._request_thumbnail_download(
+                    item, "image", sg_data["image"], sg_data["type"], sg_data["id"]
+                )
+
+            items.append(item)
+            self._page_items[sg_data["id"]] = item
+
+        # Append the page to the end of the model, in one step
+        if items:
+            self.invisibleRootItem().appendRows(items)
+
+    def _on_page_failed(self, uid, request_type, msg):
+        """
+        Callback triggered when the data of a page could not be retrieved.
+        """
+
+        if uid != self._page_request_id:
+            return
+        self._page_request_id = None
+
+        sgtk.platform.current_bundle().logger.warning(
+            "Could not load the next page of data: %s" % msg
+        )
+
     def _populate_item(self, item, sg_data):
         """
         Whenever an item is constructed, this methods is called. It allows subclasses to intercept
@@ -159,22 +392,199 @@ class BasicShotgunModel(ShotgunModel, delegates.ViewItemRolesMixin):
                         and other settings specified in load_data()
         """
 
-        # For model that subclass the QStandardItemModel class (e.g. use QStandardItem objects), use
-        # the convenience method 'set_data_for_role' to set the method for each role defined in
-        # 'self.role_methods' -- which in turn will call the role method when item data for that
-        # role is request (e.g. item.data(ROLE) will call the method defined for ROLE).
-        self.set_data_for_role_methods(item)
+        if self._precompute_roles:
+            # Compute the value of each role defined in 'self.role_methods' once, and store it on the
+            # item. The values only change when the item data changes, in which case the item is
+            # populated again.
+            self._set_role_values(item)
+        else:
+            # For model that subclass the QStandardItemModel class (e.g. use QStandardItem objects), use
+            # the convenience method 'set_data_for_role' to set the method for each role defined in
+            # 'self.role_methods' -- which in turn will call the role method when item data for that
+            # role is request (e.g. item.data(ROLE) will call the method defined for ROLE).
+            self.set_data_for_role_methods(item)
 
         item.setData(self.VIEW_ITEM_LOADING_ROLE, False)
         item.setData(self.VIEW_ITEM_SEPARATOR_ROLE, False)
 
+    def _populate_thumbnail_image(self, item, field, image, path):
+        """
+        Override the base method.
+
+        Store the new thumbnail value on the item, if the role values are precomputed.
+        """
+
+        ShotgunModel._populate_thumbnail_image(self, item, field, image, path)
+
+        if self._precompute_roles:
+            self._set_role_values(item, [self.VIEW_ITEM_THUMBNAIL_ROLE])
+
+    def has_uniform_rows(self):
+        """
+        Return True if all the items have the same height in a list view with a fixed item height:
+        no item is expanded to show all its text or has a size of its own. The separator is shown
+        for all or none of the items.
+
+        :rtype: bool
+        """
+
+        roles = (
+            self.VIEW_ITEM_EXPAND_ROLE,
+            self.VIEW_ITEM_WIDTH_ROLE,
+            self.VIEW_ITEM_HEIGHT_ROLE,
+        )
+        for row in range(self.rowCount()):
+            item = self.item(row)
+            for role in roles:
+                if item.data(role):
+                    return False
+
+        return True
+
+    def set_data_for_rows(self, role, value):
+        """
+        Set the loading or separator data for all the items in one step. The data is stored as
+        model level state, and the view is notified with a single dataChanged signal.
+
+        :param role: The loading or separator role.
+        :type role: int
+        :param value: The value to set for all the items.
+        :type value: bool
+
+        :return: True if the data was set, else False.
+        """
+
+        if role == self.VIEW_ITEM_LOADING_ROLE:
+            self._is_loading = value
+
+        elif role == self.VIEW_ITEM_SEPARATOR_ROLE:
+            self._show_separator = value
+
+        else:
+            return False
+
+        self._update_rows([role])
+        return True
+
+    def set_draft_mode(self, enabled):
+        """
+        Set the model to return data that is cheap to render, e.g. while the item size is changed
+        interactively: only the header text is returned (no multi-line HTML text to lay out).
+
+        :param enabled: True to return draft data, False to return the full data.
+        :type enabled: bool
+        """
+
+        if enabled == self._draft_mode:
+            return
+
+        self._draft_mode = enabled
+
+        self._update_rows(
+            [
+                self.VIEW_ITEM_SUBTITLE_ROLE,
+                self.VIEW_ITEM_TEXT_ROLE,
+                self.VIEW_ITEM_SHORT_TEXT_ROLE,
+            ]
+        )
+
+    def set_precompute_roles(self, enabled):
+        """
+        Set whether the values of the view item roles are computed once, when the items are
+        populated, and stored on the items. Otherwise the role methods are called each time the
+        item data is requested.
+
+        :param enabled: True to precompute the role values, False to call the role methods.
+        :type enabled: bool
+        """
+
+        if enabled == self._precompute_roles:
+            return
+
+        self._precompute_roles = enabled
+
+        # Switch the items already loaded to the new mode
+        self.blockSignals(True)
+        try:
+            for row in range(self.rowCount()):
+                item = self.item(row)
+                if enabled:
+                    self._set_role_values(item)
+                else:
+                    self.set_data_for_role_methods(item)
+        finally:
+            self.blockSignals(False)
+
+        self._update_rows(list(self.role_methods))
+
+    def _set_role_values(self, item, roles=None):
+        """
+        Compute the values of the view item roles for an item, and store them on the item.
+
+        :param item: The model item.
+        :type item: QStandardItem
+        :param roles: The roles to compute the value of, or None for all the roles.
+        :type roles: list
+        """
+
+        if roles is None:
+            roles = self.role_methods
+
+        for role in roles:
+            item.setData(self.role_methods[role](item), role)
+
+    def _update_rows(self, roles):
+        """
+        Notify the view that the values of some roles changed for all the items, with a single
+        dataChanged signal. The stored values are computed again first, if the role values are
+        precomputed.
+
+        :param roles: The roles whose values changed.
+        :type roles: list
+        """
+
+        # The items displayed in the list view are the top level items
+        row_count = self.rowCount()
+        if not row_count:
+            return
+
+        if self._precompute_roles:
+            # Store the new values without notifying the view of each item
+            self.blockSignals(True)
+            try:
+                for row in range(row_count):
+                    self._set_role_values(self.item(row), roles)
+            finally:
+                self.blockSignals(False)
+
+        top_left = self.index(0, 0)
+        bottom_right = self.index(row_count - 1, 0)
+        try:
+            self.dataChanged.emit(top_left, bottom_right, roles)
+        except TypeError:
+            # Pyside version compaitbility
+            self.dataChanged.emit(top_left, bottom_right)
+
+    def _draft_hidden(self, role_method):
+        """
+        Return a role method which returns no data in draft mode, and the data returned by the given
+        role method otherwise.
+        """
+
+        def _get_data(item):
+            if self._draft_mode:
+                return None
+            return role_method(item)
+
+        return _get_data
+
     def toggle_data(self, index, role):
         """
         Toggle the loading or separator data. These will alter how the model item is displayed.
         """
 
         if role == self.VIEW_ITEM_LOADING_ROLE:
-            self._is_loading = not self._is_loading
+            self.set_data_for_rows(role, not self._is_loading)
 
         elif role == self.VIEW_ITEM_SEPARATOR_ROLE:
-            self._show_separator = not self._show_separator
+            self.set_data_for_rows(role, not self._show_separator)
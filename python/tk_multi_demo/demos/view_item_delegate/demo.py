@@ -15,6 +15,8 @@ from .ui import resources_rc  # noqa
 
 from .basic_list_model import BasicListItemModel
 from .basic_shotgun_model import BasicShotgunModel
+from .size_hint_cache import size_hint_cache_delegate_class
+from .stress_test import DelegateProfiler, generate_columns, profiled_delegate_class
 
 # import the delegates module from qtwidgets framework
 delegates = sgtk.platform.import_framework("tk-framework-qtwidgets", "delegates")
@@ -22,10 +24,12 @@ ThumbnailViewItemDelegate = delegates.ThumbnailViewItemDelegate
 ViewItemDelegate = delegates.ViewItemDelegate
 ViewItemAction = delegates.ViewItemAction
 
-# import the task_manager and shotgun_model modules from shotgunutils framework
-task_manager = sgtk.platform.import_framework(
-    "tk-framework-shotgunutils", "task_manager"
-)
+# The list mode delegate class, caching the size hints of the rows expanded to fit their text
+SizeHintCacheViewItemDelegate = size_hint_cache_delegate_class(ViewItemDelegate)
+
+# The delegate classes used in stress test mode, reporting their paint and sizeHint calls
+ProfiledThumbnailViewItemDelegate = profiled_delegate_class(ThumbnailViewItemDelegate)
+ProfiledViewItemDelegate = profiled_delegate_class(SizeHintCacheViewItemDelegate)
 
 shotgun_globals = sgtk.platform.import_framework(
     "tk-framework-shotgunutils", "shotgun_globals"
@@ -50,7 +54,11 @@ class ViewItemDelegateDemo(QtGui.QWidget):
 
         super(ViewItemDelegateDemo, self).__init__(parent)
 
-        self._bg_task_manager = task_manager.BackgroundTaskManager(self, True)
+        # the task manager runs its tasks on the threads the app shares between
+        # all the demos
+        self._bg_task_manager = (
+            sgtk.platform.current_bundle().create_demo_task_manager()
+        )
         shotgun_globals.register_bg_task_manager(self._bg_task_manager)
 
         # Create two separate models to demonstrate how each type can be used with the ViewItemDelegate
@@ -62,13 +70,25 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         self._shotgun_model = BasicShotgunModel.create_task_model(
             self._bg_task_manager, self
         )
+        # The stress test model is a BasicListItemModel filled with a large number of synthetic items
+        self._stress_model = BasicListItemModel(self)
+        self._stress_model.set_columns({})
 
         # Create and a single view to display the both the BasicListModel and BasicShotgunModel data
         self._view = QtGui.QListView(self)
         # Enable mouse tracking for the delegate to receive mouse events
         self._view.setMouseTracking(True)
-        # Put the onus on the delegate to determin view item sizes
+        # Put the onus on the delegate to determin view item sizes. Uniform item sizes are used
+        # when the row height is set by the slider, see `_update_uniform_item_sizes`.
         self._view.setUniformItemSizes(False)
+        # Load the next page of the BasicShotgunModel before the view is scrolled to the end
+        self._view.verticalScrollBar().valueChanged.connect(self._prefetch_data)
+        # Uniform item sizes can only be used while no row has a height of its own
+        for model in (self._basic_model, self._shotgun_model, self._stress_model):
+            model.dataChanged.connect(self._on_model_data_changed)
+            model.modelReset.connect(self._update_uniform_item_sizes)
+            model.rowsInserted.connect(self._update_uniform_item_sizes)
+            model.rowsRemoved.connect(self._update_uniform_item_sizes)
 
         # Create four delegates to render the view using the BasicListModel and BasicShotgunModel, and
         # in both List and Thumbnail view modes
@@ -76,11 +96,28 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         self._thumbnail_view_delegate = self._create_delegate(
             self._view, BasicListItemModel, thumbnail_mode=True
         )
+        # The stress test model and BasicShotgunModel delegates report their paint and sizeHint
+        # calls to a profiler
+        self._profiler = DelegateProfiler(self._view, parent=self)
         self._shotgun_list_view_delegate = self._create_delegate(
-            self._view, BasicShotgunModel
+            self._view, BasicShotgunModel, profiler=self._profiler
         )
         self._shotgun_thumbnail_view_delegate = self._create_delegate(
-            self._view, BasicShotgunModel, thumbnail_mode=True
+            self._view,
+            BasicShotgunModel,
+            thumbnail_mode=True,
+            profiler=self._profiler,
+        )
+
+        # Create two more delegates to render the stress test model
+        self._stress_list_view_delegate = self._create_delegate(
+            self._view, BasicListItemModel, profiler=self._profiler
+        )
+        self._stress_thumbnail_view_delegate = self._create_delegate(
+            self._view,
+            BasicListItemModel,
+            thumbnail_mode=True,
+            profiler=self._profiler,
         )
 
         # Add border specifically to shotgun data thumbnail view
@@ -91,15 +128,20 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         # Build and layout the UI.
         self._populate_ui()
 
-    def _create_delegate(self, view, model_class, thumbnail_mode=False):
+    def _create_delegate(self, view, model_class, thumbnail_mode=False, profiler=None):
         """
         Create and return a ViewItemDelegate object. The data roles from the given 'model_class' will
-        be used to set up the delegate.
+        be used to set up the delegate. If a 'profiler' is given, the delegate will report its paint
+        and sizeHint calls to it.
         """
 
         if thumbnail_mode:
             # Create and set up the delegate to display items in a thumbnail mode
-            delegate = ThumbnailViewItemDelegate(view)
+            if profiler:
+                delegate = ProfiledThumbnailViewItemDelegate(view)
+                delegate.profiler = profiler
+            else:
+                delegate = ThumbnailViewItemDelegate(view)
             delegate.item_padding = 4
 
             # Set the model data roles for the delegate to use to render the model items in the view
@@ -123,7 +165,11 @@ class ViewItemDelegateDemo(QtGui.QWidget):
 
         else:
             # Create and set up the delegate to display items in a list mode
-            delegate = ViewItemDelegate(view)
+            if profiler:
+                delegate = ProfiledViewItemDelegate(view)
+                delegate.profiler = profiler
+            else:
+                delegate = SizeHintCacheViewItemDelegate(view)
             delegate.item_padding = ViewItemDelegate.Padding(4, 8, 4, 8)
 
             # Set the model data roles for the delegate to use to render the model items in the view
@@ -185,6 +231,35 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         self._shotgun_model_button.setCheckable(True)
         self._shotgun_model_button.setFlat(True)
         self._shotgun_model_button.clicked.connect(self._toggle_view_model)
+        self._stress_model_button = QtGui.QPushButton("Stress Test", self)
+        self._stress_model_button.setToolTip(
+            "Display a large number of synthetic items, with stats on the delegate performance."
+        )
+        self._stress_model_button.setCheckable(True)
+        self._stress_model_button.setFlat(True)
+        self._stress_model_button.clicked.connect(self._toggle_view_model)
+
+        # The number of items to stress test with
+        self._stress_count_combo = QtGui.QComboBox(self)
+        for count in (1000, 10000, 100000, 1000000):
+            self._stress_count_combo.addItem("{:,} items".format(count), count)
+        self._stress_count_combo.setCurrentIndex(1)
+        self._stress_count_combo.currentIndexChanged.connect(self._stress_count_changed)
+
+        # Option to compare calling the BasicShotgunModel role methods on each data request, with
+        # computing the role values once when the items are populated
+        self._precompute_roles_cb = QtGui.QCheckBox("Precompute Roles", self)
+        self._precompute_roles_cb.setToolTip(
+            "Compute the Flow Production Tracking Model role values once, instead of on each paint."
+        )
+        self._precompute_roles_cb.toggled.connect(
+            self._shotgun_model.set_precompute_roles
+        )
+
+        # The readout of the delegate stats, in stress test and Flow Production Tracking Model modes
+        self._stats_label = QtGui.QLabel(self)
+        self._stats_label.hide()
+        self._profiler.stats_updated.connect(self._stats_label.setText)
 
         # Button options to change the view mode
         self._list_view_button = QtGui.QPushButton("List View", self)
@@ -203,8 +278,19 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         )
         self._size_slider.setMinimum(35)
         self._size_slider.setMaximum(300)
-        self._size_slider.valueChanged.connect(self._item_size_change)
         self._size_slider.setValue(75)
+        self._item_size_change(self._size_slider.value())
+
+        # The slider changes are applied at most once per frame. While the slider is dragged, the
+        # models return draft data which is cheap to render, and the full data is rendered once
+        # the slider is released.
+        self._size_change_timer = QtCore.QTimer(self)
+        self._size_change_timer.setSingleShot(True)
+        self._size_change_timer.setInterval(16)
+        self._size_change_timer.timeout.connect(self._apply_item_size_change)
+        self._size_slider.valueChanged.connect(self._on_size_slider_changed)
+        self._size_slider.sliderPressed.connect(self._on_size_slider_pressed)
+        self._size_slider.sliderReleased.connect(self._on_size_slider_released)
 
         # Create a checkbox option to set the view to expand to fit all text
         size_cb = QtGui.QCheckBox("Expand Row to Fit Text", self)
@@ -219,6 +305,9 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         top_toolbar_layout = QtGui.QHBoxLayout(self)
         top_toolbar_layout.addWidget(self._basic_model_button)
         top_toolbar_layout.addWidget(self._shotgun_model_button)
+        top_toolbar_layout.addWidget(self._precompute_roles_cb)
+        top_toolbar_layout.addWidget(self._stress_model_button)
+        top_toolbar_layout.addWidget(self._stress_count_combo)
         top_toolbar_layout.addStretch()
         top_toolbar_layout.addWidget(self._list_view_button)
         top_toolbar_layout.addWidget(self._thumbnail_view_button)
@@ -229,6 +318,7 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         bottom_toolbar_layout = QtGui.QHBoxLayout(self)
         bottom_toolbar_layout.addWidget(size_cb)
         bottom_toolbar_layout.addWidget(self._size_slider)
+        bottom_toolbar_layout.addWidget(self._stats_label)
         bottom_toolbar.setLayout(bottom_toolbar_layout)
 
         # Finally layout the main widget
@@ -249,12 +339,42 @@ class ViewItemDelegateDemo(QtGui.QWidget):
 
         shotgun_globals.unregister_bg_task_manager(self._bg_task_manager)
 
+        # stop the model data retrievers
+        self._shotgun_model.destroy()
+
         try:
             # shut down main threadpool
             self._bg_task_manager.shut_down()
         except Exception:
             logger.exception("Error running closeEvent()")
 
+    def get_state(self):
+        """
+        Return the state of the demo so that it can be restored if the demo is recreated.
+        """
+
+        return {
+            "shotgun_model": self._shotgun_model_button.isChecked(),
+            "stress_test": self._stress_model_button.isChecked(),
+            "stress_count_index": self._stress_count_combo.currentIndex(),
+            "thumbnail_mode": self._thumbnail_view_button.isChecked(),
+            "item_size": self._size_slider.value(),
+        }
+
+    def set_state(self, state):
+        """
+        Restore a state returned by `get_state`.
+        """
+
+        self._stress_count_combo.setCurrentIndex(state.get("stress_count_index", 1))
+        if state["shotgun_model"]:
+            self._shotgun_model_button.click()
+        elif state.get("stress_test"):
+            self._stress_model_button.click()
+        if state["thumbnail_mode"]:
+            self._thumbnail_view_button.click()
+        self._size_slider.setValue(state["item_size"])
+
     ######################################################################################################
     # ViewItemDelegate action callbacks. These methods are triggered by the ViewItemDelegaet when an
     # item's action is triggered (e.g. clicked)
@@ -418,8 +538,21 @@ class ViewItemDelegateDemo(QtGui.QWidget):
             self._list_view_delegate.thumbnail_width = 80
             self._shotgun_list_view_delegate.item_height = None
             self._shotgun_list_view_delegate.thumbnail_width = 80
+            self._stress_list_view_delegate.item_height = None
+            self._stress_list_view_delegate.thumbnail_width = 80
+
+            # The delegates cache the size hints of the expanded rows, clear the size hints that
+            # may have been computed before the data last changed
+            self._list_view_delegate.clear_size_hint_cache()
+            self._shotgun_list_view_delegate.clear_size_hint_cache()
+            self._stress_list_view_delegate.clear_size_hint_cache()
 
             self._view.setIconSize(QtCore.QSize())
+            self._update_uniform_item_sizes()
+
+            # Thumbnails are displayed at their original size
+            self._basic_model.set_thumbnail_size(None)
+            self._stress_model.set_thumbnail_size(None)
 
             # Update the viewport
             self._view.viewport().update()
@@ -445,14 +578,124 @@ class ViewItemDelegateDemo(QtGui.QWidget):
         # Set the thumbnail size for Thumbnail delegates
         self._thumbnail_view_delegate.thumbnail_size = icon_size
         self._shotgun_thumbnail_view_delegate.thumbnail_size = icon_size
+        self._stress_thumbnail_view_delegate.thumbnail_size = icon_size
 
         # Set the item height for non-Thumbnail delegates
         self._list_view_delegate.item_height = value
         self._shotgun_list_view_delegate.item_height = value
+        self._stress_list_view_delegate.item_height = value
+
+        # Have the model return thumbnails scaled for this size. The scaled thumbnails are cached
+        # so that dragging the slider back and forth doesn't scale them again.
+        self._basic_model.set_thumbnail_size(icon_size)
+        self._stress_model.set_thumbnail_size(icon_size)
+
+        self._update_uniform_item_sizes()
 
         # Update the viewport
         self._view.viewport().update()
 
+    def _on_size_slider_changed(self, value):
+        """
+        The slider value changed, apply it on the next frame. The changes until then are applied
+        at once.
+        """
+
+        if not self._size_change_timer.isActive():
+            self._size_change_timer.start()
+
+    def _apply_item_size_change(self):
+        """
+        Apply the last slider value, once per frame at most.
+        """
+
+        self._item_size_change(self._size_slider.value())
+
+    def _on_size_slider_pressed(self):
+        """
+        The slider is being dragged, render draft data until it is released.
+        """
+
+        self._basic_model.set_draft_mode(True)
+        self._shotgun_model.set_draft_mode(True)
+        self._stress_model.set_draft_mode(True)
+
+    def _on_size_slider_released(self):
+        """
+        The slider was released, apply its final value and render the full data.
+        """
+
+        self._size_change_timer.stop()
+
+        self._basic_model.set_draft_mode(False)
+        self._shotgun_model.set_draft_mode(False)
+        self._stress_model.set_draft_mode(False)
+
+        self._item_size_change(self._size_slider.value())
+
+    def _update_uniform_item_sizes(self, *args):
+        """
+        Set the view to use uniform item sizes when all the rows have the height set by the slider.
+
+        The view then lays out the items with the size hint of the first item, instead of asking
+        for the size hint of every item, so that a large list lays out in constant time. Rows that
+        expand to fit their text, rows given a width or height, and rows with a separator when the
+        other rows have none, have heights of their own: the view asks for the size hint of every item while the model has
+        such rows, the delegate size hint is cheap for fixed height rows.
+
+        The args of the model signals this is connected to are ignored.
+        """
+
+        model = self._view.model()
+
+        # The slider is enabled unless the rows expand to fit their text
+        uniform_item_sizes = (
+            self._list_view_button.isChecked()
+            and self._size_slider.isEnabled()
+            and model is not None
+            and model.has_uniform_rows()
+        )
+
+        if uniform_item_sizes != self._view.uniformItemSizes():
+            self._view.setUniformItemSizes(uniform_item_sizes)
+            self._view.doItemsLayout()
+
+    def _on_model_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        The model data changed, check whether an item was expanded, was given a size of its own or
+        had its separator toggled.
+        """
+
+        if top_left.model() is not self._view.model():
+            return
+
+        model = top_left.model()
+        size_roles = (
+            model.VIEW_ITEM_EXPAND_ROLE,
+            model.VIEW_ITEM_WIDTH_ROLE,
+            model.VIEW_ITEM_HEIGHT_ROLE,
+            model.VIEW_ITEM_SEPARATOR_ROLE,
+        )
+        if roles and not any(role in roles for role in size_roles):
+            return
+
+        self._update_uniform_item_sizes()
+
+    def _prefetch_data(self, value):
+        """
+        The view was scrolled, request the next page of data when the view is within a page of the
+        end, so that it is loaded by the time the view reaches the end.
+        """
+
+        model = self._view.model()
+        if model is not self._shotgun_model:
+            return
+
+        scroll_bar = self._view.verticalScrollBar()
+        if scroll_bar.maximum() - value <= scroll_bar.pageStep():
+            if model.canFetchMore(QtCore.QModelIndex()):
+                model.fetchMore(QtCore.QModelIndex())
+
     def _toggle_view_model(self):
         """
         Set the view model based on the view model button clicked.
@@ -460,6 +703,10 @@ class ViewItemDelegateDemo(QtGui.QWidget):
 
         is_list_mode = self._list_view_button.isChecked()
 
+        # Only collect the delegate stats in stress test and Flow Production Tracking Model modes
+        self._profiler.stop()
+        self._stats_label.hide()
+
         if self.sender() == self._basic_model_button:
             # BasicListModel
 
@@ -467,6 +714,7 @@ class ViewItemDelegateDemo(QtGui.QWidget):
             self._view.setModel(self._basic_model)
             self._basic_model_button.setChecked(True)
             self._shotgun_model_button.setChecked(False)
+            self._stress_model_button.setChecked(False)
 
             # Set the delegate corresponding to the current view mode and model
             if is_list_mode:
@@ -481,6 +729,7 @@ class ViewItemDelegateDemo(QtGui.QWidget):
             self._view.setModel(self._shotgun_model)
             self._shotgun_model_button.setChecked(True)
             self._basic_model_button.setChecked(False)
+            self._stress_model_button.setChecked(False)
 
             # Set the delegate corresponding to the current view mode and model
             if is_list_mode:
@@ -490,9 +739,64 @@ class ViewItemDelegateDemo(QtGui.QWidget):
 
             self._shotgun_model.load_data()
 
+            self._stats_label.setText("Scroll to collect stats...")
+            self._stats_label.show()
+            self._profiler.start()
+
+        elif self.sender() == self._stress_model_button:
+            # Stress test, BasicListModel with synthetic data
+
+            if not self._stress_model.rowCount():
+                self._load_stress_data()
+
+            # Set the model on the view to change the data
+            self._view.setModel(self._stress_model)
+            self._stress_model_button.setChecked(True)
+            self._basic_model_button.setChecked(False)
+            self._shotgun_model_button.setChecked(False)
+
+            # Set the delegate corresponding to the current view mode and model
+            if is_list_mode:
+                self._view.setItemDelegate(self._stress_list_view_delegate)
+            else:
+                self._view.setItemDelegate(self._stress_thumbnail_view_delegate)
+
+            self._stats_label.setText("Scroll to collect stats...")
+            self._stats_label.show()
+            self._profiler.start()
+
         else:
             raise AssertionError("Unsupported view model option")
 
+        # The rows of the model may not all have the same height
+        self._update_uniform_item_sizes()
+
+    def _stress_count_changed(self, index):
+        """
+        The number of stress test items changed, reload the stress test model.
+        """
+
+        if self._stress_model_button.isChecked():
+            self._load_stress_data()
+        else:
+            # Free the current items, the model is loaded the next time it is displayed
+            self._stress_model.set_columns({})
+
+    def _load_stress_data(self):
+        """
+        Fill the stress test model with the number of synthetic items selected.
+        """
+
+        count = self._stress_count_combo.itemData(
+            self._stress_count_combo.currentIndex()
+        )
+
+        QtGui.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            self._stress_model.set_columns(generate_columns(count))
+        finally:
+            QtGui.QApplication.restoreOverrideCursor()
+
     def _toggle_view_mode(self):
         """
         Set the view item delegate based on the view mode button clicked.
@@ -504,9 +808,12 @@ class ViewItemDelegateDemo(QtGui.QWidget):
             self._view.setViewMode(QtGui.QListView.ListMode)
             self._list_view_button.setChecked(True)
             self._thumbnail_view_button.setChecked(False)
+            self._update_uniform_item_sizes()
 
             # Set the delegate to render the list mode
-            if isinstance(self._view.model(), BasicListItemModel):
+            if self._view.model() is self._stress_model:
+                self._view.setItemDelegate(self._stress_list_view_delegate)
+            elif isinstance(self._view.model(), BasicListItemModel):
                 self._view.setItemDelegate(self._list_view_delegate)
             elif isinstance(self._view.model(), BasicShotgunModel):
                 self._view.setItemDelegate(self._shotgun_list_view_delegate)
@@ -519,9 +826,12 @@ class ViewItemDelegateDemo(QtGui.QWidget):
             self._view.setViewMode(QtGui.QListView.IconMode)
             self._thumbnail_view_button.setChecked(True)
             self._list_view_button.setChecked(False)
+            self._update_uniform_item_sizes()
 
             # Set the delegate to render the thumbnail mode
-            if isinstance(self._view.model(), BasicListItemModel):
+            if self._view.model() is self._stress_model:
+                self._view.setItemDelegate(self._stress_thumbnail_view_delegate)
+            elif isinstance(self._view.model(), BasicListItemModel):
                 self._view.setItemDelegate(self._thumbnail_view_delegate)
             elif isinstance(self._view.model(), BasicShotgunModel):
                 self._view.setItemDelegate(self._shotgun_thumbnail_view_delegate)
@@ -8,15 +8,154 @@
 # agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import collections
+import datetime
+import re
+import time
+
+import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
+# import the utils module from qtwidgets framework
+utils = sgtk.platform.import_framework("tk-framework-qtwidgets", "utils")
+shotgun_model = sgtk.platform.import_framework(
+    "tk-framework-shotgunutils", "shotgun_model"
+)
+
+
+class CompiledTemplate(object):
+    """
+    A template string, parsed once into its literal text and its tokens (e.g. "{[By: ]created_by|Unknown}").
+
+    Resolving a template only resolves its tokens, with the tk-framework-qtwidgets utils method
+    convert_token_string, instead of searching the whole template string for tokens.
+    """
+
+    # Matches the tokens of a template
+    TOKEN_REGEX = re.compile(r"({[^{}]*})")
+
+    def __init__(self, template_string):
+        """
+        Parse the template.
+
+        :param template_string: The template string, see convert_token_string for the token syntax.
+        :type template_string: str
+        """
+
+        self.template_string = template_string
+
+        # The template split into its literal text and its tokens: the tokens are at the odd indexes.
+        self._parts = self.TOKEN_REGEX.split(template_string)
+
+    def resolve(self, sg_data):
+        """
+        Return the template string with its tokens replaced by their value in the data.
+
+        :param sg_data: The Flow Production Tracking data to resolve the tokens with.
+        :type sg_data: dict
+
+        :return: The resolved string.
+        :rtype: str
+        """
+
+        parts = list(self._parts)
+        for i in range(1, len(parts), 2):
+            parts[i] = utils.convert_token_string(parts[i], sg_data)
+        return "".join(parts)
+
 
 class MockViewConfigHook(object):
     """
     A mock hook, to demonstrate how a Qt model class can optionally call a hook method to
     retrieve view configuration customizations.
+
+    The role methods return the item templates resolved with the item data. Each template is parsed
+    once, and the resolved strings are memoized per item and template, instead of having the
+    delegate resolve the templates on every paint. The model must call :meth:`clear_cache` when
+    the data of its items changes or it is reset. The strings of the least recently used items
+    are removed once ``MAX_CACHED_ITEMS`` items are memoized.
     """
 
+    HEADER_TEMPLATE = CompiledTemplate("<span style='font-size:16px;'>{content}</span>")
+    SUBTITLE_TEMPLATE = CompiledTemplate(
+        "<span style='color: rgba(200, 200, 200, 40%);'>{sg_status_list}</span>"
+    )
+    TEXT_TEMPLATE = CompiledTemplate(
+        "<br/>".join(
+            [
+                "{project::showtype}",
+                "{entity::showtype}",
+                "{[<span style='color:#18A7E3'>Assigned to </span>]task_assignees}",
+                "{[By: ]created_by|Unknown} {created_at}",
+            ]
+        )
+    )
+    SHORT_TEXT_TEMPLATE = CompiledTemplate(
+        "<br/>".join(
+            [
+                "<span style='font-size:10px;'>{content}</span>",
+                "<span style='font-size:10px;'>{entity::showtype}</span>",
+            ]
+        )
+    )
+
+    # The maximum number of items to memoize the resolved strings of
+    MAX_CACHED_ITEMS = 1000
+
+    # The resolved strings of each item, via model item. Each value is a dictionary of the strings
+    # via template. Least recently used first.
+    _resolved_strings = collections.OrderedDict()
+
+    @classmethod
+    def resolve(cls, template, item):
+        """
+        Return a template resolved with the data of an item. The string is memoized until
+        :meth:`clear_cache` is called for the item: the item data is only requested to resolve the
+        template the first time.
+
+        :param template: The template to resolve.
+        :type template: CompiledTemplate
+        :param item: The model item.
+        :type item: QStandardItem
+
+        :return: The resolved string.
+        :rtype: str
+        """
+
+        cached = cls._resolved_strings.get(item)
+        if cached is None:
+            cached = {}
+            cls._resolved_strings[item] = cached
+            while len(cls._resolved_strings) > cls.MAX_CACHED_ITEMS:
+                cls._resolved_strings.popitem(last=False)
+        else:
+            # The item has just been used
+            cls._resolved_strings.move_to_end(item)
+
+        resolved = cached.get(template)
+        if resolved is None:
+            resolved = template.resolve(item.get_sg_data() or {})
+            cached[template] = resolved
+
+        return resolved
+
+    @classmethod
+    def clear_cache(cls, items=None):
+        """
+        Clear the resolved strings of items, e.g. when their data changed.
+
+        :param items: The model items to clear the strings of, or None to clear the strings of all
+            the items.
+        :type items: list
+        """
+
+        if items is None:
+            cls._resolved_strings.clear()
+            return
+
+        for item in items:
+            cls._resolved_strings.pop(item, None)
+
     @staticmethod
     def _get_item_thumbnail(item):
         """
@@ -38,11 +177,10 @@ class MockViewConfigHook(object):
         """
         Return the header data for the item.
 
-        Notice that the return value is a tuple. The ViewItemDelegate will handle
-        a tuple that contains a templated string as the first item, and a
-        Flow Production Tracking data dictionary as the second item. The delegate
-        will process the template and data provided to search and replace tokens
-        before displaying the value.
+        Notice that the value is a template string resolved with the item Flow Production
+        Tracking data. The ViewItemDelegate could also handle a tuple that contains the
+        templated string as the first item, and the data dictionary as the second item,
+        but it would then process the template on every paint.
 
         See tk-framework-qtwidgets utils.py method convert_token_string for more
         details on how string template resolution is done.
@@ -51,23 +189,20 @@ class MockViewConfigHook(object):
         :type item: QStandardItem
 
         :return: The item header data.
-        :rtype: tuple(str, dict)
+        :rtype: str
         """
 
-        sg_data = item.get_sg_data()
-        template_string = "<span style='font-size:16px;'>{content}</span>"
-        return (template_string, sg_data)
+        return MockViewConfigHook.resolve(MockViewConfigHook.HEADER_TEMPLATE, item)
 
     @staticmethod
     def _get_item_subtitle(item):
         """
         Return the subtitle data for the item.
 
-        Notice that the return value is a tuple. The ViewItemDelegate will handle
-        a tuple that contains a templated string as the first item, and a
-        Flow Production Tracking data dictionary as the second item. The delegate
-        will process the template and data provided to search and replace tokens
-        before displaying the value.
+        Notice that the value is a template string resolved with the item Flow Production
+        Tracking data. The ViewItemDelegate could also handle a tuple that contains the
+        templated string as the first item, and the data dictionary as the second item,
+        but it would then process the template on every paint.
 
         See tk-framework-qtwidgets utils.py method convert_token_string for more
         details on how string template resolution is done.
@@ -76,25 +211,20 @@ class MockViewConfigHook(object):
         :type item: QStandardItem
 
         :return: The item subtitle data.
-        :rtype: tuple(str, dict)
+        :rtype: str
         """
 
-        sg_data = item.get_sg_data()
-        template_string = (
-            "<span style='color: rgba(200, 200, 200, 40%);'>{sg_status_list}</span>"
-        )
-        return (template_string, sg_data)
+        return MockViewConfigHook.resolve(MockViewConfigHook.SUBTITLE_TEMPLATE, item)
 
     @staticmethod
     def _get_item_text(item):
         """
         Return the detailed text data for the item.
 
-        Notice that the return value is a tuple. The ViewItemDelegate will handle
-        a tuple that contains a templated string as the first item, and a
-        Flow Production Tracking data dictionary as the second item. The delegate
-        will process the template and data provided to search and replace tokens
-        before displaying the value.
+        Notice that the value is a template string resolved with the item Flow Production
+        Tracking data. The ViewItemDelegate could also handle a tuple that contains the
+        templated string as the first item, and the data dictionary as the second item,
+        but it would then process the template on every paint.
 
         See tk-framework-qtwidgets utils.py method convert_token_string for more
         details on how string template resolution is done.
@@ -103,30 +233,20 @@ class MockViewConfigHook(object):
         :type item: QStandardItem
 
         :return: The item long text data.
-        :rtype: tuple(str, dict)
+        :rtype: str
         """
 
-        sg_data = item.get_sg_data()
-        template_string = "<br/>".join(
-            [
-                "{project::showtype}",
-                "{entity::showtype}",
-                "{[<span style='color:#18A7E3'>Assigned to </span>]task_assignees}",
-                "{[By: ]created_by|Unknown} {created_at}",
-            ]
-        )
-        return (template_string, sg_data)
+        return MockViewConfigHook.resolve(MockViewConfigHook.TEXT_TEMPLATE, item)
 
     @staticmethod
     def _get_item_short_text(item):
         """
         Return the condensed text data for the item.
 
-        Notice that the return value is a tuple. The ViewItemDelegate will handle
-        a tuple that contains a templated string as the first item, and a
-        Flow Production Tracking data dictionary as the second item. The delegate
-        will process the template and data provided to search and replace tokens
-        before displaying the value.
+        Notice that the value is a template string resolved with the item Flow Production
+        Tracking data. The ViewItemDelegate could also handle a tuple that contains the
+        templated string as the first item, and the data dictionary as the second item,
+        but it would then process the template on every paint.
 
         See tk-framework-qtwidgets utils.py method convert_token_string for more
         details on how string template resolution is done.
@@ -135,14 +255,94 @@ class MockViewConfigHook(object):
         :type item: QStandardItem
 
         :return: The item short text data.
-        :rtype: tuple(str, dict)
+        :rtype: str
         """
 
-        sg_data = item.get_sg_data()
-        template_string = "<br/>".join(
-            [
-                "<span style='font-size:10px;'>{content}</span>",
-                "<span style='font-size:10px;'>{entity::showtype}</span>",
-            ]
+        return MockViewConfigHook.resolve(MockViewConfigHook.SHORT_TEXT_TEMPLATE, item)
+
+
+def benchmark(row_count=1000, repeat=5):
+    """
+    Time the resolution of the item templates for Task rows, as done by the role methods on every
+    paint: without the memoized strings (e.g. getting the data of each item and resolving the
+    whole templates) and with them. The strings resolved both ways are checked to be the same.
+
+    Only the resolution of the templates is timed, not the painting of the items.
+
+    :param row_count: The number of Task rows.
+    :type row_count: int
+    :param repeat: The number of times to resolve the templates of every row. The best time is kept.
+    :type repeat: int
+
+    :return: The time to resolve the templates of all the rows without and with the memoized
+        strings, in milliseconds.
+    :rtype: tuple(float, float)
+
+    :raises AssertionError: If a template resolves to a different string with the memoized
+        strings.
+    """
+
+    templates = [
+        MockViewConfigHook.HEADER_TEMPLATE,
+        MockViewConfigHook.SUBTITLE_TEMPLATE,
+        MockViewConfigHook.TEXT_TEMPLATE,
+        MockViewConfigHook.SHORT_TEXT_TEMPLATE,
+    ]
+
+    user = {"type": "HumanUser", "id": 1, "name": "Jane Doe"}
+    rows = [shotgun_model.ShotgunStandardItem() for _ in range(row_count)]
+    for row, item in enumerate(rows):
+        sg_data = {
+            "type": "Task",
+            "id": row,
+            "content": "Task %d" % row,
+            "sg_status_list": "ip",
+            "project": {"type": "Project", "id": 1, "name": "Demo Project"},
+            "entity": {"type": "Shot", "id": row, "name": "Shot %d" % row},
+            "task_assignees": [user],
+            "created_by": user,
+            "created_at": datetime.datetime(2021, 1, 1),
+        }
+        item.setData(sg_data, shotgun_model.ShotgunModel.SG_DATA_ROLE)
+
+    def _time(resolve):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in rows:
+                for template in templates:
+                    resolve(template, item)
+            duration = time.perf_counter() - start
+            if best is None or duration < best:
+                best = duration
+        return best * 1000
+
+    # The memoized strings must not be evicted while the rows are resolved
+    max_cached_items = MockViewConfigHook.MAX_CACHED_ITEMS
+    MockViewConfigHook.MAX_CACHED_ITEMS = max(max_cached_items, row_count)
+
+    before = _time(
+        lambda template, item: utils.convert_token_string(
+            template.template_string, item.get_sg_data()
         )
-        return (template_string, sg_data)
+    )
+    MockViewConfigHook.clear_cache()
+    try:
+        after = _time(MockViewConfigHook.resolve)
+
+        for item in rows:
+            for template in templates:
+                expected = utils.convert_token_string(
+                    template.template_string, item.get_sg_data()
+                )
+                resolved = MockViewConfigHook.resolve(template, item)
+                if resolved != expected:
+                    raise AssertionError(
+                        "Template '%s' resolved to '%s' instead of '%s'"
+                        % (template.template_string, resolved, expected)
+                    )
+    finally:
+        MockViewConfigHook.MAX_CACHED_ITEMS = max_cached_items
+        MockViewConfigHook.clear_cache()
+
+    return (before, after)
@@ -0,0 +1,131 @@
+# Copyright (c) 2021 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+#
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import collections
+
+from sgtk.platform.qt import QtCore, QtGui
+
+
+class PixmapCache(object):
+    """
+    A least recently used cache of the pixmaps loaded from image files (or Qt resources), and of
+    their scaled variants.
+
+    Loading a pixmap decodes the image, and scaling it with a smooth transformation is not cheap
+    either. Views ask for the thumbnails of the visible items on every paint, so the pixmaps are
+    loaded once and scaled once per size instead.
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        :param max_size: The maximum memory used by the cached pixmaps, in bytes.
+        :type max_size: int
+        """
+
+        self._max_size = max_size
+
+        # The pixmaps, their cost in bytes and whether they were scaled with a fast transformation,
+        # via (path, width, height). The width and height are None for the pixmaps at their
+        # original size. Least recently used first.
+        self._pixmaps = collections.OrderedDict()
+        self._size = 0
+
+    def get_pixmap(self, path, size=None, fast=False):
+        """
+        Return the pixmap for an image.
+
+        :param path: The path to the image file or Qt resource.
+        :type path: str
+        :param size: The size to scale the pixmap down to, keeping its aspect ratio. The pixmap is
+            returned at its original size if None, an invalid size, or if it already fits the size.
+        :type size: :class:`sgtk.platform.qt.QtCore.QSize`
+        :param fast: True to scale the pixmap with a fast transformation if it isn't cached yet,
+            e.g. while the size is being changed interactively. The fast scaled pixmap is cached
+            until the pixmap is requested at the same size without ``fast``, or until
+            :meth:`remove_fast_pixmaps` is called.
+        :type fast: bool
+
+        :return: The pixmap, which is null if the image could not be loaded.
+        :rtype: :class:`sgtk.platform.qt.QtGui.QPixmap`
+        """
+
+        if size is None or not size.isValid():
+            key = (path, None, None)
+        else:
+            key = (path, size.width(), size.height())
+
+        cached = self._pixmaps.get(key)
+        if cached is not None and (fast or not cached[2]):
+            # The pixmap has just been used
+            self._pixmaps.move_to_end(key)
+            return cached[0]
+
+        if key[1] is None:
+            pixmap = QtGui.QPixmap(path)
+            fast = False
+        else:
+            pixmap = self.get_pixmap(path)
+            if pixmap.width() > size.width() or pixmap.height() > size.height():
+                if fast:
+                    transformation = QtCore.Qt.FastTransformation
+                else:
+                    transformation = QtCore.Qt.SmoothTransformation
+                pixmap = pixmap.scaled(size, QtCore.Qt.KeepAspectRatio, transformation)
+            else:
+                # The original pixmap is used as is
+                fast = False
+
+        self._add(key, pixmap, fast)
+        return pixmap
+
+    def remove_fast_pixmaps(self):
+        """
+        Remove the pixmaps scaled with a fast transformation from the cache, e.g. once the size
+        has stopped changing interactively.
+        """
+
+        for key in [key for key, cached in self._pixmaps.items() if cached[2]]:
+            self._remove(key)
+
+    def clear(self):
+        """
+        Remove all the pixmaps from the cache.
+        """
+
+        self._pixmaps.clear()
+        self._size = 0
+
+    def _add(self, key, pixmap, fast=False):
+        """
+        Add a pixmap to the cache, and remove the least recently used pixmaps if the cache is full.
+        """
+
+        if key in self._pixmaps:
+            # Replace the fast scaled pixmap
+            self._remove(key)
+
+        cost = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self._pixmaps[key] = (pixmap, cost, fast)
+        self._size += cost
+
+        # Keep at least the pixmap just added
+        while self._size > self._max_size and len(self._pixmaps) > 1:
+            _, (_, cost, _) = self._pixmaps.popitem(last=False)
+            self._size -= cost
+
+    def _remove(self, key):
+        """
+        Remove a pixmap from the cache.
+        """
+
+        _, cost, _ = self._pixmaps.pop(key)
+        self._size -= cost
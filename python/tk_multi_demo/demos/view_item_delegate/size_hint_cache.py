@@ -0,0 +1,149 @@
+# Copyright (c) 2021 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+#
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+from sgtk.platform.qt import QtCore, QtGui
+
+
+def size_hint_cache_delegate_class(delegate_class):
+    """
+    Return a subclass of a ViewItemDelegate class which caches the size hints of the items when
+    the rows expand to fit their text (e.g. the delegate ``item_height`` is None).
+
+    The size hint of an expanded row is computed by laying out the whole HTML text of the item,
+    and a view with non uniform item sizes asks for the size hint of every row on layout. The size
+    hints are cached by row and font, for the current width of the view. The cache is cleared when
+    the width of the view changes, when the model is reset or its rows change, and the size hints
+    of the items in a dataChanged range are removed.
+
+    :param delegate_class: The ViewItemDelegate class to cache the size hints of.
+
+    :return: The caching delegate class.
+    """
+
+    class SizeHintCacheDelegate(delegate_class):
+        """
+        A ViewItemDelegate caching the size hints of the expanded rows.
+        """
+
+        def __init__(self, *args, **kwargs):
+            """
+            Initialize the delegate.
+            """
+
+            super(SizeHintCacheDelegate, self).__init__(*args, **kwargs)
+
+            # The size hints and the key of the font they were computed with via row, for the view
+            # width they were computed at
+            self._size_hints = {}
+            self._size_hints_width = None
+
+            # The model the size hints are cached for
+            self._size_hints_model = None
+
+        def sizeHint(self, option, index):
+            """
+            Override the base method to cache the size hints of the expanded rows.
+            """
+
+            if self.item_height is not None:
+                # The rows have a fixed height, the size hint is cheap
+                return super(SizeHintCacheDelegate, self).sizeHint(option, index)
+
+            self._watch_model(index.model())
+
+            view = self.parent()
+            if isinstance(view, QtGui.QAbstractItemView):
+                width = view.viewport().width()
+            else:
+                width = option.rect.width()
+
+            if width != self._size_hints_width:
+                # The text wraps differently
+                self._size_hints.clear()
+                self._size_hints_width = width
+
+            font_key = option.font.key()
+            cached = self._size_hints.get(index.row())
+            if cached is not None and cached[0] == font_key:
+                return QtCore.QSize(cached[1])
+
+            size_hint = super(SizeHintCacheDelegate, self).sizeHint(option, index)
+            self._size_hints[index.row()] = (font_key, QtCore.QSize(size_hint))
+            return size_hint
+
+        def clear_size_hint_cache(self, *args):
+            """
+            Clear the cached size hints, e.g. when a delegate property changes the item layout.
+
+            The args of the model signals this is connected to are ignored.
+            """
+
+            self._size_hints.clear()
+
+        def _watch_model(self, model):
+            """
+            Invalidate the size hints when the data of a model changes.
+            """
+
+            if model is self._size_hints_model:
+                return
+
+            if self._size_hints_model is not None:
+                self._disconnect_model(self._size_hints_model)
+
+            self._size_hints.clear()
+            self._size_hints_model = model
+
+            model.dataChanged.connect(self._on_data_changed)
+            for signal in self._get_reset_signals(model):
+                signal.connect(self.clear_size_hint_cache)
+
+        def _disconnect_model(self, model):
+            """
+            Stop watching the data of a model.
+            """
+
+            try:
+                model.dataChanged.disconnect(self._on_data_changed)
+                for signal in self._get_reset_signals(model):
+                    signal.disconnect(self.clear_size_hint_cache)
+            except (RuntimeError, TypeError):
+                # The model has been deleted
+                pass
+
+        def _get_reset_signals(self, model):
+            """
+            Return the signals of a model that invalidate all the size hints.
+            """
+
+            return [
+                model.modelReset,
+                model.layoutChanged,
+                model.rowsInserted,
+                model.rowsRemoved,
+                model.rowsMoved,
+            ]
+
+        def _on_data_changed(self, top_left, bottom_right, *args):
+            """
+            Remove the size hints of the items whose data changed.
+            """
+
+            first_row = top_left.row()
+            last_row = bottom_right.row()
+            if last_row - first_row + 1 >= len(self._size_hints):
+                self._size_hints.clear()
+                return
+
+            for row in range(first_row, last_row + 1):
+                self._size_hints.pop(row, None)
+
+    SizeHintCacheDelegate.__name__ = "SizeHintCache%s" % delegate_class.__name__
+    return SizeHintCacheDelegate
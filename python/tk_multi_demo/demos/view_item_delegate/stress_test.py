@@ -0,0 +1,228 @@
+# Copyright (c) 2021 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the ShotGrid Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+#
+# agreement to the ShotGrid Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import time
+
+from sgtk.platform.qt import QtCore, QtGui
+
+from .basic_list_model import BasicListItemModel
+
+# The synthetic item text, cycled through to vary the text length and formatting
+_SUBTITLES = [
+    "Subtitle",
+    "<i>Italic Subtitle</i>",
+    "<span style='color:#18A7E3'>Colored Subtitle</span>",
+    "<span style='color:rgba(240,240,240,60)'>Faded Subtitle</span>",
+]
+_TEXTS = [
+    "Short text.",
+    "This is some longer text.<br/>With multiple lines.<br/>The end.",
+    "<b>Bold</b>, <i>italic</i> and <u>underlined</u> text.",
+    "<br/>".join(
+        [
+            "A line of text that is long enough that it will most likely need to be elided by the delegate",
+            "<span style='color:#18A7E3'>Colored</span> text on the second line",
+            "A third line",
+            "A fourth line, which is clipped unless the row is expanded",
+        ]
+    ),
+]
+_SHORT_TEXTS = [
+    "Short txt",
+    "<b>Short txt</b><br/><i>Bold</i>",
+    "<span style='color:#18A7E3'>Short txt</span>",
+]
+_THUMBNAILS = [
+    ":/tk_multi_demo_view_item_delegate/project_1.png",
+    ":/tk_multi_demo_view_item_delegate/project_2.png",
+]
+
+
+def generate_columns(count):
+    """
+    Generate the data of synthetic items, to stress test the delegates with.
+
+    The items cycle through a few variations of text, thumbnails and icons. The values are shared
+    between the items so that a million items only cost the lists that hold them.
+
+    :param count: The number of items to generate.
+    :type count: int
+
+    :return: The values of the items via role, as expected by
+        :meth:`BasicListItemModel.set_columns`.
+    :rtype: dict
+    """
+
+    # No icon, or an icon in one of the thumbnail corners
+    icon = QtGui.QPixmap(":/tk_multi_demo_view_item_delegate/project_1.png")
+    icons = [None, {"top-left": icon}, None, {"bottom-right": icon}, None]
+
+    headers = ["<b>Item %d</b>" % (row + 1) for row in range(count)]
+
+    def _cycle(values):
+        return [values[row % len(values)] for row in range(count)]
+
+    return {
+        BasicListItemModel.VIEW_ITEM_THUMBNAIL_ROLE: _cycle(_THUMBNAILS),
+        BasicListItemModel.VIEW_ITEM_HEADER_ROLE: headers,
+        BasicListItemModel.VIEW_ITEM_SUBTITLE_ROLE: _cycle(_SUBTITLES),
+        BasicListItemModel.VIEW_ITEM_TEXT_ROLE: _cycle(_TEXTS),
+        BasicListItemModel.VIEW_ITEM_SHORT_TEXT_ROLE: _cycle(_SHORT_TEXTS),
+        BasicListItemModel.VIEW_ITEM_ICON_ROLE: _cycle(icons),
+    }
+
+
+def profiled_delegate_class(delegate_class):
+    """
+    Return a subclass of a delegate class which reports the time spent painting, and the sizeHint
+    calls, to a :class:`DelegateProfiler` assigned to its ``profiler`` attribute.
+
+    :param delegate_class: The delegate class to profile.
+    :type delegate_class: :class:`sgtk.platform.qt.QtGui.QStyledItemDelegate`
+
+    :return: The profiled delegate class.
+    """
+
+    class ProfiledDelegate(delegate_class):
+        """
+        A delegate reporting its paint and sizeHint calls to a DelegateProfiler.
+        """
+
+        # The DelegateProfiler to report to
+        profiler = None
+
+        def paint(self, painter, option, index):
+            """
+            Override the base method to time it.
+            """
+
+            start = time.perf_counter()
+            try:
+                super(ProfiledDelegate, self).paint(painter, option, index)
+            finally:
+                if self.profiler is not None:
+                    self.profiler.add_paint(time.perf_counter() - start)
+
+        def sizeHint(self, option, index):
+            """
+            Override the base method to count the calls.
+            """
+
+            if self.profiler is not None:
+                self.profiler.add_size_hint()
+            return super(ProfiledDelegate, self).sizeHint(option, index)
+
+    ProfiledDelegate.__name__ = "Profiled%s" % delegate_class.__name__
+    return ProfiledDelegate
+
+
+class DelegateProfiler(QtCore.QObject):
+    """
+    Collect the paint time per frame, the sizeHint calls per second and the frames per second of a
+    view, as reported by its profiled delegates, and emit a readout of them periodically.
+    """
+
+    # Emitted with a readout of the stats of the last period
+    stats_updated = QtCore.Signal(str)
+
+    def __init__(self, view, interval=500, parent=None):
+        """
+        Initialize the profiler.
+
+        :param view: The view to profile. Each repaint of its viewport counts as a frame.
+        :type view: :class:`sgtk.platform.qt.QtGui.QAbstractItemView`
+        :param interval: The period of the readouts, in milliseconds.
+        :type interval: int
+        :param parent: The parent QObject.
+        """
+
+        super(DelegateProfiler, self).__init__(parent)
+
+        self._reset()
+
+        view.viewport().installEventFilter(self)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._emit_stats)
+
+    def start(self):
+        """
+        Start collecting the stats.
+        """
+
+        self._reset()
+        self._timer.start()
+
+    def stop(self):
+        """
+        Stop collecting the stats.
+        """
+
+        self._timer.stop()
+
+    def add_paint(self, duration):
+        """
+        Report the time a delegate spent painting an item.
+
+        :param duration: The paint time, in seconds.
+        :type duration: float
+        """
+
+        self._paint_time += duration
+
+    def add_size_hint(self):
+        """
+        Report a sizeHint call.
+        """
+
+        self._size_hint_count += 1
+
+    def eventFilter(self, obj, event):
+        """
+        Override the base method to count the viewport repaints.
+        """
+
+        if event.type() == QtCore.QEvent.Paint:
+            self._frame_count += 1
+
+        return False
+
+    def _reset(self):
+        """
+        Reset the stats of the period.
+        """
+
+        self._start_time = time.perf_counter()
+        self._paint_time = 0.0
+        self._size_hint_count = 0
+        self._frame_count = 0
+
+    def _emit_stats(self):
+        """
+        Emit the readout of the stats of the period that ended, and start a new period.
+        """
+
+        duration = time.perf_counter() - self._start_time
+        if self._frame_count:
+            paint_ms = self._paint_time * 1000 / self._frame_count
+        else:
+            paint_ms = 0.0
+
+        self.stats_updated.emit(
+            "Paint: %.2f ms/frame | sizeHint: %d calls/s | %.1f FPS"
+            % (
+                paint_ms,
+                self._size_hint_count / duration,
+                self._frame_count / duration,
+            )
+        )
+
+        self._reset()
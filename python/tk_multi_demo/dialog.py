@@ -8,24 +8,29 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import inspect
+import collections
 import os
+import time
 
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 from sgtk.platform import constants
 
-# for reading each demo's demo.yml file
-from tank_vendor import yaml
-
 # ensure the resources are available
 from .ui import resources_rc
 
 from .demos import DEMO_DEFAULT, DEMOS_LIST
-
-# TODO: file copied from python console.
-#       maybe entire python console widget set should live in qtwidgets?
-from .syntax_highlighter import PythonSyntaxHighlighter
+from .demos.registry import DemoDescriptor
+from .manifest_index import DemoManifestIndex
+from .prewarm import DemoUsageHistory, IdleScheduler
+from .demo_state import DemoStateSnapshot
+
+from .code_cache import CodeDocumentCache
+from .code_search import CodeSearchIndexer
+from .span_cache import SpanCache
+from .syntax_highlighter import SpanSyntaxHighlighter, get_highlighter
+from .source_index import DemoSourceIndex
+from .stylesheet import StylesheetCompiler
 
 overlay = sgtk.platform.import_framework("tk-framework-qtwidgets", "overlay_widget")
 
@@ -56,6 +61,9 @@ class DemoWidget(QtGui.QSplitter):
     Main application dialog window.
     """
 
+    # the number of demos to construct ahead of time while the app is idle
+    PREWARM_COUNT = 4
+
     def __init__(self):
         """
         Initialize the main demo widget.
@@ -68,25 +76,60 @@ class DemoWidget(QtGui.QSplitter):
         # easy access to the app instance
         self.app = sgtk.platform.current_bundle()
 
+        # records where the startup time goes. the first paint is timed from
+        # the start of the construction of this widget
+        self._timing = self.app.startup_timing
+        self._init_start = time.perf_counter()
+        self._first_paint_done = False
+
         # the default class/info to use at startup
         self._default_demo_info = None
 
         # quick lookup of demo info as selection changes
         self._demo_info_lookup = {}
 
-        # quick lookup of stacked widget positions via demo names
-        self._demo_stack_lookup = {}
+        # quick lookup of the live demo widgets in the stack via demo names.
+        # this keeps a reference to the demo widgets, which prevents issues
+        # with garbage collection. the demos are ordered from the least to the
+        # most recently displayed
+        self._demo_stack_lookup = collections.OrderedDict()
+
+        # the maximum number of demo widgets kept alive. the least recently
+        # displayed demos are destroyed beyond that
+        self._max_live_demos = self.app.get_setting("max_live_demos")
+
+        # snapshots of the state of the demos destroyed, via demo names
+        self._demo_state_lookup = {}
 
-        # quick lookup of previously created file models via demo names
+        # quick lookup of previously created file models via demo directories
         self._demo_file_model_lookup = {}
 
-        # keep a reference to all demo widgets created. this will prevent issues
-        # with garbage collection
-        self.__all_demos = []
+        # the info from every demo's manifest, stored in a single file so that
+        # the demo model can be built without parsing each manifest
+        self._manifest_index = DemoManifestIndex(
+            os.path.join(self.app.cache_location, "demo_manifest_index.json")
+        )
 
         # construct the model based on the hierarchy defined in the
         # demos module
-        self._demo_model = self._get_demo_model()
+        with self._timing.span("get_demo_model"):
+            self._demo_model = self._get_demo_model()
+
+        # persist any manifests that had to be parsed
+        self._manifest_index.save()
+
+        # resolves the toolkit tokens in the demos' style sheets, and remembers
+        # the result so each style sheet is only resolved once
+        self._stylesheet_compiler = StylesheetCompiler(
+            os.path.join(self.app.cache_location, "demo_stylesheet_cache.json"),
+            constants.SG_STYLESHEET_CONSTANTS,
+        )
+
+        # remembers which demos the user opens, to decide which ones to
+        # construct ahead of time
+        self._usage_history = DemoUsageHistory(
+            os.path.join(self.app.cache_location, "demo_usage_history.json")
+        )
 
         # build a tree view to show all the demos
         self._demo_tree_view = QtGui.QTreeView()
@@ -121,11 +164,84 @@ class DemoWidget(QtGui.QSplitter):
         self._demo_code_edit.setReadOnly(True)
         self._demo_code_edit.setWordWrapMode(QtGui.QTextOption.NoWrap)
 
-        # a syntax highlighter for the code editor
-        self._syntax_highlighter = PythonSyntaxHighlighter(
-            self._demo_code_edit.document(), self._demo_code_edit.palette()
+        # highlight the code scrolled into view ahead of the rest of the file
+        self._demo_code_edit.verticalScrollBar().valueChanged.connect(
+            lambda value: self._highlight_visible_code()
+        )
+
+        # runs the file system work of the dialog on the app's shared threads
+        self._bg_task_manager = self.app.create_demo_task_manager()
+
+        # reads the files to display in the background and keeps their
+        # highlighted documents around to switch between them quickly
+        self._code_cache = CodeDocumentCache(
+            self._bg_task_manager,
+            self._demo_code_edit.palette(),
+            highlighting=self.app.get_setting("code_highlighting"),
+            span_cache=SpanCache(os.path.join(self.app.cache_location, "code_spans")),
+            parent=self,
+        )
+        self._code_cache.document_ready.connect(self._on_code_document_ready)
+
+        # highlight the code with the new colors when the palette of the code
+        # editor changes. the editor gets its new palette after this widget
+        self._demo_code_edit.installEventFilter(self)
+
+        # lists the source files of all the demos in the background, and keeps
+        # the list up to date as files are added or removed
+        self._source_index = DemoSourceIndex(
+            os.path.join(os.path.dirname(__file__), "demos"),
+            self._bg_task_manager,
+            self,
+        )
+        self._source_index.demo_files_changed.connect(self._on_demo_files_changed)
+
+        # indexes the code of all the demos in the background for searching.
+        # the index is updated as the source files are listed
+        self._code_search_indexer = CodeSearchIndexer(
+            self._source_index,
+            os.path.join(self.app.cache_location, "code_search_index.json"),
+            self._bg_task_manager,
+            self,
+        )
+        self._source_index.scan()
+
+        # the full path of the file to display in the code editor
+        self._code_path = None
+
+        # the (path, line number) of a search result to scroll to once its
+        # file is displayed
+        self._code_jump = None
+
+        # search box to find code across all the demos
+        self._code_search_edit = QtGui.QLineEdit()
+        self._code_search_edit.setObjectName("code_search_edit")
+        self._code_search_edit.setPlaceholderText("Search the code of all demos...")
+
+        # lists the lines of code matching the search
+        self._code_search_results = QtGui.QListWidget()
+        self._code_search_results.setObjectName("code_search_results")
+        self._code_search_results.setMaximumHeight(150)
+        self._code_search_results.hide()
+
+        # search once the user stops typing
+        self._code_search_timer = QtCore.QTimer(self)
+        self._code_search_timer.setSingleShot(True)
+        self._code_search_timer.setInterval(150)
+        self._code_search_timer.timeout.connect(self._search_code)
+        self._code_search_edit.textChanged.connect(
+            lambda text: self._code_search_timer.start()
+        )
+        self._code_search_indexer.index_updated.connect(self._search_code)
+        self._code_search_results.itemActivated.connect(
+            self._on_code_search_result_activated
+        )
+        self._code_search_results.itemClicked.connect(
+            self._on_code_search_result_activated
         )
-        self._syntax_highlighter.setDocument(self._demo_code_edit.document())
+
+        # displayed in the file combo until the files of the demo are indexed
+        self._empty_file_model = QtGui.QStandardItemModel(self)
 
         # combobox to display all python files in a demo
         self._demo_file_combo = QtGui.QComboBox()
@@ -133,13 +249,15 @@ class DemoWidget(QtGui.QSplitter):
 
         # layout the code tab
         demo_code_layout = QtGui.QVBoxLayout()
+        demo_code_layout.addWidget(self._code_search_edit)
+        demo_code_layout.addWidget(self._code_search_results)
         demo_code_layout.addWidget(self._demo_code_edit)
         demo_code_layout.addWidget(self._demo_file_combo)
         demo_code_layout.setAlignment(self._demo_file_combo, QtCore.Qt.AlignRight)
 
         # a single widget to wrap the code layout
-        demo_code_widget = QtGui.QWidget()
-        demo_code_widget.setLayout(demo_code_layout)
+        self._demo_code_widget = QtGui.QWidget()
+        self._demo_code_widget.setLayout(demo_code_layout)
 
         # tab widget displays the current demo
         self._demo_tabs = QtGui.QTabWidget(self)
@@ -148,7 +266,7 @@ class DemoWidget(QtGui.QSplitter):
 
         # add the widgets as tabs
         self._demo_tabs.addTab(self._demo_widget_tab, "Interactive Demo")
-        self._demo_tabs.addTab(demo_code_widget, "Code")
+        self._demo_tabs.addTab(self._demo_code_widget, "Code")
 
         # an overlay of the tabs for displaying errors, etc.
         self._overlay = overlay.ShotgunOverlayWidget(self._demo_tabs)
@@ -184,7 +302,13 @@ class DemoWidget(QtGui.QSplitter):
         self._demo_file_combo.activated[int].connect(self._on_file_selected)
 
         # set the default demo
-        self._set_default_demo()
+        with self._timing.span("default_demo"):
+            self._set_default_demo()
+
+        # construct the demos most likely to be opened next while the user is
+        # not interacting with the app
+        self._prewarm_scheduler = IdleScheduler(self._prewarm_demos, self)
+        self._prewarm_scheduler.start()
 
         QtCore.QCoreApplication.instance().aboutToQuit.connect(self.destroy)
 
@@ -194,9 +318,51 @@ class DemoWidget(QtGui.QSplitter):
         This allows them to do their own cleanup.
         """
 
-        for demo in self.__all_demos:
+        self._prewarm_scheduler.stop()
+        self._usage_history.save()
+        self._stylesheet_compiler.save()
+        self._bg_task_manager.shut_down()
+
+        for demo in self._demo_stack_lookup.values():
             demo.destroy()
 
+    def eventFilter(self, obj, event):
+        """
+        Highlights the code with the new colors when the palette of the code
+        editor changes.
+
+        :param obj: The ``QtCore.QObject`` the event is sent to.
+        :param event: The ``QtCore.QEvent``.
+        """
+
+        if obj is self._demo_code_edit and event.type() == QtCore.QEvent.PaletteChange:
+            palette = self._demo_code_edit.palette()
+            self._code_cache.set_palette(palette)
+
+            # re-theme the document being displayed, if it has been loaded
+            if self._code_path:
+                document = self._code_cache.get_cached_document(self._code_path)
+                if document is not None:
+                    highlighter = get_highlighter(document)
+                    if highlighter is not None:
+                        highlighter.set_palette(palette)
+                    self._highlight_visible_code()
+
+        return super(DemoWidget, self).eventFilter(obj, event)
+
+    def paintEvent(self, event):
+        """
+        Records the time of the first paint of the widget.
+
+        :param event: The ``QtGui.QPaintEvent``.
+        """
+
+        super(DemoWidget, self).paintEvent(event)
+
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self._timing.add_span("first_paint", self._init_start, time.perf_counter())
+
     def set_demo(self, demo_info):
         """
         Given a dict of info about a demo, show it in the UI.
@@ -204,8 +370,9 @@ class DemoWidget(QtGui.QSplitter):
         :param dict demo_info: A dict of info about the demo to display
 
         The ``demo_info`` holds the information parsed from the demo's
-        ``demo.yml`` file. It has one additional field called ``widget_class``
-        which stores the class for the demo widget itself.
+        ``demo.yml`` file. It has one additional field called ``descriptor``
+        which stores the :class:`DemoDescriptor` used to import the class for
+        the demo widget itself the first time the demo is displayed.
         """
 
         self._current_demo_info = demo_info
@@ -214,7 +381,6 @@ class DemoWidget(QtGui.QSplitter):
         demo_name = demo_info["display_name"]
         demo_desc = demo_info["description"]
         demo_doc_url = demo_info["documentation_url"]
-        demo_class = demo_info["widget_class"]
 
         # set the name label
         name_color = self.palette().highlight().color().name()
@@ -233,9 +399,7 @@ class DemoWidget(QtGui.QSplitter):
         # demo stack lookup
         if demo_name not in self._demo_stack_lookup:
             try:
-                widget = demo_class(parent=self)
-                demo_dir = os.path.dirname(inspect.getfile(demo_class))
-                self._apply_external_styleshet(widget, demo_dir)
+                self._create_demo_widget(demo_info)
             except Exception as e:
                 import traceback
 
@@ -246,72 +410,214 @@ class DemoWidget(QtGui.QSplitter):
                 )
                 return
 
-            # keep a reference to all created widgets to avoid problems with
-            # garbage collection
-            self.__all_demos.append(widget)
-
-            stack_pos = self._demo_widget_tab.addWidget(widget)
-            self._demo_stack_lookup[demo_name] = stack_pos
-
         # ensure any previous overlay is hidden
         self._overlay.hide()
 
-        # set the stacked widget index based on the name of the demo to display
-        self._demo_widget_tab.setCurrentIndex(self._demo_stack_lookup[demo_name])
+        # set the stacked widget based on the name of the demo to display
+        self._demo_widget_tab.setCurrentWidget(self._demo_stack_lookup[demo_name])
+
+        # this is now the most recently displayed demo. make room for it
+        self._demo_stack_lookup.move_to_end(demo_name)
+        self._evict_demos()
+
+        # show the files of the demo in the code tab
+        self._show_demo_files("demo.py")
+
+    def _show_demo_files(self, file_name):
+        """
+        Display the files of the current demo in the file combo.
+
+        :param str file_name: The file to display in the code editor, relative
+            to the demo directory. ``demo.py`` is displayed if the demo has no
+            such file.
+        """
+
+        demo_dir = self._current_demo_info["directory"]
 
         # if this demo hasn't previously been shown, create a data model of all
         # the python files in the demo directory
-        if demo_name not in self._demo_file_model_lookup:
-            file_model = self._get_file_model(demo_class)
-            self._demo_file_model_lookup[demo_name] = file_model
+        file_model = self._demo_file_model_lookup.get(demo_dir)
+        if file_model is None:
+            file_model = self._get_file_model(demo_dir)
+            if file_model is None:
+                # the files will be displayed once the demo has been indexed
+                self._demo_file_combo.setModel(self._empty_file_model)
+                return
+            self._demo_file_model_lookup[demo_dir] = file_model
 
         # show the file model as a list in the combo box
-        file_model = self._demo_file_model_lookup[demo_name]
         self._demo_file_combo.setModel(file_model)
 
-        # try to find a demo.py file in the model and use that
-        index = self._demo_file_combo.findText("demo.py")
+        # try to find the file in the model, or a demo.py file, and use that
+        index = self._demo_file_combo.findText(file_name)
+        if index == -1:
+            index = self._demo_file_combo.findText("demo.py")
         if index != -1:
             self._demo_file_combo.setCurrentIndex(index)
             self._on_file_selected(index)
 
-    def _get_file_model(self, demo_class):
+    def _create_demo_widget(self, demo_info):
         """
-        Returns a file model for all python files in the class directory.
+        Create the widget for a demo and add it to the demo stack.
 
-        :param demo_class: The widget class for a demo.
+        :param dict demo_info: A dict of info about the demo to create
 
-        :returns: A ``QtGui.QStandardItemModel``
+        :raises: Any exception raised while importing or constructing the demo.
+        """
+
+        # the demo's package is imported here the first time it is needed
+        demo_class = demo_info["descriptor"].load()
+        widget = demo_class(parent=self)
+        with self._timing.span("apply_stylesheet: %s" % (demo_info["display_name"],)):
+            self._apply_external_styleshet(widget, demo_info["directory"])
+
+        # bring the demo back to where the user left it if it was destroyed
+        demo_name = demo_info["display_name"]
+        snapshot = self._demo_state_lookup.pop(demo_name, None)
+        if snapshot:
+            snapshot.restore(widget)
+
+        self._demo_widget_tab.addWidget(widget)
+        self._demo_stack_lookup[demo_name] = widget
+
+    def _evict_demos(self):
         """
+        Destroy the least recently displayed demos beyond the live demo limit.
+
+        A snapshot of each destroyed demo's state is kept so that the demo can
+        be restored if the user displays it again.
+        """
+
+        if not self._max_live_demos or self._max_live_demos < 1:
+            # no limit
+            return
+
+        current_widget = self._demo_widget_tab.currentWidget()
+
+        while len(self._demo_stack_lookup) > self._max_live_demos:
+            demo_name, widget = next(iter(self._demo_stack_lookup.items()))
+            if widget == current_widget:
+                break
+
+            logger.debug("Destroying least recently used demo '%s'." % (demo_name,))
+
+            del self._demo_stack_lookup[demo_name]
+            self._demo_state_lookup[demo_name] = DemoStateSnapshot(widget)
+
+            try:
+                widget.destroy()
+            except Exception:
+                logger.exception("Error destroying demo '%s'." % (demo_name,))
 
-        # the parent directory of the supplied class
-        demo_dir = os.path.dirname(inspect.getfile(demo_class))
+            self._demo_widget_tab.removeWidget(widget)
+            widget.deleteLater()
+
+    def _prewarm_demos(self):
+        """
+        Construct the demos the user is most likely to open next.
+
+        This is a generator run by the idle scheduler: each step does a single
+        piece of work (import, construction or file model) for a single demo.
+        Demos that fail to load are skipped; the error will be displayed if
+        the user opens the demo.
+        """
+
+        demo_infos = {}
+        for demo_info in self._demo_info_lookup.values():
+            demo_infos.setdefault(demo_info["descriptor"], demo_info)
+        demos = self._usage_history.rank(list(demo_infos.keys()))
+
+        for demo in demos[: self.PREWARM_COUNT]:
+            demo_info = demo_infos[demo]
+            demo_name = demo_info["display_name"]
+
+            if not demo.is_loaded:
+                try:
+                    demo.load()
+                except Exception:
+                    logger.debug("Unable to prewarm demo %s." % (demo,))
+                    continue
+                yield
+
+            # never destroy a demo to make room for one that is only likely
+            # to be displayed
+            live_demos_full = (
+                self._max_live_demos
+                and len(self._demo_stack_lookup) >= self._max_live_demos
+            )
+
+            if demo_name not in self._demo_stack_lookup and not live_demos_full:
+                try:
+                    self._create_demo_widget(demo_info)
+                except Exception:
+                    logger.debug("Unable to prewarm demo %s." % (demo,))
+                    continue
+
+                # the user hasn't displayed it yet, so it is the first
+                # candidate for eviction
+                self._demo_stack_lookup.move_to_end(demo_name, last=False)
+                yield
+
+            demo_dir = demo_info["directory"]
+            if demo_dir not in self._demo_file_model_lookup:
+                file_model = self._get_file_model(demo_dir)
+                if file_model is not None:
+                    self._demo_file_model_lookup[demo_dir] = file_model
+                    yield
+
+    def _get_file_model(self, demo_dir):
+        """
+        Returns a file model for all python files in the demo directory.
+
+        The model is built from the source index, the file system isn't
+        accessed.
+
+        :param str demo_dir: The directory containing the demo's files.
+
+        :returns: A ``QtGui.QStandardItemModel``, or ``None`` if the files of
+            the demo haven't been indexed yet.
+        """
+
+        files = self._source_index.get_files(demo_dir)
+        if files is None:
+            return None
 
         # create a model to populate
         model = QtGui.QStandardItemModel()
         parent = model.invisibleRootItem()
+        icon = QtGui.QIcon(":/tk_multi_demo/file.png")
 
-        # walk the directory and construct file paths
-        for root, dirs, files in os.walk(demo_dir):
-            for file_path in files:
+        # the paths are relative to the demo directory
+        for display in files:
 
-                # we only display the python files for now
-                if file_path.endswith(".py") or file_path.endswith(".qss"):
+            # create the item for display
+            item = QtGui.QStandardItem(display)
+            item.setIcon(icon)
 
-                    # display a path relative to the demo directory
-                    display = os.path.join(root[len(demo_dir) + 1 :], file_path)
+            # remember the full path for later retrieval
+            item.setData(os.path.join(demo_dir, display))
 
-                    # create the item for display
-                    item = QtGui.QStandardItem(display)
-                    item.setIcon(QtGui.QIcon(":/tk_multi_demo/file.png"))
+            # add the item to the model
+            parent.appendRow(item)
 
-                    # remember the full path for later retrieval
-                    item.setData(os.path.join(root, file_path))
+        return model
 
-                    # add the item to the model
-                    parent.appendRow(item)
+    def _on_demo_files_changed(self, demo_dir):
+        """
+        Refresh the file model of a demo whose files have been (re)indexed.
 
-        return model
+        :param str demo_dir: The directory containing the demo's files.
+        """
+
+        # the model is built again the next time the demo is displayed. keep a
+        # reference until the combo no longer uses it
+        old_model = self._demo_file_model_lookup.pop(demo_dir, None)
+
+        if self._current_demo_info and self._current_demo_info["directory"] == demo_dir:
+            # keep displaying the same file if it still exists
+            self._show_demo_files(self._demo_file_combo.currentText())
+
+        del old_model
 
     def _on_file_selected(self, index):
         """
@@ -333,14 +639,147 @@ class DemoWidget(QtGui.QSplitter):
 
         # extract the full path to the file
         full_path = item.data()
+        self._code_path = full_path
 
-        # open an display the contents in the edit widget
-        fh = open(full_path)
-        try:
-            python_script = "".join(fh.readlines())
-            self._demo_code_edit.setPlainText(python_script)
-        finally:
-            fh.close()
+        # display the document right away if it is cached. otherwise it will be
+        # displayed once the file has been read
+        document = self._code_cache.get_document(full_path)
+        if document is not None:
+            self._set_code_document(document)
+
+    def _on_code_document_ready(self, path, document):
+        """
+        Display the document of a file that has been read in the background.
+
+        :param str path: The full path to the file.
+        :param document: The ``QtGui.QTextDocument`` for the file.
+        """
+
+        # the user may have selected another file in the meantime
+        if path == self._code_path:
+            self._set_code_document(document)
+
+    def _set_code_document(self, document):
+        """
+        Display a document in the code editor.
+
+        :param document: The ``QtGui.QTextDocument`` to display.
+        """
+
+        self._demo_code_edit.setDocument(document)
+
+        # scroll to the search result being displayed
+        if self._code_jump and self._code_jump[0] == self._code_path:
+            line_number = self._code_jump[1]
+            self._code_jump = None
+
+            cursor = QtGui.QTextCursor(document.findBlockByNumber(line_number - 1))
+            cursor.select(QtGui.QTextCursor.LineUnderCursor)
+            self._demo_code_edit.setTextCursor(cursor)
+            self._demo_code_edit.centerCursor()
+
+        self._highlight_visible_code()
+
+    def _search_code(self):
+        """
+        Search the code of all the demos for the text in the search box.
+        """
+
+        query = self._code_search_edit.text().strip()
+
+        self._code_search_results.clear()
+        if not query:
+            self._code_search_results.hide()
+            return
+
+        for path, line_number, line in self._code_search_indexer.search(query):
+            demo_info = self._get_demo_info_for_path(path)
+            if demo_info is None:
+                continue
+
+            file_name = os.path.relpath(path, demo_info["directory"])
+            item = QtGui.QListWidgetItem(
+                "%s - %s:%d    %s"
+                % (demo_info["display_name"], file_name, line_number, line.strip())
+            )
+            item.setData(QtCore.Qt.UserRole, path)
+            item.setData(QtCore.Qt.UserRole + 1, line_number)
+            self._code_search_results.addItem(item)
+
+        if not self._code_search_results.count():
+            self._code_search_results.addItem("No matches")
+
+        self._code_search_results.show()
+
+    def _on_code_search_result_activated(self, item):
+        """
+        Display the demo file and line of a search result.
+
+        :param item: The ``QtGui.QListWidgetItem`` of the result.
+        """
+
+        path = item.data(QtCore.Qt.UserRole)
+        line_number = item.data(QtCore.Qt.UserRole + 1)
+        if not path:
+            return
+
+        demo_info = self._get_demo_info_for_path(path)
+        if demo_info is None:
+            return
+
+        self._code_jump = (path, line_number)
+
+        # select the demo in the tree, which displays it
+        if (
+            not self._current_demo_info
+            or self._current_demo_info["directory"] != demo_info["directory"]
+        ):
+            items = self._demo_model.findItems(
+                demo_info["display_name"],
+                QtCore.Qt.MatchExactly | QtCore.Qt.MatchRecursive,
+            )
+            if items:
+                index = items[0].index()
+                self._demo_tree_view.selectionModel().select(
+                    index, QtGui.QItemSelectionModel.ClearAndSelect
+                )
+                self._demo_tree_view.scrollTo(index)
+
+        # display the file in the code tab
+        self._demo_tabs.setCurrentIndex(self._demo_tabs.indexOf(self._demo_code_widget))
+        self._show_demo_files(os.path.relpath(path, demo_info["directory"]))
+
+    def _get_demo_info_for_path(self, path):
+        """
+        Returns the info of the demo a source file belongs to.
+
+        :param str path: The full path to the file.
+
+        :returns: A dict of info about the demo, or ``None`` if the file doesn't
+            belong to a demo.
+        """
+
+        for demo_info in self._demo_info_lookup.values():
+            if path.startswith(demo_info["directory"] + os.sep):
+                return demo_info
+        return None
+
+    def _highlight_visible_code(self):
+        """
+        Highlight the blocks visible in the code editor ahead of the others,
+        for documents highlighted progressively.
+        """
+
+        code_edit = self._demo_code_edit
+        highlighter = get_highlighter(code_edit.document())
+        if not isinstance(highlighter, SpanSyntaxHighlighter):
+            return
+
+        bottom_left = QtCore.QPoint(0, code_edit.viewport().height())
+        highlighter.highlight_blocks(
+            code_edit.firstVisibleBlock().blockNumber(),
+            code_edit.cursorForPosition(bottom_left).blockNumber(),
+        )
 
     def _on_selection_changed(self, selected, deselected):
         """
@@ -359,7 +798,9 @@ class DemoWidget(QtGui.QSplitter):
             index = selected.indexes()[0]
             item = self._demo_tree_view.model().itemFromIndex(index)
             if item.text() in self._demo_info_lookup:
-                self.set_demo(self._demo_info_lookup[item.text()])
+                demo_info = self._demo_info_lookup[item.text()]
+                self._usage_history.record(demo_info["descriptor"])
+                self.set_demo(demo_info)
             else:
                 # couldn't find the demo, just show the default
                 self._set_default_demo()
@@ -375,9 +816,9 @@ class DemoWidget(QtGui.QSplitter):
         model = QtGui.QStandardItemModel()
         parent = model.invisibleRootItem()
 
-        # this is just a list of group names and demo classes to build a
+        # this is just a list of group names and demo descriptors to build a
         # model from. the strings represent the headers/parents in the model.
-        # each time one is encountered, parent subsequent demo class items
+        # each time one is encountered, parent subsequent demo items
         # underneath it in the model
         for d in DEMOS_LIST:
 
@@ -393,22 +834,23 @@ class DemoWidget(QtGui.QSplitter):
                 group_item.setForeground(self.palette().light().color())
                 model.invisibleRootItem().appendRow(group_item)
 
-                # this is now the parent for subsequent demo class items
+                # this is now the parent for subsequent demo items
                 parent = group_item
 
-            # this is a demo class
-            elif issubclass(d, QtGui.QWidget):
+            # this is a demo. it is described without importing it
+            elif isinstance(d, DemoDescriptor):
 
-                # get the info for the class to add to the lookup
-                demo_class = d
-                demo_info = self._get_demo_info(demo_class)
+                # get the info for the demo to add to the lookup
+                demo = d
+                with self._timing.span("get_demo_info: %s" % (demo.package_name,)):
+                    demo_info = self._get_demo_info(demo)
 
                 # oops, likely no `demo.yml` for this demo
                 if not demo_info:
                     continue
 
                 # keep note of this info if this is the default demo
-                if demo_class == DEMO_DEFAULT:
+                if demo == DEMO_DEFAULT:
                     self._default_demo_info = demo_info
 
                 # add to the lookup
@@ -428,65 +870,20 @@ class DemoWidget(QtGui.QSplitter):
 
         return model
 
-    def _get_demo_info(self, demo_class):
+    def _get_demo_info(self, demo):
         """
-        Given a demo class, parse the ``demo.yml`` file for more info.
+        Given a demo descriptor, return the info from its ``demo.yml`` file.
 
-        :param demo_class: The demo ``QtGui.QWidget`` subclass
-
-        :returns: A dict of info about the demo class.
-        """
+        The info comes from the manifest index, which only parses the manifest
+        when it changed since the index was written. The demo's package is not
+        imported to do this.
 
-        # read the demo.yml file from the demo_class's directory
-        demo_dir = os.path.dirname(inspect.getfile(demo_class))
+        :param demo: The :class:`DemoDescriptor` for the demo
 
-        # construct the full path to the manifest
-        manifest = os.path.join(demo_dir, "demo.yml")
-
-        if not os.path.exists:
-            # no path fo the manifest
-            logger.error(
-                "No manifest file exists for this demo class: %s." % (demo_class,)
-            )
-            return None
-
-        # attempt to read the manifest file
-        try:
-            fh = open(manifest, "r")
-        except Exception as e:
-            logger.error(
-                "Could not open demo manifest file '%s'.\n"
-                " Error reported: '%s'" % (manifest, e)
-            )
-            return None
-
-        # now try to parse it
-        try:
-            demo_info = yaml.load(fh, Loader=yaml.FullLoader)
-        except Exception as e:
-            logger.error(
-                "Could not parse demo manifest file '%s'.\n"
-                " Error reported: '%s'" % (manifest, e)
-            )
-            return None
-        finally:
-            fh.close()
-
-        # make sure the required fields are present
-        for field in ["display_name", "description", "documentation_url"]:
-            if field not in demo_info:
-                logger.error(
-                    "The `%s` field is missing from the demo "
-                    "manifest file: %s." % (field, manifest)
-                )
-                return None
-
-        # add the directory and class in there as well so that we have one stop
-        # shopping for all the demo information
-        demo_info["widget_class"] = demo_class
-        demo_info["directory"] = demo_dir
+        :returns: A dict of info about the demo.
+        """
 
-        return demo_info
+        return self._manifest_index.get_demo_info(demo)
 
     def _set_default_demo(self):
         """
@@ -512,7 +909,7 @@ class DemoWidget(QtGui.QSplitter):
                 )
                 qss_data = f.read()
                 # resolve tokens
-                qss_data = self._resolve_sg_stylesheet_tokens(qss_data)
+                qss_data = self._stylesheet_compiler.compile(qss_data)
                 # apply to widget (and all its children)
                 widget.setStyleSheet(qss_data)
             except Exception as e:
@@ -525,20 +922,3 @@ class DemoWidget(QtGui.QSplitter):
         except IOError:
             # The file didn't exist, so nothing to do.
             pass
-
-    def _resolve_sg_stylesheet_tokens(self, style_sheet):
-        """
-        Given a string containing a qt style sheet,
-        perform replacements of key toolkit tokens.
-
-        For example, "{{SG_HIGHLIGHT_COLOR}}" is converted to "#30A7E3"
-
-        :param style_sheet: Stylesheet string to process
-        :returns: Stylesheet string with replacements applied
-        """
-        processed_style_sheet = style_sheet
-        for token, value in constants.SG_STYLESHEET_CONSTANTS.items():
-            processed_style_sheet = processed_style_sheet.replace(
-                "{{%s}}" % token, value
-            )
-        return processed_style_sheet
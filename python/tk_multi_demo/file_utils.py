@@ -0,0 +1,43 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+
+
+def write_file_atomically(path, content):
+    """
+    Write a file to a temp file next to it and swap it in, so that a concurrent
+    reader never sees a partially written file. The directory of the file is
+    created if it doesn't exist.
+
+    :param str path: The full path to the file.
+    :param content: The ``str`` or ``bytes`` content of the file.
+
+    :raises: The error raised writing the file. The temp file is removed first.
+    """
+
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    mode = "wb" if isinstance(content, bytes) else "w"
+
+    file_dir = os.path.dirname(path)
+    if not os.path.exists(file_dir):
+        os.makedirs(file_dir)
+
+    try:
+        with open(tmp_path, mode) as fh:
+            fh.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        # don't leave a partially written temp file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
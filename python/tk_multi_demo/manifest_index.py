@@ -0,0 +1,180 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import os
+
+import sgtk
+
+# for reading each demo's demo.yml file
+from tank_vendor import yaml
+
+from .file_utils import write_file_atomically
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class DemoManifestIndex(object):
+    """
+    An index of the information parsed from every demo's ``demo.yml`` file.
+
+    The index is stored as a single json file so that the demo tree can be
+    built with one read at startup. Each entry remembers the modification time
+    of the manifest it was parsed from. The manifest is only parsed again when
+    it has changed on disk, and the index is then rewritten by :meth:`save`.
+    """
+
+    # bump this whenever the format of the stored index changes
+    VERSION = 1
+
+    # the fields each manifest must provide
+    REQUIRED_FIELDS = ["display_name", "description", "documentation_url"]
+
+    def __init__(self, index_path):
+        """
+        Initialize the index.
+
+        :param str index_path: The path to the json file the index is stored in.
+        """
+
+        self._index_path = index_path
+        self._entries = self._read()
+        self._dirty = False
+
+    def get_demo_info(self, demo):
+        """
+        Returns the info from the manifest of the supplied demo.
+
+        The info is returned from the index when it is up to date with the
+        manifest file. Otherwise the manifest is parsed and the index updated.
+
+        :param demo: The :class:`DemoDescriptor` for the demo
+
+        :returns: A dict of info about the demo, or ``None`` if the manifest
+            could not be read.
+        """
+
+        manifest = demo.manifest
+
+        try:
+            mtime = os.path.getmtime(manifest)
+        except OSError:
+            # no path fo the manifest
+            logger.error("No manifest file exists for this demo: %s." % (demo,))
+            return None
+
+        entry = self._entries.get(demo.package_name)
+        if entry and entry["mtime"] == mtime:
+            demo_info = dict(entry["info"])
+        else:
+            demo_info = self._parse_manifest(manifest)
+            if not demo_info:
+                return None
+
+            self._entries[demo.package_name] = {"mtime": mtime, "info": demo_info}
+            self._dirty = True
+            demo_info = dict(demo_info)
+
+        # add the directory and descriptor in there as well so that we have one
+        # stop shopping for all the demo information
+        demo_info["descriptor"] = demo
+        demo_info["directory"] = demo.directory
+
+        return demo_info
+
+    def save(self):
+        """
+        Write the index to disk if any of its entries were updated.
+        """
+
+        if not self._dirty:
+            return
+
+        data = {"version": self.VERSION, "entries": self._entries}
+
+        try:
+            write_file_atomically(self._index_path, json.dumps(data))
+        except Exception as e:
+            logger.warning(
+                "Could not write demo manifest index '%s': %s" % (self._index_path, e)
+            )
+            return
+
+        self._dirty = False
+
+    def _read(self):
+        """
+        Read the stored index entries.
+
+        :returns: A dict of index entries keyed by demo package name. The dict
+            is empty if there is no valid index on disk.
+        """
+
+        try:
+            with open(self._index_path, "r") as fh:
+                data = json.load(fh)
+        except (IOError, OSError):
+            # no index yet. it will be built as manifests are parsed
+            return {}
+        except Exception as e:
+            logger.warning(
+                "Ignoring unreadable demo manifest index '%s': %s"
+                % (self._index_path, e)
+            )
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+
+        return data.get("entries", {})
+
+    def _parse_manifest(self, manifest):
+        """
+        Parse a ``demo.yml`` manifest file.
+
+        :param str manifest: The full path to the manifest file.
+
+        :returns: A dict of info about the demo, or ``None`` if the manifest
+            could not be read or is missing required fields.
+        """
+
+        # attempt to read the manifest file
+        try:
+            fh = open(manifest, "r")
+        except Exception as e:
+            logger.error(
+                "Could not open demo manifest file '%s'.\n"
+                " Error reported: '%s'" % (manifest, e)
+            )
+            return None
+
+        # now try to parse it
+        try:
+            demo_info = yaml.load(fh, Loader=yaml.FullLoader)
+        except Exception as e:
+            logger.error(
+                "Could not parse demo manifest file '%s'.\n"
+                " Error reported: '%s'" % (manifest, e)
+            )
+            return None
+        finally:
+            fh.close()
+
+        # make sure the required fields are present
+        for field in self.REQUIRED_FIELDS:
+            if field not in demo_info:
+                logger.error(
+                    "The `%s` field is missing from the demo "
+                    "manifest file: %s." % (field, manifest)
+                )
+                return None
+
+        return demo_info
@@ -0,0 +1,227 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import time
+
+import sgtk
+from sgtk.platform.qt import QtCore
+
+from .file_utils import write_file_atomically
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class DemoUsageHistory(object):
+    """
+    Remembers how often and how recently each demo was opened by the user.
+
+    The history is stored locally as a json file and is used to rank the demos
+    most likely to be opened next.
+    """
+
+    def __init__(self, history_path):
+        """
+        Initialize the history.
+
+        :param str history_path: The path to the json file the history is
+            stored in.
+        """
+
+        self._history_path = history_path
+        self._history = self._read()
+        self._dirty = False
+
+    def record(self, demo):
+        """
+        Record that a demo was opened by the user, and write the history to
+        disk so that it isn't lost if the app doesn't exit cleanly.
+
+        :param demo: The :class:`DemoDescriptor` for the demo
+        """
+
+        usage = self._history.setdefault(
+            demo.package_name, {"count": 0, "last_used": 0}
+        )
+        usage["count"] += 1
+        usage["last_used"] = time.time()
+        self._dirty = True
+
+        self.save()
+
+    def rank(self, demos):
+        """
+        Sort the supplied demos by how likely they are to be opened next.
+
+        The most frequently used demos come first, most recent first when they
+        were used equally often. Demos with no history keep their order at the
+        end of the list.
+
+        :param list demos: A list of :class:`DemoDescriptor` objects.
+
+        :returns: A new, sorted list of :class:`DemoDescriptor` objects.
+        """
+
+        def _usage_key(demo):
+            usage = self._history.get(demo.package_name, {})
+            return (-usage.get("count", 0), -usage.get("last_used", 0))
+
+        # sorted() is stable, so unused demos stay in their original order
+        return sorted(demos, key=_usage_key)
+
+    def save(self):
+        """
+        Write the history to disk if it changed.
+        """
+
+        if not self._dirty:
+            return
+
+        try:
+            write_file_atomically(self._history_path, json.dumps(self._history))
+        except Exception as e:
+            logger.warning(
+                "Could not write demo usage history '%s': %s" % (self._history_path, e)
+            )
+            return
+
+        self._dirty = False
+
+    def _read(self):
+        """
+        Read the stored history.
+
+        :returns: A dict of usage info keyed by demo package name.
+        """
+
+        try:
+            with open(self._history_path, "r") as fh:
+                history = json.load(fh)
+        except (IOError, OSError):
+            return {}
+        except Exception as e:
+            logger.warning(
+                "Ignoring unreadable demo usage history '%s': %s"
+                % (self._history_path, e)
+            )
+            return {}
+
+        if not isinstance(history, dict):
+            return {}
+
+        return history
+
+
+class IdleScheduler(QtCore.QObject):
+    """
+    Runs work in small steps while the user is not interacting with the app.
+
+    The work is supplied as a generator function. Each step of the generator
+    should do a small amount of work and then ``yield``. Steps are driven by
+    the Qt event loop once the app has been idle for :attr:`IDLE_DELAY`
+    milliseconds. Any mouse or keyboard input pauses the work immediately and
+    restarts the idle countdown, so the work never delays input handling.
+    """
+
+    # how long the app must be idle before work starts (ms)
+    IDLE_DELAY = 2000
+
+    # the pause between two consecutive steps, to let pending events through (ms)
+    STEP_INTERVAL = 20
+
+    # the events that indicate the user is interacting with the app
+    INTERACTION_EVENTS = (
+        QtCore.QEvent.KeyPress,
+        QtCore.QEvent.MouseButtonPress,
+        QtCore.QEvent.MouseButtonDblClick,
+        QtCore.QEvent.Wheel,
+    )
+
+    def __init__(self, work_fn, parent=None):
+        """
+        Initialize the scheduler.
+
+        :param work_fn: A generator function doing the work one step at a time.
+        :param parent: The parent ``QtCore.QObject``.
+        """
+
+        super(IdleScheduler, self).__init__(parent)
+
+        self._work_fn = work_fn
+        self._work = None
+
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self._on_idle)
+
+        self._step_timer = QtCore.QTimer(self)
+        self._step_timer.setInterval(self.STEP_INTERVAL)
+        self._step_timer.timeout.connect(self._run_step)
+
+    def start(self):
+        """
+        Start the idle countdown. The work runs once the app is idle.
+        """
+
+        self._work = self._work_fn()
+        QtCore.QCoreApplication.instance().installEventFilter(self)
+        self._idle_timer.start(self.IDLE_DELAY)
+
+    def stop(self):
+        """
+        Stop the scheduler. Any remaining work is discarded.
+        """
+
+        self._idle_timer.stop()
+        self._step_timer.stop()
+        self._work = None
+
+        app = QtCore.QCoreApplication.instance()
+        if app:
+            app.removeEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        """
+        Pause the work whenever the user interacts with the app.
+
+        :param obj: The ``QtCore.QObject`` receiving the event.
+        :param event: The ``QtCore.QEvent`` being delivered.
+
+        :returns: ``False`` so that the event is always delivered.
+        """
+
+        if self._work is not None and event.type() in self.INTERACTION_EVENTS:
+            self._step_timer.stop()
+            self._idle_timer.start(self.IDLE_DELAY)
+
+        return False
+
+    def _on_idle(self):
+        """
+        The app has been idle long enough, start stepping through the work.
+        """
+
+        if self._work is not None:
+            self._step_timer.start()
+
+    def _run_step(self):
+        """
+        Run a single step of the work.
+        """
+
+        try:
+            next(self._work)
+        except StopIteration:
+            logger.debug("Idle work complete.")
+            self.stop()
+        except Exception:
+            logger.exception("Idle work failed.")
+            self.stop()
@@ -0,0 +1,207 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+
+import sgtk
+from sgtk.platform.qt import QtCore
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+# the extensions of the files displayed in the Code tab
+SOURCE_EXTENSIONS = (".py", ".qss")
+
+
+def _scan_demo_dirs(demo_dirs):
+    """
+    List the source files of the supplied demo directories. Runs in a
+    background thread.
+
+    :param list demo_dirs: The full paths to the demo directories.
+
+    :returns: A tuple of a dict holding the sorted list of source file paths,
+        relative to the demo directory, via demo directory, and of the list of
+        all the directories scanned.
+    """
+
+    files = {}
+    scanned_dirs = []
+
+    for demo_dir in demo_dirs:
+        demo_files = []
+        for root, dirs, file_names in os.walk(demo_dir):
+            # don't scan nor watch the bytecode caches, they are written
+            # when the demos are imported
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            scanned_dirs.append(root)
+            for file_name in file_names:
+                if file_name.endswith(SOURCE_EXTENSIONS):
+                    # the path relative to the demo directory
+                    demo_files.append(
+                        os.path.join(root[len(demo_dir) + 1 :], file_name)
+                    )
+        files[demo_dir] = sorted(demo_files)
+
+    return (files, scanned_dirs)
+
+
+class DemoSourceIndex(QtCore.QObject):
+    """
+    An index of the source files of every demo.
+
+    All the demo directories are scanned once by a background task. The
+    directories are then watched, and when one changes only the demo that owns
+    it is scanned again, also in the background.
+    """
+
+    # emitted when the files of a demo have been (re)indexed. the arg is the
+    # full path to the demo directory
+    demo_files_changed = QtCore.Signal(str)
+
+    def __init__(self, demos_dir, bg_task_manager, parent=None):
+        """
+        Initialize the index.
+
+        :param str demos_dir: The full path to the directory holding the demos.
+        :param bg_task_manager: The background task manager to scan with.
+        :param parent: The parent ``QtCore.QObject``.
+        """
+
+        super(DemoSourceIndex, self).__init__(parent)
+
+        self._demos_dir = demos_dir
+
+        # the list of relative source file paths via demo directory
+        self._files = {}
+
+        # the ids of the scan tasks in progress
+        self._pending_tasks = set()
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._bg_task_manager = bg_task_manager
+        self._bg_task_manager.task_completed.connect(self._on_task_completed)
+        self._bg_task_manager.task_failed.connect(self._on_task_failed)
+
+    def scan(self):
+        """
+        Scan all the demo directories in the background.
+        """
+
+        demo_dirs = []
+        for name in os.listdir(self._demos_dir):
+            path = os.path.join(self._demos_dir, name)
+            if os.path.isdir(path) and not name.startswith("__"):
+                demo_dirs.append(path)
+
+        self._scan(demo_dirs)
+
+    def get_files(self, demo_dir):
+        """
+        Returns the source files of a demo.
+
+        :param str demo_dir: The full path to the demo directory.
+
+        :returns: A sorted list of source file paths relative to the demo
+            directory, or ``None`` if the demo hasn't been indexed yet.
+        """
+
+        return self._files.get(demo_dir)
+
+    def get_all_files(self):
+        """
+        Returns the source files of all the demos indexed so far.
+
+        :returns: A list of full paths.
+        """
+
+        return [
+            os.path.join(demo_dir, path)
+            for demo_dir, demo_files in self._files.items()
+            for path in demo_files
+        ]
+
+    def _scan(self, demo_dirs):
+        """
+        Scan the supplied demo directories in the background.
+        """
+
+        task_id = self._bg_task_manager.add_task(
+            _scan_demo_dirs, task_kwargs={"demo_dirs": demo_dirs}
+        )
+        self._pending_tasks.add(task_id)
+
+    def _on_directory_changed(self, path):
+        """
+        Scan the demo owning a directory that changed.
+
+        :param str path: The full path of the directory that changed.
+        """
+
+        relative_path = os.path.relpath(path, self._demos_dir)
+        demo_name = relative_path.split(os.sep)[0]
+        demo_dir = os.path.join(self._demos_dir, demo_name)
+
+        if demo_name == os.curdir:
+            # a demo was added or removed
+            self.scan()
+        elif os.path.isdir(demo_dir):
+            self._scan([demo_dir])
+        elif self._files.pop(demo_dir, None) is not None:
+            self.demo_files_changed.emit(demo_dir)
+
+    def _on_task_completed(self, uid, group, result):
+        """
+        Update the index with the result of a scan.
+
+        :param uid: The id of the task that completed.
+        :param group: The group of the task.
+        :param result: The result of :func:`_scan_demo_dirs`.
+        """
+
+        if uid not in self._pending_tasks:
+            return
+        self._pending_tasks.remove(uid)
+
+        files, scanned_dirs = result
+
+        # watch the demos directory for demos being added/removed, and every
+        # directory of the scanned demos for files being added/removed
+        watched = set(self._watcher.directories())
+        new_dirs = [
+            path
+            for path in [self._demos_dir] + scanned_dirs
+            if path not in watched and os.path.isdir(path)
+        ]
+        if new_dirs:
+            self._watcher.addPaths(new_dirs)
+
+        for demo_dir, demo_files in files.items():
+            if self._files.get(demo_dir) != demo_files:
+                self._files[demo_dir] = demo_files
+                self.demo_files_changed.emit(demo_dir)
+
+    def _on_task_failed(self, uid, group, msg, stack_trace):
+        """
+        Report a scan that failed.
+
+        :param uid: The id of the task that failed.
+        :param group: The group of the task.
+        :param msg: The error message.
+        :param stack_trace: The stack trace of the error.
+        """
+
+        if uid not in self._pending_tasks:
+            return
+        self._pending_tasks.remove(uid)
+
+        logger.warning("Could not scan the demo source files: %s" % (msg,))
@@ -0,0 +1,144 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import hashlib
+import os
+
+import sgtk
+
+from . import syntax_tokenizer
+from .file_utils import write_file_atomically
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class SpanCache(object):
+    """
+    A disk cache of the highlighting spans of source files.
+
+    Each :class:`.syntax_tokenizer.SpanTable` is stored in its own file, named
+    after a hash of the source it was computed from and of the tokenizer
+    version, so a file edited or a tokenizer updated simply misses the cache.
+    Reading an entry refreshes its modification time, and the least recently
+    used entries are deleted once the cache grows over its size limit.
+
+    The cache is used from background threads: it doesn't depend on Qt, and
+    entries are written atomically.
+    """
+
+    # the extension of the cache entries
+    EXTENSION = ".spans"
+
+    def __init__(self, cache_dir, max_size=8 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        :param str cache_dir: The directory to store the spans in.
+        :param int max_size: The maximum size of the cache, in bytes.
+        """
+
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+    def get_spans(self, text):
+        """
+        Returns the cached spans of a source.
+
+        :param str text: The source.
+
+        :returns: A :class:`.syntax_tokenizer.SpanTable`, or ``None`` if the
+            spans of the source aren't cached.
+        """
+
+        path = self._get_path(text)
+
+        try:
+            with open(path, "rb") as fh:
+                spans = syntax_tokenizer.SpanTable.from_bytes(fh.read())
+        except (IOError, OSError):
+            # not cached
+            return None
+        except ValueError as e:
+            logger.debug("Ignoring invalid span cache entry '%s': %s" % (path, e))
+            return None
+
+        # the entry has just been used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return spans
+
+    def set_spans(self, text, spans):
+        """
+        Store the spans of a source, and evict the least recently used entries
+        if the cache is full.
+
+        :param str text: The source.
+        :param spans: The :class:`.syntax_tokenizer.SpanTable` of the source.
+        """
+
+        path = self._get_path(text)
+
+        try:
+            write_file_atomically(path, spans.to_bytes())
+        except Exception as e:
+            logger.warning("Could not write span cache entry '%s': %s" % (path, e))
+            return
+
+        self._evict()
+
+    def _get_path(self, text):
+        """
+        Returns the path of the cache entry for a source.
+        """
+
+        digest = hashlib.sha1(
+            ("%d:" % (syntax_tokenizer.VERSION,)).encode("utf-8")
+            + text.encode("utf-8", "surrogatepass")
+        ).hexdigest()
+        return os.path.join(self._cache_dir, digest + self.EXTENSION)
+
+    def _evict(self):
+        """
+        Delete the least recently used entries until the cache fits its size
+        limit.
+        """
+
+        entries = []
+        total_size = 0
+        for name in os.listdir(self._cache_dir):
+            if not name.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self._cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # deleted by another thread
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        if total_size <= self._max_size:
+            return
+
+        # oldest first
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                # deleted by another thread
+                pass
+            total_size -= size
+            if total_size <= self._max_size:
+                break
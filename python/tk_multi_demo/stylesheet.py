@@ -0,0 +1,137 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import hashlib
+import json
+import re
+
+import sgtk
+
+from .file_utils import write_file_atomically
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class StylesheetCompiler(object):
+    """
+    Resolves the toolkit tokens in qt style sheets, e.g. ``{{SG_HIGHLIGHT_COLOR}}``
+    is converted to ``#30A7E3``.
+
+    All the tokens of a style sheet are resolved in a single pass. Resolved
+    style sheets are cached in memory and in a json file, keyed by a hash of
+    the style sheet's contents. The file also records a hash of the token
+    values, and its entries are discarded when the values change, so each
+    distinct style sheet is only resolved once.
+    """
+
+    # bump this whenever the format of the stored cache changes
+    VERSION = 1
+
+    # matches a token, capturing its name
+    TOKEN_REGEX = re.compile(r"\{\{(\w+)\}\}")
+
+    def __init__(self, cache_path, tokens):
+        """
+        Initialize the compiler.
+
+        :param str cache_path: The path to the json file the resolved style
+            sheets are stored in.
+        :param dict tokens: The value of each token via token name.
+        """
+
+        self._cache_path = cache_path
+        self._tokens = dict(tokens)
+        self._tokens_hash = hashlib.sha1(
+            json.dumps(self._tokens, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        self._entries = self._read()
+        self._dirty = False
+
+    def compile(self, style_sheet):
+        """
+        Returns the supplied style sheet with its tokens resolved.
+
+        Unknown tokens are left as they are.
+
+        :param str style_sheet: Stylesheet string to process
+        :returns: Stylesheet string with replacements applied
+        """
+
+        key = hashlib.sha1(style_sheet.encode("utf-8")).hexdigest()
+
+        resolved = self._entries.get(key)
+        if resolved is None:
+            resolved = self.TOKEN_REGEX.sub(self._resolve_token, style_sheet)
+            self._entries[key] = resolved
+            self._dirty = True
+
+        return resolved
+
+    def save(self):
+        """
+        Write the resolved style sheets to disk if any were added.
+        """
+
+        if not self._dirty:
+            return
+
+        data = {
+            "version": self.VERSION,
+            "tokens_hash": self._tokens_hash,
+            "entries": self._entries,
+        }
+
+        try:
+            write_file_atomically(self._cache_path, json.dumps(data))
+        except Exception as e:
+            logger.warning(
+                "Could not write style sheet cache '%s': %s" % (self._cache_path, e)
+            )
+            return
+
+        self._dirty = False
+
+    def _resolve_token(self, match):
+        """
+        Returns the value of the token matched by :attr:`TOKEN_REGEX`.
+        """
+        return self._tokens.get(match.group(1), match.group(0))
+
+    def _read(self):
+        """
+        Read the stored style sheets.
+
+        :returns: A dict of resolved style sheets keyed by the hash of the
+            unresolved style sheet. The dict is empty if there is no valid cache
+            for the current token values on disk.
+        """
+
+        try:
+            with open(self._cache_path, "r") as fh:
+                data = json.load(fh)
+        except (IOError, OSError):
+            # no cache yet. it will be written once style sheets are resolved
+            return {}
+        except Exception as e:
+            logger.warning(
+                "Ignoring unreadable style sheet cache '%s': %s" % (self._cache_path, e)
+            )
+            return {}
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.VERSION
+            or data.get("tokens_hash") != self._tokens_hash
+        ):
+            return {}
+
+        return data.get("entries", {})
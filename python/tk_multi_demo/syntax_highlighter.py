@@ -8,10 +8,13 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import keyword as py_keywords
+import collections
+import time
 
 from sgtk.platform.qt import QtCore, QtGui
 
+from . import syntax_tokenizer
+
 # based on: https://wiki.python.org/moin/PyQt/Python%20syntax%20highlighting
 # TODO: this is the same code as the tk-multi-pythonconsole. need to consolidate
 
@@ -29,249 +32,311 @@ def _format(color, style=""):
     return _format
 
 
+# the formats of each style via the palette colors they are made from, shared
+# by all the highlighters. from the least to the most recently used
+_formats_by_palette = collections.OrderedDict()
+
+# the number of palettes to keep the formats of
+MAX_PALETTES = 4
+
+
+def get_formats(palette):
+    """
+    Returns the formats to highlight code with for a palette.
+
+    The formats are created the first time a palette is used and shared by
+    all the highlighters using a palette with the same colors. The formats of
+    the :data:`MAX_PALETTES` most recently used palettes are kept.
+
+    :param palette: A ``QtGui.QPalette``.
+
+    :returns: A list of ``QtGui.QTextCharFormat``, in style id order.
+    """
+
+    key = (
+        palette.windowText().color().rgba(),
+        palette.highlight().color().rgba(),
+        palette.base().color().rgba(),
+    )
+
+    formats = _formats_by_palette.get(key)
+    if formats is not None:
+        _formats_by_palette.move_to_end(key)
+        return formats
+
+    styles = _create_styles(palette)
+    formats = [styles[style] for style in syntax_tokenizer.STYLES]
+    _formats_by_palette[key] = formats
+
+    # forget about the formats of the least recently used palettes
+    while len(_formats_by_palette) > MAX_PALETTES:
+        _formats_by_palette.popitem(last=False)
+
+    return formats
+
+
+def get_highlighter(document):
+    """
+    Returns the highlighter of a document.
+
+    :param document: A ``QtGui.QTextDocument``.
+
+    :returns: The :class:`PythonSyntaxHighlighter` attached to the document, or
+        ``None`` if it isn't highlighted.
+    """
+
+    highlighter = document.findChild(QtGui.QSyntaxHighlighter)
+    if isinstance(highlighter, PythonSyntaxHighlighter):
+        return highlighter
+    return None
+
+
+def _create_styles(palette):
+    """Return the format of each style for a palette, via style name."""
+
+    text = palette.windowText().color()
+
+    styles = {
+        "keyword": _format(
+            colorize(text, 3, QtGui.QColor(0, 0, 255), 1),
+            style="",
+        ),
+        "builtin": _format(
+            colorize(text, 3, QtGui.QColor(0, 255, 0), 1),
+            style="",
+        ),
+        "operator": _format(
+            colorize(text, 4, palette.highlight().color(), 2),
+            style="",
+        ),
+        "brace": _format(
+            colorize(text, 2, palette.base().color(), 1),
+            style="bold",
+        ),
+        "defclass": _format(
+            colorize(text, 3, QtGui.QColor(255, 0, 0), 1),
+            style="bold",
+        ),
+        "string": _format(
+            colorize(text, 2, palette.highlight().color(), 1),
+            style="bold",
+        ),
+        "string2": _format(
+            colorize(text, 1, palette.base().color(), 1),
+            style="",
+        ),
+        "comment": _format(
+            colorize(text, 1, palette.base().color(), 2),
+            style="italic",
+        ),
+        "self": _format(
+            colorize(text, 1, QtGui.QColor(127, 127, 127), 1),
+            style="",
+        ),
+        "numbers": _format(
+            colorize(text, 3, QtGui.QColor(127, 127, 127), 1),
+            style="",
+        ),
+    }
+
+    return styles
+
+
 class PythonSyntaxHighlighter(QtGui.QSyntaxHighlighter):
-    """Syntax highlighter for the Python language."""
+    """
+    Syntax highlighter for the Python language.
+
+    Each block is tokenized in a single pass by :mod:`.syntax_tokenizer`, and
+    the format of each style is applied to the resulting spans.
+    """
 
     # Python keywords
-    keywords = py_keywords.kwlist
+    keywords = syntax_tokenizer.KEYWORDS
 
     # Python builtins
-    builtins = dir(__builtins__)
-
-    # Python operators
-    operators = [
-        "=",
-        # Comparison
-        "==",
-        "!=",
-        "<",
-        "<=",
-        ">",
-        ">=",
-        # Arithmetic
-        r"\+",
-        "-",
-        r"\*",
-        "/",
-        "//",
-        r"\%",
-        r"\*\*",
-        # In-place
-        r"\+=",
-        "-=",
-        r"\*=",
-        "/=",
-        r"\%=",
-        # Bitwise
-        r"\^",
-        r"\|",
-        r"\&",
-        r"\~",
-        ">>",
-        "<<",
-    ]
-
-    # Python braces
-    braces = [r"\{", r"\}", r"\(", r"\)", r"\[", r"\]"]
+    builtins = syntax_tokenizer.BUILTINS
 
     def __init__(self, document, palette):
         QtGui.QSyntaxHighlighter.__init__(self, document)
 
         self._palette = palette
 
-        # Multi-line strings (expression, flag, style)
-        # FIXME: The triple-quotes in these two lines will mess up the
-        # syntax highlighting from this point onward
-        self.tri_single = (QtCore.QRegularExpression("'''"), 1, self._style("string2"))
-        self.tri_double = (QtCore.QRegularExpression('"""'), 2, self._style("string2"))
-
-        rules = []
-
-        # Keyword, operator, and brace rules
-        rules += [
-            (r"\b%s\b" % w, 0, self._style("keyword"))
-            for w in PythonSyntaxHighlighter.keywords
-        ]
-        rules += [
-            (r"\b%s\b" % w, 0, self._style("builtin"))
-            for w in PythonSyntaxHighlighter.builtins
-        ]
-        rules += [
-            (r"%s" % o, 0, self._style("operator"))
-            for o in PythonSyntaxHighlighter.operators
-        ]
-        rules += [
-            (r"%s" % b, 0, self._style("brace")) for b in PythonSyntaxHighlighter.braces
-        ]
-
-        # All other rules
-        rules += [
-            # 'self'
-            (r"\bself\b", 0, self._style("self")),
-            # Double-quoted string, possibly containing escape sequences
-            (r'"[^"\\]*(\\.[^"\\]*)*"', 0, self._style("string")),
-            # Single-quoted string, possibly containing escape sequences
-            (r"'[^'\\]*(\\.[^'\\]*)*'", 0, self._style("string")),
-            # 'def' followed by an identifier
-            (r"\bdef\b\s*(\w+)", 1, self._style("defclass")),
-            # 'class' followed by an identifier
-            (r"\bclass\b\s*(\w+)", 1, self._style("defclass")),
-            # From '#' until a newline
-            (r"#[^\n]*", 0, self._style("comment")),
-            # Numeric literals
-            (r"\b[+-]?[0-9]+[lL]?\b", 0, self._style("numbers")),
-            (r"\b[+-]?0[xX][0-9A-Fa-f]+[lL]?\b", 0, self._style("numbers")),
-            (
-                r"\b[+-]?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?\b",
-                0,
-                self._style("numbers"),
-            ),
-        ]
-
-        # Build a QtCore.QRegularExpression for each pattern
-        self.rules = [
-            (QtCore.QRegularExpression(pat), index, fmt) for (pat, index, fmt) in rules
-        ]
-
-    def _style(self, style_type):
-        palette = self._palette
-
-        styles = {
-            "keyword": _format(
-                colorize(palette.windowText().color(), 3, QtGui.QColor(0, 0, 255), 1),
-                style="",
-            ),
-            "builtin": _format(
-                colorize(palette.windowText().color(), 3, QtGui.QColor(0, 255, 0), 1),
-                style="",
-            ),
-            "operator": _format(
-                colorize(
-                    palette.windowText().color(), 4, palette.highlight().color(), 2
-                ),
-                style="",
-            ),
-            "brace": _format(
-                colorize(palette.windowText().color(), 2, palette.base().color(), 1),
-                style="bold",
-            ),
-            "defclass": _format(
-                colorize(palette.windowText().color(), 3, QtGui.QColor(255, 0, 0), 1),
-                style="bold",
-            ),
-            "string": _format(
-                colorize(
-                    palette.windowText().color(), 2, palette.highlight().color(), 1
-                ),
-                style="bold",
-            ),
-            "string2": _format(
-                colorize(palette.windowText().color(), 1, palette.base().color(), 1),
-                style="",
-            ),
-            "comment": _format(
-                colorize(palette.windowText().color(), 1, palette.base().color(), 2),
-                style="italic",
-            ),
-            "self": _format(
-                colorize(
-                    palette.windowText().color(), 1, QtGui.QColor(127, 127, 127), 1
-                ),
-                style="",
-            ),
-            "numbers": _format(
-                colorize(
-                    palette.windowText().color(), 3, QtGui.QColor(127, 127, 127), 1
-                ),
-                style="",
-            ),
-        }
-
-        return styles[style_type]
+        # the format of each style, in style id order
+        self._formats = get_formats(palette)
+
+    def set_palette(self, palette):
+        """
+        Highlight the document with the colors of another palette.
+
+        :param palette: The ``QtGui.QPalette`` to highlight the code with.
+        """
+
+        self._palette = palette
+
+        formats = get_formats(palette)
+        if formats is self._formats:
+            # same colors
+            return
+
+        self._formats = formats
+        self._rehighlight_formats()
+
+    def _rehighlight_formats(self):
+        """
+        Apply new formats to the document.
+        """
+        self.rehighlight()
 
     def highlightBlock(self, text):
-        """Apply syntax highlighting to the given block of text using QRegularExpression."""
+        """Apply syntax highlighting to the given block of text."""
+
+        spans, state = syntax_tokenizer.tokenize_block(text, self.previousBlockState())
 
-        # Do other syntax formatting
-        for expression, nth, fmt in self.rules:
-            match = expression.match(text)
-            offset = 0
+        formats = self._formats
+        for start, length, style_id in spans:
+            self.setFormat(start, length, formats[style_id])
 
-            while match.hasMatch():
-                # We actually want the index of the nth match
-                index = match.capturedStart(nth)
-                length = match.capturedLength(nth)
-                self.setFormat(offset + index, length, fmt)
+        # remember whether the block ends within a multi-line string
+        self.setCurrentBlockState(state)
 
-                offset += match.capturedEnd(nth)
-                text_left_to_match = text[offset:]
-                match = expression.match(text_left_to_match)
 
-        self.setCurrentBlockState(0)
+class SpanSyntaxHighlighter(PythonSyntaxHighlighter):
+    """
+    Syntax highlighter applying spans computed ahead of time.
+
+    The spans of the whole file are computed by
+    :func:`.syntax_tokenizer.tokenize_source`, typically in a background
+    thread, and handed over with :meth:`set_spans`. They are then applied to
+    the document a chunk of blocks at a time so that the UI thread is never
+    blocked for long. Blocks are displayed without highlighting until their
+    spans are applied. The blocks being displayed can be highlighted ahead of
+    the others with :meth:`highlight_blocks`.
+    """
 
-        # Do multi-line strings
-        in_multiline = self.match_multiline(text, *self.tri_single)
-        if not in_multiline:
-            in_multiline = self.match_multiline(text, *self.tri_double)
+    # the maximum time to spend highlighting blocks before letting the event
+    # loop run, in seconds
+    CHUNK_DURATION = 0.008
 
-    def match_multiline(self, text, delimiter, in_state, style):
+    def __init__(self, document, palette):
+        """
+        :param document: The ``QtGui.QTextDocument`` to highlight.
+        :param palette: The ``QtGui.QPalette`` to highlight the code with.
+        """
+
+        super(SpanSyntaxHighlighter, self).__init__(document, palette)
+
+        self._spans = None
+
+        # the next block to apply the spans to
+        self._next_block = None
+
+        # whether the spans have been applied, via block number
+        self._highlighted = bytearray()
+
+        # set while a block is being highlighted by this object, as opposed to
+        # the full rehighlight Qt runs when the highlighter is attached
+        self._highlighting_block = False
+
+        self._chunk_timer = QtCore.QTimer(self)
+        self._chunk_timer.setSingleShot(True)
+        self._chunk_timer.timeout.connect(self._apply_chunk)
+
+    def set_spans(self, spans):
         """
-        Do highlighting of multi-line strings.
+        Start applying spans to the document.
 
-        :param delimiter: A regular expression for matching triple quotes (both single and double).
-        :type delimiter: ``QtCore.QRegularExpression``
-        :param ``in_state``: An int to represent the state changes when inside a quoted string.
-        :type in_state: int
+        :param spans: The :class:`.syntax_tokenizer.SpanTable` of the document.
+        """
+
+        self._spans = spans
+        self._next_block = self.document().begin()
+        self._highlighted = bytearray(self.document().blockCount())
+        self._chunk_timer.start(0)
+
+    def highlight_blocks(self, first, last):
+        """
+        Apply the spans to a range of blocks right away, e.g. the blocks
+        visible in an editor. The other blocks are still highlighted in chunks.
+
+        :param int first: The number of the first block to highlight.
+        :param int last: The number of the last block to highlight.
+        """
+
+        if self._spans is None:
+            return
+
+        block = self.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if not self._is_highlighted(block):
+                self._highlight_block(block)
+            block = block.next()
+
+    def highlightBlock(self, text):
+        """Apply the spans of the given block of text."""
 
-        :return: True if we're still inside a multi-line string when this function is finished.
-        :rtype: bool
+        if self._spans is None:
+            return
+
+        # a block is only highlighted for the first time in chunks or on
+        # request, so that rehighlighting the whole document stays cheap
+        block = self.currentBlock()
+        if not self._highlighting_block and not self._is_highlighted(block):
+            return
+
+        formats = self._formats
+        line = block.blockNumber()
+        for start, length, style_id in self._spans.line_spans(line):
+            self.setFormat(start, length, formats[style_id])
+
+        if line < len(self._highlighted):
+            self._highlighted[line] = 1
+
+    def _apply_chunk(self):
+        """
+        Apply the spans to the next blocks of the document, for at most
+        :attr:`CHUNK_DURATION`.
+        """
+
+        block = self._next_block
+        deadline = time.perf_counter() + self.CHUNK_DURATION
+
+        while block.isValid() and time.perf_counter() < deadline:
+            # skip the blocks highlighted ahead of time
+            if not self._is_highlighted(block):
+                self._highlight_block(block)
+            block = block.next()
+
+        self._next_block = block
+        if block.isValid():
+            self._chunk_timer.start(0)
+
+    def _rehighlight_formats(self):
+        """
+        Apply new formats to the document, a chunk of blocks at a time like
+        the spans.
+        """
+
+        if self._spans is not None:
+            self.set_spans(self._spans)
+
+    def _highlight_block(self, block):
+        """
+        Apply the spans to a block.
+        """
+
+        self._highlighting_block = True
+        try:
+            self.rehighlightBlock(block)
+        finally:
+            self._highlighting_block = False
+
+    def _is_highlighted(self, block):
+        """
+        Returns whether the spans have been applied to a block.
         """
 
-        # If inside triple-single quotes, start at 0
-        if self.previousBlockState() == in_state:
-            start = 0
-            add = 0
-            match = None
-        # Otherwise, look for the delimiter on this line
-        else:
-            match = delimiter.match(text)
-            start = match.capturedStart()
-            # Move past this match
-            add = match.capturedLength()
-
-        # As long as there's a delimiter match on this line...
-        while start >= 0:
-            # Look for the ending delimiter
-            if match is None:
-                match = delimiter.match(text)
-                offset = 0
-            else:
-                offset = match.capturedEnd()
-                text_left_to_match = text[offset:]
-                match = delimiter.match(text_left_to_match)
-            end = match.capturedStart()
-
-            # Ending delimiter on this line?
-            if end >= add:
-                length = end - start + add + match.capturedLength()
-                self.setCurrentBlockState(0)
-            # No; multi-line string
-            else:
-                self.setCurrentBlockState(in_state)
-                length = len(text) - start + add
-            # Apply formatting
-            self.setFormat(start, length, style)
-            # Look for the next match
-            offset += match.capturedEnd()
-            text_left_to_match = text[offset:]
-            match = delimiter.match(text_left_to_match)
-            start = match.capturedStart()
-
-        # Return True if still inside a multi-line string, False otherwise
-        if self.currentBlockState() == in_state:
-            return True
-        else:
-            return False
+        line = block.blockNumber()
+        return line < len(self._highlighted) and self._highlighted[line]
 
 
 # TODO: this should be a method in shotgunutils soon (color_mix)
@@ -0,0 +1,551 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tokenizers used to highlight python code.
+
+:func:`tokenize_block` tokenizes a single line at a time, as the lines are
+highlighted. :func:`tokenize_source` tokenizes a whole file with python's
+``tokenize`` module, which gets multi-line constructs right, and returns its
+spans as a :class:`SpanTable`.
+
+This module doesn't depend on Qt so that it can run in background threads.
+:func:`benchmark` times the tokenizer over python files, e.g. the demo sources.
+"""
+
+import array
+import io
+import keyword as py_keywords
+import os
+import re
+import time
+import tokenize
+
+import sgtk
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+# bump this whenever the spans produced for a given source change, so that
+# spans stored by previous versions are ignored
+VERSION = 2
+
+# the styles of the spans, in style id order
+STYLES = (
+    "keyword",
+    "builtin",
+    "operator",
+    "brace",
+    "defclass",
+    "string",
+    "string2",
+    "comment",
+    "self",
+    "numbers",
+)
+
+(
+    KEYWORD,
+    BUILTIN,
+    OPERATOR,
+    BRACE,
+    DEFCLASS,
+    STRING,
+    STRING2,
+    COMMENT,
+    SELF,
+    NUMBERS,
+) = range(len(STYLES))
+
+# the states of a line, depending on the multi-line string it ends in
+STATE_NONE = 0
+STATE_TRI_SINGLE = 1
+STATE_TRI_DOUBLE = 2
+
+# the triple quotes via the state they start
+_TRI_QUOTES = {STATE_TRI_SINGLE: "'''", STATE_TRI_DOUBLE: '"""'}
+
+# Python keywords
+KEYWORDS = py_keywords.kwlist
+
+# Python builtins
+BUILTINS = dir(__builtins__)
+
+# the style of the identifiers that are highlighted
+_WORD_STYLES = {}
+_WORD_STYLES.update((w, KEYWORD) for w in KEYWORDS)
+_WORD_STYLES.update((w, BUILTIN) for w in BUILTINS)
+_WORD_STYLES["self"] = SELF
+
+# the operators and braces, as tokenized by the tokenize module
+_OPERATORS = frozenset(
+    [
+        "=",
+        "==",
+        "!=",
+        "<",
+        "<=",
+        ">",
+        ">=",
+        "+",
+        "-",
+        "*",
+        "/",
+        "//",
+        "%",
+        "**",
+        "+=",
+        "-=",
+        "*=",
+        "/=",
+        "%=",
+        "^",
+        "|",
+        "&",
+        "~",
+        ">>",
+        "<<",
+    ]
+)
+_BRACES = frozenset(["{", "}", "(", ")", "[", "]"])
+
+# the tokens making up f-strings (python 3.12+), highlighted as strings
+_FSTRING_TOKENS = frozenset(
+    getattr(tokenize, name)
+    for name in ("FSTRING_START", "FSTRING_MIDDLE", "FSTRING_END")
+    if hasattr(tokenize, name)
+)
+
+# all the tokens, as a single alternation. at a given position, the first
+# alternative that matches wins
+_TOKEN_REGEX = re.compile(
+    r"""
+    (?P<comment>\#.*)
+    | (?P<tri>'''|\"\"\")
+    | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')
+    | (?P<defclass>\b(?:def|class)\b)\s*(?P<name>\w+)?
+    | (?P<number>\b[+-]?(?:
+        0[xX][0-9A-Fa-f]+[lL]?
+        | [0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?[lL]?
+      )\b)
+    | (?P<word>\w+)
+    | (?P<operator>//|\*\*|[=!<>+\-*/%]=|<<|>>|[=<>+\-*/%^|&~])
+    | (?P<brace>[{}()\[\]])
+    """,
+    re.VERBOSE,
+)
+
+# the characters outside of the basic multilingual plane, which are two UTF-16
+# code units long in the Qt strings the spans are applied to
+_NON_BMP_REGEX = re.compile("[\U00010000-\U0010ffff]")
+
+
+def tokenize_block(text, state=STATE_NONE):
+    """
+    Tokenize a single line of python code.
+
+    The line is walked once, from left to right, so a token's style only
+    depends on the tokens before it (e.g. keywords within strings or comments
+    aren't highlighted).
+
+    :param str text: The line to tokenize, without its line ending.
+    :param int state: The state the previous line ended in, one of the
+        ``STATE_*`` values. Any other value is treated as :data:`STATE_NONE`.
+
+    :returns: A tuple of the list of ``(start, length, style_id)`` spans of the
+        line, in order, and the state the line ends in. The positions are in
+        UTF-16 code units, as in Qt strings.
+    """
+
+    spans = []
+    pos = 0
+
+    if state in _TRI_QUOTES:
+        # the line starts within a multi-line string
+        pos, state = _close_multiline(text, 0, state, spans, False)
+
+    text_len = len(text)
+
+    while pos < text_len:
+
+        match = _TOKEN_REGEX.search(text, pos)
+        if match is None:
+            break
+
+        kind = match.lastgroup
+        start = match.start()
+        pos = match.end()
+
+        if kind == "word":
+            style = _WORD_STYLES.get(match.group(kind))
+            if style is not None:
+                spans.append((start, pos - start, style))
+        elif kind == "operator":
+            spans.append((start, pos - start, OPERATOR))
+        elif kind == "brace":
+            spans.append((start, pos - start, BRACE))
+        elif kind == "string":
+            spans.append((start, pos - start, STRING))
+        elif kind == "number":
+            spans.append((start, pos - start, NUMBERS))
+        elif kind == "comment":
+            spans.append((start, pos - start, COMMENT))
+        elif kind == "name":
+            # the keyword, then the name of the function or class
+            spans.append((start, match.end("defclass") - start, KEYWORD))
+            spans.append((match.start(kind), pos - match.start(kind), DEFCLASS))
+        elif kind == "defclass":
+            # no name after the keyword
+            spans.append((start, pos - start, KEYWORD))
+        else:
+            # a multi-line string starts
+            tri_state = STATE_TRI_SINGLE if text[start] == "'" else STATE_TRI_DOUBLE
+            pos, state = _close_multiline(text, start, tri_state, spans, True)
+
+    return (_to_utf16_spans(text, spans), state)
+
+
+def _to_utf16_spans(text, spans):
+    """
+    Convert the positions of the spans of a line from code points to UTF-16
+    code units, which is how Qt positions text.
+
+    :param str text: The line.
+    :param list spans: The ``(start, length, style_id)`` spans of the line, in
+        code points.
+
+    :returns: The list of spans in UTF-16 code units.
+    """
+
+    if not spans or _NON_BMP_REGEX.search(text) is None:
+        # the positions are the same
+        return spans
+
+    # the position of each code point in UTF-16 code units
+    offsets = [0]
+    for char in text:
+        offsets.append(offsets[-1] + (2 if ord(char) > 0xFFFF else 1))
+
+    return [
+        (offsets[start], offsets[start + length] - offsets[start], style)
+        for start, length, style in spans
+    ]
+
+
+def _close_multiline(text, start, state, spans, opened):
+    """
+    Add the span of a multi-line string to a list of spans.
+
+    :param str text: The line the string is in.
+    :param int start: The position the string starts at on the line. Either
+        the position of its opening quotes, or 0 if the string started on a
+        previous line.
+    :param int state: The state of the string.
+    :param list spans: The list to add the span to.
+    :param bool opened: Whether the opening quotes are at ``start``.
+
+    :returns: A tuple of the position after the string, and the state the
+        line ends in if the string ends there.
+    """
+
+    quotes = _TRI_QUOTES[state]
+
+    # skip the opening quotes, if they are on this line
+    search_from = start + 3 if opened else start
+
+    end = text.find(quotes, search_from)
+    if end == -1:
+        # the string continues on the next line
+        spans.append((start, len(text) - start, STRING2))
+        return (len(text), state)
+
+    end += 3
+    spans.append((start, end - start, STRING2))
+    return (end, STATE_NONE)
+
+
+def tokenize_lines(lines):
+    """
+    Tokenize lines of python code.
+
+    :param lines: An iterable of lines, without their line endings.
+
+    :returns: A list of the spans of each line, as returned by
+        :func:`tokenize_block`.
+    """
+
+    state = STATE_NONE
+    all_spans = []
+    for line in lines:
+        spans, state = tokenize_block(line, state)
+        all_spans.append(spans)
+    return all_spans
+
+
+class SpanTable(object):
+    """
+    The highlighting spans of a whole document, stored compactly.
+
+    The spans are stored in a flat array of ``(start, length, style_id)``
+    triples, ordered by line, with an index of the first span of each line.
+    The start of a span is its column on the line, in UTF-16 code units.
+    """
+
+    def __init__(self, spans, line_index):
+        """
+        Initialize the table.
+
+        :param spans: An ``array.array`` of flattened span triples.
+        :param line_index: An ``array.array`` holding the position in
+            ``spans`` of the first triple of each line, plus the end of the
+            spans.
+        """
+
+        self._spans = spans
+        self._line_index = line_index
+
+    @classmethod
+    def from_lines(cls, lines_spans):
+        """
+        Create a table from the spans of each line.
+
+        :param lines_spans: A list of lists of ``(start, length, style_id)``
+            spans, one list per line, as returned by :func:`tokenize_lines`.
+
+        :returns: A :class:`SpanTable`.
+        """
+
+        spans = array.array("I")
+        line_index = array.array("I", [0])
+        for line_spans in lines_spans:
+            for span in line_spans:
+                spans.extend(span)
+            line_index.append(len(spans))
+        return cls(spans, line_index)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Create a table from the data returned by :meth:`to_bytes`.
+
+        :param bytes data: The serialized table.
+
+        :returns: A :class:`SpanTable`.
+
+        :raises: ``ValueError`` if the data is invalid.
+        """
+
+        if len(data) < 4:
+            raise ValueError("Span table data is truncated.")
+
+        values = array.array("I")
+        values.frombytes(data)
+
+        # the first value is the length of the line index
+        index_len = values[0]
+        if index_len < 1 or index_len >= len(values):
+            raise ValueError("Span table data is truncated.")
+
+        line_index = values[1 : index_len + 1]
+        spans = values[index_len + 1 :]
+        if line_index[0] != 0 or line_index[-1] != len(spans) or len(spans) % 3:
+            raise ValueError("Span table data is inconsistent.")
+
+        return cls(spans, line_index)
+
+    def to_bytes(self):
+        """
+        Returns the table serialized as bytes, in the native byte order.
+        """
+
+        values = array.array("I", [len(self._line_index)])
+        values.extend(self._line_index)
+        values.extend(self._spans)
+        return values.tobytes()
+
+    @property
+    def line_count(self):
+        """The number of lines in the table."""
+        return len(self._line_index) - 1
+
+    def line_spans(self, line):
+        """
+        Returns the spans of a line.
+
+        :param int line: The 0-based line number.
+
+        :returns: A list of ``(start, length, style_id)`` spans. The list is
+            empty for a line beyond the table.
+        """
+
+        if line < 0 or line >= self.line_count:
+            return []
+
+        spans = self._spans
+        begin = self._line_index[line]
+        end = self._line_index[line + 1]
+        return [(spans[i], spans[i + 1], spans[i + 2]) for i in range(begin, end, 3)]
+
+
+def tokenize_source(text):
+    """
+    Tokenize a whole python file with python's ``tokenize`` module.
+
+    Tokens spanning several lines (e.g. multi-line strings) are split into one
+    span per line. If the file can't be tokenized (e.g. it isn't valid
+    python), it is tokenized line by line by :func:`tokenize_lines` instead.
+
+    :param str text: The contents of the file.
+
+    :returns: A :class:`SpanTable`.
+    """
+
+    # tokenize splits the lines on line feeds only
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # the lines, as they will be split into blocks by the document. see
+    # split_lines
+    lines = text.split("\n")
+    lines_spans = [[] for _ in lines]
+
+    try:
+        _add_token_spans(text, lines, lines_spans)
+    except (tokenize.TokenError, SyntaxError):
+        # the spans are converted by tokenize_block
+        lines_spans = tokenize_lines(lines)
+    else:
+        if _NON_BMP_REGEX.search(text) is not None:
+            lines_spans = [
+                _to_utf16_spans(line, spans) for line, spans in zip(lines, lines_spans)
+            ]
+
+    return SpanTable.from_lines(lines_spans)
+
+
+def split_lines(text):
+    """
+    Split text into lines, the way a ``QtGui.QTextDocument`` splits it into
+    blocks: on line feeds, carriage returns and carriage return line feeds
+    only (unlike ``str.splitlines``, which also splits on form feeds, etc.).
+    Text ending with a line ending has a last empty line.
+
+    :param str text: The text to split.
+
+    :returns: The list of lines, without their line endings.
+    """
+
+    return text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+
+def _add_token_spans(text, lines, lines_spans):
+    """
+    Add the spans of the tokens of a python file to the spans of its lines.
+
+    :param str text: The contents of the file.
+    :param list lines: The lines of the file.
+    :param list lines_spans: One list of spans per line, to add the spans to.
+
+    :raises: ``tokenize.TokenError`` or ``SyntaxError`` if the file can't be
+        tokenized.
+    """
+
+    previous_name = None
+    readline = io.StringIO(text).readline
+
+    for token in tokenize.generate_tokens(readline):
+
+        token_type = token.type
+        string = token.string
+        style = None
+
+        if token_type == tokenize.NAME:
+            if previous_name in ("def", "class"):
+                style = DEFCLASS
+            else:
+                style = _WORD_STYLES.get(string)
+            previous_name = string
+        else:
+            previous_name = None
+            if token_type == tokenize.OP:
+                if string in _OPERATORS:
+                    style = OPERATOR
+                elif string in _BRACES:
+                    style = BRACE
+            elif token_type == tokenize.STRING:
+                # skip the prefix (r, b, f, etc.) to find the quotes
+                quotes = string.lstrip("rRbBfFuU")[:3]
+                style = STRING2 if quotes in _TRI_QUOTES.values() else STRING
+            elif token_type in _FSTRING_TOKENS:
+                style = STRING
+            elif token_type == tokenize.NUMBER:
+                style = NUMBERS
+            elif token_type == tokenize.COMMENT:
+                style = COMMENT
+
+        if style is None:
+            continue
+
+        # split the token into one span per line
+        start_row, start_col = token.start
+        end_row, end_col = token.end
+        for row in range(start_row, min(end_row, len(lines)) + 1):
+            line = row - 1
+            col = start_col if row == start_row else 0
+            end = end_col if row == end_row else len(lines[line])
+            if end > col:
+                lines_spans[line].append((col, end - col, style))
+
+
+def benchmark(paths, repeat=5):
+    """
+    Time the tokenizer over python files.
+
+    :param list paths: The files to tokenize, or directories to search for
+        ``.py`` files.
+    :param int repeat: The number of times to tokenize the files. The best
+        time is kept.
+
+    :returns: A tuple of the number of lines tokenized and the best time per
+        1000 lines, in milliseconds. The results are also logged at debug
+        level.
+    """
+
+    lines = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for file_name in files:
+                    if file_name.endswith(".py"):
+                        lines.extend(_read_lines(os.path.join(root, file_name)))
+        else:
+            lines.extend(_read_lines(path))
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokenize_lines(lines)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+
+    ms_per_1k_lines = best * 1000 * 1000 / max(len(lines), 1)
+    logger.debug(
+        "Tokenized %d lines: %.2fms per 1k lines" % (len(lines), ms_per_1k_lines)
+    )
+
+    return (len(lines), ms_per_1k_lines)
+
+
+def _read_lines(path):
+    """
+    Returns the lines of a file, without their line endings.
+    """
+
+    with open(path, "r") as fh:
+        return split_lines(fh.read())
@@ -0,0 +1,164 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import sgtk
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class DemoTaskManager(object):
+    """
+    A demo's view of the background task manager shared by all demos.
+
+    It can be used anywhere a ``BackgroundTaskManager`` is expected. Tasks are
+    run by the shared task manager, but the groups of the tasks added through
+    this object are remembered so that :meth:`shut_down` only stops the work
+    of this demo. Tasks added without a group are put in a group dedicated to
+    the demo.
+
+    All other attributes (signals, ``start_processing``, etc.) are those of
+    the shared task manager.
+    """
+
+    def __init__(self, task_manager):
+        """
+        Initialize the demo task manager.
+
+        :param task_manager: The shared ``BackgroundTaskManager``.
+        """
+
+        self._task_manager = task_manager
+
+        # the group for tasks added without one, and all the groups in use
+        self._group = task_manager.next_group_id()
+        self._groups = set([self._group])
+
+    def __getattr__(self, name):
+        # everything else is handled by the shared task manager
+        return getattr(self._task_manager, name)
+
+    def add_task(
+        self,
+        cbl,
+        priority=None,
+        group=None,
+        upstream_task_ids=None,
+        task_args=None,
+        task_kwargs=None,
+    ):
+        """
+        Add a new task to the shared task manager.
+
+        See ``BackgroundTaskManager.add_task`` for details about the parameters.
+
+        :returns: The id of the new task.
+        """
+
+        return self._task_manager.add_task(
+            cbl,
+            priority=priority,
+            group=self._use_group(group),
+            upstream_task_ids=upstream_task_ids,
+            task_args=task_args,
+            task_kwargs=task_kwargs,
+        )
+
+    def add_pass_through_task(
+        self, priority=None, group=None, upstream_task_ids=None, **kwargs
+    ):
+        """
+        Add a pass-through task to the shared task manager.
+
+        See ``BackgroundTaskManager.add_pass_through_task`` for details about
+        the parameters.
+
+        :returns: The id of the new task.
+        """
+
+        return self._task_manager.add_pass_through_task(
+            priority=priority,
+            group=self._use_group(group),
+            upstream_task_ids=upstream_task_ids,
+            **kwargs
+        )
+
+    def stop_all_tasks(self):
+        """
+        Stop all the tasks added by this demo. Tasks of other demos keep running.
+        """
+
+        for group in self._groups:
+            self._task_manager.stop_task_group(group)
+
+    def shut_down(self):
+        """
+        Stop all the tasks added by this demo.
+
+        The shared task manager and its threads are left running for the other
+        demos. They are shut down by the app.
+        """
+
+        logger.debug("Stopping %d demo task groups." % (len(self._groups),))
+        self.stop_all_tasks()
+        self._groups = set([self._group])
+
+    def _use_group(self, group):
+        """
+        Returns the group to add a task to, and remembers it.
+
+        :param group: The group requested for the task, if any.
+        """
+
+        if group is None:
+            return self._group
+
+        self._groups.add(group)
+        return group
+
+
+def get_task_manager_stats(task_manager):
+    """
+    Returns the current load of a ``BackgroundTaskManager``.
+
+    The task manager doesn't expose these numbers publicly, so they are read
+    from its internal state. Any value that can't be determined is ``None``.
+
+    :param task_manager: A ``BackgroundTaskManager``.
+
+    :returns: A dict with the ``max_threads``, ``threads`` (started),
+        ``busy_threads``, ``running_tasks`` and ``queued_tasks`` counts.
+    """
+
+    all_threads = getattr(task_manager, "_all_threads", None)
+    available_threads = getattr(task_manager, "_available_threads", None)
+    running_tasks = getattr(task_manager, "_running_tasks", None)
+    pending_tasks = getattr(task_manager, "_pending_tasks_by_priority", None)
+
+    stats = {
+        "max_threads": getattr(task_manager, "_max_threads", None),
+        "threads": None,
+        "busy_threads": None,
+        "running_tasks": None,
+        "queued_tasks": None,
+    }
+
+    if all_threads is not None:
+        stats["threads"] = len(all_threads)
+        if available_threads is not None:
+            stats["busy_threads"] = len(all_threads) - len(available_threads)
+
+    if running_tasks is not None:
+        stats["running_tasks"] = len(running_tasks)
+
+    if pending_tasks is not None:
+        stats["queued_tasks"] = sum(len(tasks) for tasks in pending_tasks.values())
+
+    return stats
@@ -0,0 +1,112 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import contextlib
+import json
+import time
+
+import sgtk
+
+# logger for this module
+logger = sgtk.platform.get_logger(__name__)
+
+
+class StartupTiming(object):
+    """
+    Records how long each phase of the app and dialog startup takes.
+
+    Each timed span is logged at debug level as it completes, and all spans can
+    be retrieved as a dict or as json (e.g. to track startup regressions).
+    Span start times are relative to the origin of the timing, which is the
+    moment the app started initializing. Only the first span of each name is
+    recorded, so that the spans timed again later in the life of the app (e.g.
+    when a demo is created again) don't grow the timing.
+    """
+
+    def __init__(self, origin=None):
+        """
+        Initialize the timing.
+
+        :param float origin: The ``time.perf_counter()`` value the span start
+            times are relative to. Defaults to now.
+        """
+
+        self._origin = time.perf_counter() if origin is None else origin
+        self._spans = []
+        self._span_names = set()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """
+        Context manager timing the code it wraps as a span.
+
+        :param str name: The name of the span.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter())
+
+    def add_span(self, name, start, end):
+        """
+        Record a span timed by the caller. The span is ignored if a span with
+        the same name was already recorded.
+
+        :param str name: The name of the span. A span repeated for several
+            items can be named ``"<phase>: <item>"``, see :meth:`as_dict`.
+        :param float start: The ``time.perf_counter()`` value the span started at.
+        :param float end: The ``time.perf_counter()`` value the span ended at.
+        """
+
+        if name in self._span_names:
+            return
+        self._span_names.add(name)
+
+        span = {
+            "name": name,
+            "start_ms": round((start - self._origin) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+        }
+        self._spans.append(span)
+
+        logger.debug(
+            "Startup timing: %s took %.1fms (at %.1fms)"
+            % (name, span["duration_ms"], span["start_ms"])
+        )
+
+    def as_dict(self):
+        """
+        Returns all the recorded spans.
+
+        :returns: A dict with a ``spans`` list holding the ``name``,
+            ``start_ms`` and ``duration_ms`` of each span in the order they
+            completed, and a ``totals_ms`` dict of the summed duration of the
+            spans by phase (the span name up to the first ``:``).
+        """
+
+        totals = {}
+        for span in self._spans:
+            phase = span["name"].split(":")[0]
+            totals[phase] = round(totals.get(phase, 0) + span["duration_ms"], 3)
+
+        return {
+            "spans": [dict(span) for span in self._spans],
+            "totals_ms": totals,
+        }
+
+    def as_json(self):
+        """
+        Returns all the recorded spans as a json string.
+
+        See :meth:`as_dict` for the structure of the data.
+        """
+        return json.dumps(self.as_dict(), indent=2)
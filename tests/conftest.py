@@ -0,0 +1,35 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import types
+
+# the app's python package
+PACKAGE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "python", "tk_multi_demo")
+)
+
+
+def _register_package():
+    """
+    Make the modules of the app package importable without importing the
+    package itself, which imports the dialog and needs a running engine.
+    """
+
+    if "tk_multi_demo" in sys.modules:
+        return
+
+    package = types.ModuleType("tk_multi_demo")
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules["tk_multi_demo"] = package
+
+
+_register_package()
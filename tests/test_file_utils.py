@@ -0,0 +1,67 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+
+import pytest
+
+from tk_multi_demo.file_utils import write_file_atomically
+
+
+def test_write_text_and_bytes(tmpdir):
+    """
+    Text and bytes are written, creating the missing directories.
+    """
+
+    path = os.path.join(str(tmpdir), "sub", "file.json")
+
+    write_file_atomically(path, "{}")
+    with open(path, "r") as fh:
+        assert fh.read() == "{}"
+
+    write_file_atomically(path, b"\x00\x01")
+    with open(path, "rb") as fh:
+        assert fh.read() == b"\x00\x01"
+
+    assert os.listdir(os.path.dirname(path)) == ["file.json"]
+
+
+def test_failed_write_removes_temp_file(tmpdir):
+    """
+    The temp file is removed and the file is left untouched when the write
+    fails.
+    """
+
+    path = os.path.join(str(tmpdir), "file.json")
+    write_file_atomically(path, "old")
+
+    # not str nor bytes, the write fails once the temp file is open
+    with pytest.raises(TypeError):
+        write_file_atomically(path, 1)
+
+    assert os.listdir(str(tmpdir)) == ["file.json"]
+    with open(path, "r") as fh:
+        assert fh.read() == "old"
+
+
+def test_failed_replace_removes_temp_file(tmpdir):
+    """
+    The temp file is removed when it can't be swapped in.
+    """
+
+    # a directory can't be replaced by a file
+    path = os.path.join(str(tmpdir), "file.json")
+    os.mkdir(path)
+
+    with pytest.raises(OSError):
+        write_file_atomically(path, "new")
+
+    assert os.listdir(str(tmpdir)) == ["file.json"]
+    assert os.path.isdir(path)
@@ -0,0 +1,91 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+
+import pytest
+
+from tk_multi_demo import syntax_tokenizer
+from tk_multi_demo.span_cache import SpanCache
+
+SOURCE = 'def f(x):\n    """doc\n    string"""\n    return x + 1\n'
+
+
+def _all_spans(table):
+    """
+    Returns the spans of every line of a span table.
+    """
+    return [table.line_spans(line) for line in range(table.line_count)]
+
+
+def test_span_table_bytes_round_trip():
+    """
+    A span table read back from its bytes has the same spans.
+    """
+
+    table = syntax_tokenizer.tokenize_source(SOURCE)
+    restored = syntax_tokenizer.SpanTable.from_bytes(table.to_bytes())
+
+    assert restored.line_count == table.line_count
+    assert _all_spans(restored) == _all_spans(table)
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00\x00", b"\xff\x00\x00\x00\x00\x00"])
+def test_span_table_invalid_bytes(data):
+    """
+    Truncated or inconsistent data is rejected.
+    """
+
+    with pytest.raises(ValueError):
+        syntax_tokenizer.SpanTable.from_bytes(data)
+
+
+def test_span_cache_round_trip(tmpdir):
+    """
+    The spans stored for a source are returned for the same source only.
+    """
+
+    cache = SpanCache(str(tmpdir))
+    table = syntax_tokenizer.tokenize_source(SOURCE)
+
+    assert cache.get_spans(SOURCE) is None
+
+    cache.set_spans(SOURCE, table)
+
+    assert _all_spans(cache.get_spans(SOURCE)) == _all_spans(table)
+    assert cache.get_spans(SOURCE + "\n") is None
+
+
+def test_span_cache_evicts_least_recently_used(tmpdir):
+    """
+    The least recently used entries are deleted once the cache is full.
+    """
+
+    sources = ["x = %d\n" % i for i in range(3)]
+    tables = [syntax_tokenizer.tokenize_source(source) for source in sources]
+    entry_size = len(tables[0].to_bytes())
+
+    # room for two entries
+    cache = SpanCache(str(tmpdir), max_size=entry_size * 2)
+
+    cache.set_spans(sources[0], tables[0])
+    cache.set_spans(sources[1], tables[1])
+
+    # make the first entry the most recently used
+    for name in os.listdir(str(tmpdir)):
+        os.utime(os.path.join(str(tmpdir), name), (1000, 1000))
+    assert cache.get_spans(sources[0]) is not None
+
+    cache.set_spans(sources[2], tables[2])
+
+    assert cache.get_spans(sources[0]) is not None
+    assert cache.get_spans(sources[1]) is None
+    assert cache.get_spans(sources[2]) is not None
+    assert len(os.listdir(str(tmpdir))) == 2
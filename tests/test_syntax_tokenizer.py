@@ -0,0 +1,111 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import pytest
+
+from tk_multi_demo import syntax_tokenizer
+
+# python code tokenized the same way by tokenize_source and tokenize_block
+SOURCE = '''import os
+
+
+class Demo(object):
+    """
+    A docstring with def and class in it.
+    """
+
+    def run(self, value=1.5):
+        # a comment with "quotes"
+        if value is not None and value >= 0x1F:
+            return [len(str(value)), {"key": 'value'}]
+        return None
+'''
+
+
+def _all_spans(table):
+    """
+    Returns the spans of every line of a span table.
+    """
+    return [table.line_spans(line) for line in range(table.line_count)]
+
+
+def test_form_feed_does_not_split_lines():
+    """
+    A form feed doesn't start a new line, so the spans of a multi-line string
+    after it are on the lines of the string.
+    """
+
+    text = 'x = 1\n\x0cdef f():\n    s = """a\nb"""\n'
+    table = syntax_tokenizer.tokenize_source(text)
+
+    assert table.line_count == 5
+    assert (8, 4, syntax_tokenizer.STRING2) in table.line_spans(2)
+    assert table.line_spans(3) == [(0, 4, syntax_tokenizer.STRING2)]
+
+
+def test_crlf_line_endings():
+    """
+    Carriage returns are line endings, with or without a line feed.
+    """
+
+    lf_table = syntax_tokenizer.tokenize_source('a = 1\ns = """x\ny"""\n')
+
+    for text in ('a = 1\r\ns = """x\r\ny"""\r\n', 'a = 1\rs = """x\ry"""\r'):
+        assert _all_spans(syntax_tokenizer.tokenize_source(text)) == _all_spans(
+            lf_table
+        )
+
+
+def test_non_bmp_characters_are_two_positions_long():
+    """
+    The span positions are in UTF-16 code units, like the positions in Qt.
+    """
+
+    text = "s = '\U0001f600' + 'x'"
+    expected = [
+        (2, 1, syntax_tokenizer.OPERATOR),
+        (4, 4, syntax_tokenizer.STRING),
+        (9, 1, syntax_tokenizer.OPERATOR),
+        (11, 3, syntax_tokenizer.STRING),
+    ]
+
+    assert syntax_tokenizer.tokenize_source(text).line_spans(0) == expected
+    assert syntax_tokenizer.tokenize_block(text)[0] == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        SOURCE,
+        SOURCE.replace("\n", "\r\n"),
+        SOURCE.replace("\nclass", "\n\x0cclass"),
+    ],
+    ids=["lf", "crlf", "form_feed"],
+)
+def test_tokenize_source_agrees_with_tokenize_block(text):
+    """
+    Tokenizing a whole file gives the spans of tokenizing it line by line.
+    """
+
+    lines_spans = syntax_tokenizer.tokenize_lines(syntax_tokenizer.split_lines(text))
+
+    assert _all_spans(syntax_tokenizer.tokenize_source(text)) == lines_spans
+
+
+def test_tokenize_source_falls_back_to_tokenize_block():
+    """
+    Code that python can't tokenize is tokenized line by line.
+    """
+
+    text = 'x = (1,\ns = """never closed'
+
+    assert _all_spans(
+        syntax_tokenizer.tokenize_source(text)
+    ) == syntax_tokenizer.tokenize_lines(text.split("\n"))
@@ -0,0 +1,51 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+
+from tk_multi_demo.timing import StartupTiming
+
+
+def test_add_span_keeps_first_span_of_each_name():
+    """
+    A span timed again under the same name is ignored.
+    """
+
+    timing = StartupTiming(origin=10.0)
+    timing.add_span("apply_stylesheet: Demo", 10.5, 10.75)
+    timing.add_span("apply_stylesheet: Demo", 20.0, 21.0)
+    timing.add_span("apply_stylesheet: Other", 11.0, 11.5)
+
+    data = timing.as_dict()
+
+    assert data["spans"] == [
+        {"name": "apply_stylesheet: Demo", "start_ms": 500.0, "duration_ms": 250.0},
+        {"name": "apply_stylesheet: Other", "start_ms": 1000.0, "duration_ms": 500.0},
+    ]
+    assert data["totals_ms"] == {"apply_stylesheet": 750.0}
+
+
+def test_span_context_manager():
+    """
+    The span context manager records the span even if the code raises.
+    """
+
+    timing = StartupTiming()
+
+    try:
+        with timing.span("failing"):
+            raise RuntimeError()
+    except RuntimeError:
+        pass
+
+    spans = json.loads(timing.as_json())["spans"]
+
+    assert [span["name"] for span in spans] == ["failing"]
+    assert spans[0]["duration_ms"] >= 0